@@ -40,6 +40,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -87,6 +88,77 @@ else:
 
 
 
+# Cache (LocMemCache faz eviction LRU ao atingir MAX_ENTRIES)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sigos",
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "1000")),
+        },
+    }
+}
+
+# TTL (segundos) das respostas cacheadas de dashboard / listagem de O.S.
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", "60"))
+
+# Rollup diário: dias já consolidados que são recalculados a cada
+# execução (O.S. e logs que chegam atrasados para dias recentes)
+ROLLUP_REROLL_DAYS = int(os.environ.get("ROLLUP_REROLL_DAYS", "3"))
+
+# Máximo de erros por linha devolvidos na importação de CSV
+CSV_IMPORT_MAX_ERRORS = int(os.environ.get("CSV_IMPORT_MAX_ERRORS", "100"))
+
+# Linhas por lote (bulk_create) na importação de CSV
+CSV_IMPORT_BATCH_SIZE = int(os.environ.get("CSV_IMPORT_BATCH_SIZE", "500"))
+
+# Importação assíncrona: "thread" (pool no próprio processo) ou
+# "worker" (jobs processados por `manage.py run_import_worker`)
+CSV_IMPORT_JOB_BACKEND = os.environ.get("CSV_IMPORT_JOB_BACKEND", "thread")
+CSV_IMPORT_JOB_THREADS = int(os.environ.get("CSV_IMPORT_JOB_THREADS", "2"))
+# Job RUNNING sem lote gravado há mais que isso é considerado abandonado
+CSV_IMPORT_JOB_STALE_SECONDS = int(os.environ.get("CSV_IMPORT_JOB_STALE_SECONDS", "300"))
+
+# Linhas lidas do banco por vez (iterator) e enviadas por chunk nas exportações
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "2000"))
+
+# Máximo de O.S. afetadas por uma operação em lote (/ordens-servico/bulk/)
+BULK_MAX_ORDERS = int(os.environ.get("BULK_MAX_ORDERS", "5000"))
+
+# Scanner de SLA (`manage.py scan_sla_breaches`): notificador (caminho
+# da classe), arquivo do FileBreachNotifier e quanto olhar para trás
+# na primeira execução
+SLA_BREACH_NOTIFIER = os.environ.get(
+    "SLA_BREACH_NOTIFIER", "core.services.sla_breach_service.FileBreachNotifier"
+)
+SLA_BREACH_NOTIFY_FILE = os.environ.get("SLA_BREACH_NOTIFY_FILE", str(BASE_DIR / "sla_breaches.ndjson"))
+SLA_BREACH_LOOKBACK_HOURS = int(os.environ.get("SLA_BREACH_LOOKBACK_HOURS", "24"))
+
+# Segundos entre conferências da versão dos calendários de SLA em cache
+# (mudanças feitas no próprio processo valem na hora)
+SLA_CALENDAR_CACHE_SECONDS = int(os.environ.get("SLA_CALENDAR_CACHE_SECONDS", "30"))
+
+# Logs de O.S. guardam só o diff; a cada N logs de uma O.S. vai também
+# um snapshot completo (ponto de partida para reconstruir o histórico)
+ORDER_LOG_SNAPSHOT_INTERVAL = int(os.environ.get("ORDER_LOG_SNAPSHOT_INTERVAL", "50"))
+
+# Histórico da O.S. (/historico/?at=): estados já reconstruídos ficam em
+# cache por O.S. (no máximo N checkpoints por O.S., por até X segundos)
+ORDER_HISTORY_CACHE_CHECKPOINTS = int(os.environ.get("ORDER_HISTORY_CACHE_CHECKPOINTS", "64"))
+ORDER_HISTORY_CACHE_TIMEOUT = int(os.environ.get("ORDER_HISTORY_CACHE_TIMEOUT", "3600"))
+# só posições mais antigas que isto vão para o cache (transações longas
+# ainda podem gravar logs com changed_at anterior ao commit)
+ORDER_HISTORY_SETTLE_SECONDS = int(os.environ.get("ORDER_HISTORY_SETTLE_SECONDS", "900"))
+
+# Orçamento de queries por request (core.middleware.QueryBudgetMiddleware).
+# Ligado por padrão só em DEBUG; QUERY_BUDGET_ACTION: "log" ou "raise"
+QUERY_BUDGET_ENABLED = os.environ.get("QUERY_BUDGET_ENABLED", "1" if DEBUG else "0") == "1"
+QUERY_BUDGET_ACTION = os.environ.get("QUERY_BUDGET_ACTION", "log")
+QUERY_BUDGET_MAX_QUERIES = int(os.environ.get("QUERY_BUDGET_MAX_QUERIES", "20"))
+# Mesma query (a menos dos parâmetros) executada mais que isso = N+1
+QUERY_BUDGET_MAX_REPEATED = int(os.environ.get("QUERY_BUDGET_MAX_REPEATED", "5"))
+QUERY_BUDGET_MAX_DB_MS = float(os.environ.get("QUERY_BUDGET_MAX_DB_MS", "500"))
+
 AUTH_USER_MODEL = "core.User"
 
 LANGUAGE_CODE = "pt-br"
@@ -96,6 +168,9 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploads (ex.: CSVs das importações assíncronas)
+MEDIA_ROOT = os.environ.get("DJANGO_MEDIA_ROOT", str(BASE_DIR / "media"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
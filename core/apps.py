@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+
+def _ensure_search_index(sender, using, **kwargs):
+    from django.db import connections
+
+    from core.utils.search_index import FTS_TABLE, install_search_index
+
+    # no SQLite, migrations que recriam a tabela de O.S. apagam os triggers
+    # do FTS; refaz o que faltar (só se o índice já foi instalado pela 0009)
+    connection = connections[using]
+    if FTS_TABLE not in connection.introspection.table_names():
+        return
+    install_search_index(connection)
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from core.models import SLACalendar
+        from core.services.sla_calendar_service import invalidate_sla_calendars
+
+        post_migrate.connect(_ensure_search_index, sender=self)
+        # calendários de SLA ficam em cache no processo
+        post_save.connect(invalidate_sla_calendars, sender=SLACalendar)
+        post_delete.connect(invalidate_sla_calendars, sender=SLACalendar)
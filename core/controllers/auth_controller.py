@@ -14,7 +14,7 @@ from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from core.serializers.users import UserCreateSerializer, UserSerializer
 from core.utils.email import send_reset_password_email
-from core.models import OrderService
+from core.services.order_service import soft_delete_user_orders
 
 User = get_user_model()
 
@@ -153,8 +153,7 @@ class MeView(APIView):
         user = request.user
 
         # Marca ordens do usuário como deletadas logicamente
-        OrderService.objects.filter(created_by=user).update(is_deleted=True)
-        OrderService.objects.filter(updated_by=user).update(is_deleted=True)
+        soft_delete_user_orders(user)
 
         # Se você quiser, pode futuramente permitir null nas FKs e limpar:
         # OrderService.objects.filter(created_by=user).update(created_by=None)
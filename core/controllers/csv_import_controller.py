@@ -1,16 +1,25 @@
-import csv
-import io
-
+from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
-from core.serializers.orders import OrderServiceSerializer
-from core.services.order_service import create_order
+from core.models import ImportJob, ImportMode
+from core.serializers.import_jobs import ImportJobSerializer
+from core.services.csv_import_service import import_orders_from_csv
+from core.services.import_job_service import create_import_job
+
+TRUE_VALUES = ("1", "true", "t", "yes", "y", "sim")
 
 
 class OrderServiceCSVImportView(APIView):
+    """
+    Importa O.S. de um CSV.
+    Com async=true, o arquivo é guardado e processado em background;
+    a resposta traz o id do job para consulta em importar-csv/<job_id>/.
+    Com mode=upsert, protocolos já existentes são atualizados (os de
+    O.S. excluídas voltam como erro na linha, sem alterar a O.S.).
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -21,24 +30,40 @@ class OrderServiceCSVImportView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        decoded = file.read().decode("utf-8")
-        reader = csv.DictReader(io.StringIO(decoded))
-
-        created = 0
-        errors = []
-
-        for i, row in enumerate(reader, start=1):
-            serializer = OrderServiceSerializer(data=row)
-            if serializer.is_valid():
-                try:
-                    create_order(serializer.validated_data, request.user)
-                    created += 1
-                except Exception as e:
-                    errors.append({"line": i, "error": str(e)})
-            else:
-                errors.append({"line": i, "error": serializer.errors})
-
-        return Response(
-            {"created": created, "errors": errors},
-            status=status.HTTP_200_OK,
-        )
+        mode = request.query_params.get("mode") or request.data.get("mode") or ImportMode.INSERT
+        if mode not in ImportMode.values:
+            return Response(
+                {"detail": f"Modo inválido: {mode}. Use {' ou '.join(ImportMode.values)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        run_async = str(
+            request.query_params.get("async") or request.data.get("async") or ""
+        ).lower() in TRUE_VALUES
+
+        if run_async:
+            job = create_import_job(file, request.user, mode=mode)
+            return Response(
+                {"job_id": job.id, "status": job.status},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        result = import_orders_from_csv(file, request.user, mode=mode)
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class ImportJobDetailView(APIView):
+    """
+    Progresso de uma importação assíncrona.
+    Ex: GET /api/v1/ordens-servico/importar-csv/<uuid:job_id>/
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        jobs = ImportJob.objects.select_related("created_by")
+        if not request.user.is_admin():
+            jobs = jobs.filter(created_by=request.user)
+
+        job = get_object_or_404(jobs, pk=job_id)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
@@ -1,13 +1,89 @@
+from datetime import date, timedelta
+
+from django.utils import timezone
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from core.permissions.roles import IsAdmin
+from core.services.cache_service import cached_response, get_cache_stats, get_orders_version, reset_cache_stats
 from core.services.dashboard_service import get_overview
+from core.services.rollup_service import TIMESERIES_GROUP_FIELDS, get_timeseries
 
 
 class DashboardOverviewView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cached_response("dashboard-overview")
     def get(self, request):
         data = get_overview()
         return Response(data)
+
+
+class DashboardTimeseriesView(APIView):
+    """
+    Séries diárias (abertas, concluídas, SLAs estourados) lidas do rollup.
+    Ex: GET /api/v1/dashboard/timeseries/?data_inicio=2025-01-01&data_fim=2025-01-31
+        &agrupar=type,priority&priority=high
+    Sem datas, retorna os últimos 30 dias.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            end_day = (
+                date.fromisoformat(params["data_fim"])
+                if params.get("data_fim")
+                else timezone.localdate()
+            )
+            start_day = (
+                date.fromisoformat(params["data_inicio"])
+                if params.get("data_inicio")
+                else end_day - timedelta(days=29)
+            )
+        except ValueError:
+            return Response(
+                {"detail": "Datas devem estar no formato AAAA-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        group_by = [field for field in params.get("agrupar", "").split(",") if field]
+        invalid = [field for field in group_by if field not in TIMESERIES_GROUP_FIELDS]
+        if invalid:
+            return Response(
+                {"detail": f"Agrupamento inválido: {', '.join(invalid)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        filters = {
+            field: params[field]
+            for field in TIMESERIES_GROUP_FIELDS
+            if params.get(field)
+        }
+        series = get_timeseries(start_day, end_day, group_by, filters)
+        return Response({
+            "data_inicio": start_day,
+            "data_fim": end_day,
+            "series": series,
+        })
+
+
+class CacheStatsView(APIView):
+    """
+    Hit/miss do cache de respostas (por processo), para monitoramento.
+    Ex: GET /api/v1/dashboard/cache-stats/
+        DELETE /api/v1/dashboard/cache-stats/ (zera os contadores)
+    """
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response({
+            "orders_version": get_orders_version(),
+            "endpoints": get_cache_stats(),
+        })
+
+    def delete(self, request):
+        reset_cache_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -2,19 +2,58 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 
 from core.models import OrderService, OrderServiceLog
-from core.serializers.order_service_log import OrderServiceLogSerializer
+from core.serializers.order_service_log import (
+    OrderServiceLogLegacySerializer,
+    OrderServiceLogSerializer,
+)
+from core.services.cache_service import conditional_response
+from core.services.log_service import get_order_logs_validators
+from core.utils.fieldsets import SparseFieldsetViewMixin
 
 
-class OrderServiceLogListView(APIView):
+class LegacyLogFormatMixin:
+    """
+    ?formato=legado nas listagens de logs: old_values/new_values com a
+    O.S. inteira antes e depois (formato anterior aos diffs), em vez
+    de changes/snapshot.
+    """
+    format_param = "formato"
+    legacy_format = "legado"
+    log_serializer_class = OrderServiceLogSerializer
+    legacy_log_serializer_class = OrderServiceLogLegacySerializer
+
+    def is_legacy_format(self) -> bool:
+        value = self.request.query_params.get(self.format_param)
+        if not value:
+            return False
+        if value != self.legacy_format:
+            raise ValidationError({self.format_param: f"Use '{self.legacy_format}' ou omita o parâmetro."})
+        return True
+
+    def get_log_serializer_class(self):
+        if self.is_legacy_format():
+            return self.legacy_log_serializer_class
+        return self.log_serializer_class
+
+    def get_fieldset_serializer_class(self):
+        return self.get_log_serializer_class()
+
+
+class OrderServiceLogListView(LegacyLogFormatMixin, SparseFieldsetViewMixin, APIView):
     """
     Lista os logs de uma Ordem de Serviço específica.
-    Ex: GET /api/v1/ordens-servico/<uuid:order_id>/logs/
+    Ex: GET /api/v1/ordens-servico/<uuid:order_id>/logs/[?formato=legado]
     """
     permission_classes = [IsAuthenticated]
 
+    def get_conditional_validators(self, request, order_id):
+        return get_order_logs_validators(order_id)
+
+    @conditional_response
     def get(self, request, order_id):
         order = get_object_or_404(OrderService, pk=order_id)
 
@@ -26,14 +65,17 @@ class OrderServiceLogListView(APIView):
         #     )
 
         logs = order.logs.all().select_related("changed_by").order_by("-changed_at")
-        serializer = OrderServiceLogSerializer(logs, many=True)
+        # order.logs liga cada log à O.S.: order_service_id não pode ser adiado
+        logs = self.apply_fieldset(logs, ["order_service"])
+        serializer_class = self.get_log_serializer_class()
+        serializer = serializer_class(logs, many=True, context={"fieldset": self.get_fieldset()})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserOrderServiceLogListView(APIView):
+class UserOrderServiceLogListView(LegacyLogFormatMixin, SparseFieldsetViewMixin, APIView):
     """
     Lista os logs de O.S. referentes a ações feitas pelo usuário autenticado.
-    Ex: GET /api/v1/logs/minhas-acoes/
+    Ex: GET /api/v1/logs/minhas-acoes/[?formato=legado]
     """
     permission_classes = [IsAuthenticated]
 
@@ -41,8 +83,10 @@ class UserOrderServiceLogListView(APIView):
         logs = (
             OrderServiceLog.objects
             .filter(changed_by=request.user)
-            .select_related("order_service")
+            .select_related("changed_by")
             .order_by("-changed_at")
         )
-        serializer = OrderServiceLogSerializer(logs, many=True)
+        logs = self.apply_fieldset(logs)
+        serializer_class = self.get_log_serializer_class()
+        serializer = serializer_class(logs, many=True, context={"fieldset": self.get_fieldset()})
         return Response(serializer.data, status=status.HTTP_200_OK)
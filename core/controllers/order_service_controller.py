@@ -1,43 +1,295 @@
+from datetime import date, timedelta
+
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics, filters
+from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from core.controllers.logs_controller import LegacyLogFormatMixin
 from core.models import OrderService
-from core.serializers.orders import OrderServiceSerializer, OrderServiceLogSerializer
+from core.serializers.orders import (
+    OrderServiceBulkSerializer,
+    OrderServiceHistoryQuerySerializer,
+    OrderServiceListSerializer,
+    OrderServiceQueueSerializer,
+    OrderServiceLogLegacySerializer,
+    OrderServiceLogSerializer,
+    OrderServiceSerializer,
+)
+from core.services.bulk_service import bulk_update_orders
+from core.services.cache_service import (
+    cached_response,
+    conditional_response,
+    get_request_orders_version,
+    make_etag,
+)
+from core.services.export_service import (
+    EXPORT_FORMATS,
+    LOG_EXPORT_COLUMNS,
+    ORDER_EXPORT_COLUMNS,
+    iter_order_log_rows,
+    iter_order_rows,
+    stream_rows,
+)
+from core.services.log_service import get_order_logs_validators
+from core.services.order_history_service import order_state_at
 from core.services.order_service import create_order, update_order, soft_delete_order
+from core.services.queue_service import QUEUE_STATUSES, claim_orders, get_queue
+from core.services.sla_service import next_sla_transitions, sla_status_at, sla_status_changed_at
+from core.utils.dates import local_day_start
+from core.utils.fieldsets import SparseFieldsetViewMixin
+from core.utils.filters import AliasOrderingFilter, OrderFullTextSearchFilter, SlaStatusFilter
+from core.utils.pagination import KeysetPagination
 
 
-class OrderServiceListCreateView(generics.ListCreateAPIView):
-    serializer_class = OrderServiceSerializer
-    permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+class OrderServiceFilterMixin:
+    """
+    Filtros da listagem de O.S. (?status=, ?search=, ?sla_status=,
+    ?data_inicio=, ...), compartilhados com as exportações.
+    """
+    filter_backends = [
+        DjangoFilterBackend,
+        SlaStatusFilter,
+        OrderFullTextSearchFilter,
+        AliasOrderingFilter,
+    ]
     filterset_fields = ["status", "type", "priority", "recipient_name"]
     search_fields = ["so_number", "recipient_name", "provider", "description"]
-    ordering_fields = ["open_date", "sla_datetime", "priority"]
+    ordering_fields = ["open_date", "sla_datetime", "priority", "sla_status"]
+    # overdue < nearing_due_date < on_time (sem prazo conta como on_time)
+    # é a ordem crescente de sla_datetime com NULL no fim
+    ordering_aliases = {"sla_status": "sla_datetime"}
 
     def get_queryset(self):
-        qs = OrderService.objects.filter(is_deleted=False)
-        data_inicio = self.request.query_params.get("data_inicio")
-        data_fim = self.request.query_params.get("data_fim")
+        qs = OrderService.objects.filter(is_deleted=False).select_related("created_by", "updated_by")
+        data_inicio = self._parse_day("data_inicio")
+        data_fim = self._parse_day("data_fim")
+        # intervalos semiabertos em datetime (sem cast para date → usa índice)
         if data_inicio:
-            qs = qs.filter(open_date__date__gte=data_inicio)
+            qs = qs.filter(open_date__gte=local_day_start(data_inicio))
         if data_fim:
-            qs = qs.filter(open_date__date__lte=data_fim)
+            qs = qs.filter(open_date__lt=local_day_start(data_fim + timedelta(days=1)))
         return qs
 
+    def get_default_ordering(self):
+        # com busca, ordena por relevância (anotação do OrderFullTextSearchFilter)
+        if self.request.query_params.get(api_settings.SEARCH_PARAM):
+            return f"-{OrderFullTextSearchFilter.rank_field}"
+        return "-created_at"
+
+    def _parse_day(self, param):
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({param: "Data deve estar no formato AAAA-MM-DD."})
+
+
+class OrderServiceListCreateView(
+    SparseFieldsetViewMixin,
+    OrderServiceFilterMixin,
+    generics.ListCreateAPIView,
+):
+    serializer_class = OrderServiceSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_sla_marks(self, request) -> str:
+        """
+        Próximas viradas de sla_status (lidas uma vez por request): o
+        sla_status das linhas só muda sozinho quando uma delas passa.
+        """
+        marks = getattr(request, "_sla_marks", None)
+        if marks is None:
+            transitions = next_sla_transitions(timezone.now())
+            marks = request._sla_marks = ",".join(t.isoformat() if t else "" for t in transitions)
+        return marks
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        # sem agregar o filtro: a versão sobe a cada escrita (inclusive
+        # O.S. que saíram do filtro ou foram excluídas) e as próximas
+        # viradas de SLA cobrem o sla_status que muda com o tempo.
+        # Sem Last-Modified: nenhum timestamp das linhas cobre esses casos.
+        etag = make_etag(get_request_orders_version(request), self.get_sla_marks(request))
+        return etag, None
+
+    @conditional_response
+    @cached_response("orders-list", vary=lambda view, request: view.get_sla_marks(request))
+    def list(self, request, *args, **kwargs):
+        # leitura via .values() + OrderServiceListSerializer (mesmo JSON,
+        # sem instanciar model/campos do ModelSerializer por linha)
+        fieldset = self.get_fieldset()
+        # a paginação lê o id e o campo de ordenação de cada linha
+        ordering_field, _ = self.paginator.get_ordering(request, self)
+        queryset = OrderServiceListSerializer.get_values(
+            self.filter_queryset(self.get_queryset()),
+            fieldset=fieldset,
+            extra_columns=["id", ordering_field],
+        )
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = OrderServiceListSerializer(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        return Response(OrderServiceListSerializer(queryset, many=True, context=context).data)
+
     def perform_create(self, serializer):
         data = serializer.validated_data
         order = create_order(data, self.request.user)
         serializer.instance = order
 
 
-class OrderServiceDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OrderServiceExportView(OrderServiceFilterMixin, generics.GenericAPIView):
+    """
+    Exporta as O.S. filtradas (mesmos filtros da listagem) em streaming.
+    ?formato=csv (padrão) ou ndjson.
+    Ex: GET /api/v1/ordens-servico/exportar/?status=open&formato=ndjson
+    """
+    permission_classes = [IsAuthenticated]
+    export_name = "ordens-servico"
+
+    def get_export_format(self):
+        fmt = self.request.query_params.get("formato", "csv").lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"formato": f"Use um de: {', '.join(EXPORT_FORMATS)}."})
+        return fmt
+
+    def get_export_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.query.order_by:
+            queryset = queryset.order_by(self.get_default_ordering(), "-pk")
+        return queryset
+
+    def get_rows(self, queryset):
+        return iter_order_rows(queryset)
+
+    def get_columns(self):
+        return ORDER_EXPORT_COLUMNS
+
+    def get(self, request, *args, **kwargs):
+        fmt = self.get_export_format()
+        rows = self.get_rows(self.get_export_queryset())
+        response = StreamingHttpResponse(
+            stream_rows(rows, self.get_columns(), fmt),
+            content_type=EXPORT_FORMATS[fmt],
+        )
+        filename = f"{self.export_name}-{timezone.localtime():%Y%m%d-%H%M%S}.{fmt}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class OrderServiceLogExportView(OrderServiceExportView):
+    """
+    Exporta os logs das O.S. filtradas (mesmos filtros da listagem).
+    Ex: GET /api/v1/ordens-servico/exportar/logs/?type=inspection
+    """
+    export_name = "ordens-servico-logs"
+
+    def get_rows(self, queryset):
+        return iter_order_log_rows(queryset)
+
+    def get_columns(self):
+        return LOG_EXPORT_COLUMNS
+
+
+class OrderServiceBulkView(OrderServiceFilterMixin, generics.GenericAPIView):
+    """
+    Operação em lote: status, priority, reassign (prestador) ou delete.
+    Alvo: `ids` no corpo ou os filtros da listagem na query string.
+    Ex: POST /api/v1/ordens-servico/bulk/?status=open&type=inspection
+        {"operation": "status", "value": "completed"}
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = OrderServiceBulkSerializer
+
+    def _has_filters(self):
+        params = self.request.query_params
+        names = [*self.filterset_fields, api_settings.SEARCH_PARAM, SlaStatusFilter.param, "data_inicio", "data_fim"]
+        return any(params.get(name) for name in names)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        ids = data.get("ids")
+        if ids is None and not self._has_filters():
+            # sem ids nem filtro a operação pegaria todas as O.S.
+            raise ValidationError({"detail": "Informe `ids` ou ao menos um filtro."})
+
+        queryset = self.get_queryset() if ids is not None else self.filter_queryset(self.get_queryset())
+        result = bulk_update_orders(queryset, data["operation"], data.get("value"), request.user, ids=ids)
+        return Response(result)
+
+
+class OrderServiceQueueView(generics.GenericAPIView):
+    """
+    Próximas O.S. abertas ou em andamento, da mais urgente (SLA) para a menos.
+    Ex: GET /api/v1/ordens-servico/fila/?limit=20&status=open
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        serializer = OrderServiceQueueSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        statuses = [data["status"]] if data.get("status") else QUEUE_STATUSES
+        rows = OrderServiceListSerializer.get_values(get_queue(statuses))[: data["limit"]]
+        return Response(OrderServiceListSerializer(rows, many=True).data)
+
+
+class OrderServiceQueueClaimView(generics.GenericAPIView):
+    """
+    Reivindica as próximas O.S. abertas mais urgentes (viram in_progress).
+    Ex: POST /api/v1/ordens-servico/fila/reivindicar/  {"limit": 5}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = OrderServiceQueueSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        orders = claim_orders(request.user, serializer.validated_data["limit"])
+        return Response(OrderServiceSerializer(orders, many=True).data)
+
+
+class OrderServiceDetailView(SparseFieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = OrderServiceSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "id"
 
     def get_queryset(self):
-        return OrderService.objects.filter(is_deleted=False)
+        # o fieldset só vale no GET; escrita carrega a O.S. inteira
+        queryset = OrderService.objects.filter(is_deleted=False).select_related("created_by", "updated_by")
+        return self.apply_fieldset(queryset)
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        row = (
+            self.get_queryset()
+            .filter(id=kwargs["id"])
+            .values_list("updated_at", "sla_datetime")
+            .first()
+        )
+        if row is None:
+            return None, None
+        updated_at, sla_datetime = row
+        now = timezone.now()
+        sla_status = sla_status_at(sla_datetime, now)
+        # o sla_status muda sem escrita na O.S.: o Last-Modified acompanha
+        last_modified = max(filter(None, (updated_at, sla_status_changed_at(sla_datetime, now))))
+        return make_etag(kwargs["id"], updated_at.isoformat(), sla_status), last_modified
+
+    @conditional_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def perform_update(self, serializer):
         order = self.get_object()
@@ -49,10 +301,59 @@ class OrderServiceDetailView(generics.RetrieveUpdateDestroyAPIView):
         soft_delete_order(instance, self.request.user)
 
 
-class OrderServiceLogsView(generics.ListAPIView):
-    serializer_class = OrderServiceLogSerializer
+class OrderServiceLogsView(LegacyLogFormatMixin, SparseFieldsetViewMixin, generics.ListAPIView):
+    """
+    Logs da O.S. (diffs); ?formato=legado devolve old_values/new_values.
+    """
     permission_classes = [IsAuthenticated]
+    log_serializer_class = OrderServiceLogSerializer
+    legacy_log_serializer_class = OrderServiceLogLegacySerializer
+
+    def get_serializer_class(self):
+        return self.get_log_serializer_class()
 
     def get_queryset(self):
-        order_id = self.kwargs["id"]
-        return OrderService.objects.get(pk=order_id).logs.all()
+        order = get_object_or_404(OrderService, pk=self.kwargs["id"])
+        # order.logs liga cada log à O.S.: order_service_id não pode ser adiado
+        return self.apply_fieldset(order.logs.select_related("changed_by"), ["order_service"])
+
+    def get_conditional_validators(self, request, *args, **kwargs):
+        return get_order_logs_validators(kwargs["id"])
+
+    @conditional_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class OrderServiceHistoryView(generics.GenericAPIView):
+    """
+    Estado da O.S. em um instante, refeito pelos logs (snapshot mais
+    próximo + diffs seguintes).
+    Ex: GET /api/v1/ordens-servico/<uuid:id>/historico/?at=2025-03-04T14:00
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        serializer = OrderServiceHistoryQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        at = serializer.validated_data.get("at") or timezone.now()
+        datetime_field = serializer.fields["at"]
+
+        # O.S. deletadas também: o histórico continua consultável
+        order = get_object_or_404(OrderService, pk=kwargs["id"])
+        result = order_state_at(order.pk, at)
+        if result is None:
+            raise NotFound(f"A O.S. não tem registros até {datetime_field.to_representation(at)}.")
+
+        log = result["log"]
+        return Response({
+            "order_service": str(order.pk),
+            "at": datetime_field.to_representation(at),
+            "log": {
+                "id": log["id"],
+                "changed_at": datetime_field.to_representation(log["changed_at"]),
+                "change_type": log["change_type"],
+            },
+            "complete": result["complete"],
+            "state": result["state"],
+        })
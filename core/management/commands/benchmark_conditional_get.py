@@ -0,0 +1,68 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIClient
+
+from core.models import OrderService
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o tempo por request de GETs completos (200, sem cache de resposta) "
+        "e de GETs condicionais respondidos com 304, na listagem, no detalhe "
+        "e nos logs de uma O.S."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username usado nas requests.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests por cenário.")
+        parser.add_argument("--page-size", type=int, default=100)
+
+    def _client(self, user) -> APIClient:
+        host = next((h.lstrip(".") for h in settings.ALLOWED_HOSTS if h != "*"), "localhost")
+        client = APIClient(HTTP_HOST=host)
+        client.force_authenticate(user)
+        return client
+
+    def _timed(self, client, url, n, expected_status, **headers) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            if expected_status == 200:
+                # sem o cache de resposta: mede serialização + queries
+                cache.clear()
+            response = client.get(url, **headers)
+            if response.status_code != expected_status:
+                raise CommandError(f"{url}: status {response.status_code}, esperado {expected_status}")
+        return (time.perf_counter() - started) / n * 1000
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"Usuário não encontrado: {options['user']}")
+
+        order = OrderService.objects.filter(is_deleted=False, logs__isnull=False).first()
+        if order is None:
+            raise CommandError("Nenhuma O.S. com logs para o benchmark.")
+
+        client = self._client(user)
+        n = max(options["requests"], 1)
+        urls = {
+            "listagem": f"/api/v1/ordens-servico/?page_size={options['page_size']}",
+            "detalhe": f"/api/v1/ordens-servico/{order.id}/",
+            "logs": f"/api/v1/ordens-servico/{order.id}/logs/",
+        }
+
+        for name, url in urls.items():
+            etag = client.get(url)["ETag"]
+            full = self._timed(client, url, n, 200)
+            not_modified = self._timed(client, url, n, 304, HTTP_IF_NONE_MATCH=etag)
+            self.stdout.write(
+                f"{name:<9} 200={full:.2f}ms  304={not_modified:.2f}ms  "
+                f"speedup={full / not_modified:.1f}x"
+            )
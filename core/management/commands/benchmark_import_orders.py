@@ -0,0 +1,97 @@
+import csv
+import os
+import tempfile
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import (
+    OrderService,
+    ServiceOrderPriority,
+    ServiceOrderType,
+    ServiceProviderType,
+)
+from core.services.cache_service import bump_orders_version
+from core.services.counter_service import untrack_queryset
+from core.services.parallel_import_service import import_csv_parallel
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede linhas/s do import paralelo para diferentes números de workers. "
+        "Gera um CSV sintético, importa e remove as O.S. criadas ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Username do criador das O.S.")
+        parser.add_argument("--rows", type=int, default=20000, help="Linhas do CSV sintético.")
+        parser.add_argument(
+            "--workers",
+            default="1,2,4",
+            help="Lista de números de workers, separados por vírgula.",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def _write_csv(self, path: str, prefix: str, rows: int) -> None:
+        types = ServiceOrderType.values
+        providers = ServiceProviderType.values
+        priorities = ServiceOrderPriority.values
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow([
+                "protocol", "so_number", "type", "provider", "priority",
+                "recipient_name", "cpf", "description",
+            ])
+            for i in range(rows):
+                writer.writerow([
+                    f"{prefix}{i}",
+                    f"SO-{i}",
+                    types[i % len(types)],
+                    providers[i % len(providers)],
+                    priorities[i % len(priorities)],
+                    f"Cliente {i}",
+                    "000.000.000-00",
+                    f"Ordem de benchmark {i}\nsegunda linha da descrição",
+                ])
+
+    def _cleanup(self, prefix: str) -> None:
+        orders = OrderService.objects.filter(protocol__startswith=prefix)
+        with transaction.atomic():
+            untrack_queryset(orders)
+            orders.delete()
+            bump_orders_version()
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"Usuário não encontrado: {options['user']}")
+
+        workers_list = [int(value) for value in options["workers"].split(",") if value]
+        baseline = None
+
+        for workers in workers_list:
+            prefix = f"BENCH-{uuid.uuid4().hex[:8]}-"
+            fd, path = tempfile.mkstemp(suffix=".csv")
+            os.close(fd)
+            try:
+                self._write_csv(path, prefix, options["rows"])
+                result = import_csv_parallel(
+                    path, user, workers=workers, batch_size=options["batch_size"]
+                )
+            finally:
+                os.remove(path)
+                self._cleanup(prefix)
+
+            rate = result["rows_per_second"] or 0
+            baseline = baseline or rate
+            self.stdout.write(
+                f"workers={workers:>2}  linhas={result['rows_processed']}  "
+                f"tempo={result['elapsed_seconds']:.2f}s  "
+                f"linhas/s={rate:,.0f}  speedup={rate / baseline if baseline else 0:.2f}x  "
+                f"erros={result['error_count']}"
+            )
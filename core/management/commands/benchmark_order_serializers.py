@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.models import OrderService
+from core.serializers.orders import OrderServiceListSerializer, OrderServiceSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara o OrderServiceSerializer com o OrderServiceListSerializer "
+        "(.values()) na serialização de uma página de O.S., conferindo "
+        "que o JSON gerado é idêntico."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="O.S. por rodada.")
+        parser.add_argument("--repeat", type=int, default=5, help="Rodadas (vale a melhor).")
+
+    def _model_serializer(self, queryset):
+        orders = list(queryset.select_related("created_by", "updated_by"))
+        return JSONRenderer().render(OrderServiceSerializer(orders, many=True).data)
+
+    def _list_serializer(self, queryset):
+        rows = list(OrderServiceListSerializer.get_values(queryset))
+        return JSONRenderer().render(OrderServiceListSerializer(rows, many=True).data)
+
+    def _best_of(self, func, queryset, repeat):
+        best = None
+        output = b""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = func(queryset)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, output
+
+    def handle(self, *args, **options):
+        queryset = OrderService.objects.filter(is_deleted=False).order_by("-created_at", "-pk")
+        queryset = queryset[: options["rows"]]
+        rows = queryset.count()
+        if not rows:
+            raise CommandError("Nenhuma O.S. para serializar.")
+
+        repeat = max(options["repeat"], 1)
+        slow, expected = self._best_of(self._model_serializer, queryset, repeat)
+        fast, output = self._best_of(self._list_serializer, queryset, repeat)
+
+        if output != expected:
+            raise CommandError("JSON diferente entre os serializers.")
+
+        for name, elapsed in (("OrderServiceSerializer", slow), ("OrderServiceListSerializer", fast)):
+            self.stdout.write(
+                f"{name:<28} linhas={rows}  tempo={elapsed * 1000:.1f}ms  "
+                f"linhas/s={rows / elapsed:,.0f}"
+            )
+        self.stdout.write(f"speedup={slow / fast:.2f}x  (JSON idêntico, {len(output)} bytes)")
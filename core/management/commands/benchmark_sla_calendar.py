@@ -0,0 +1,162 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import SLACalendar
+from core.services.csv_import_service import OrderBulkImporter
+from core.services.sla_calendar_service import get_sla_calendar
+from core.services.sla_service import SLA_DELTAS, calculate_sla
+from core.utils.business_hours import WorkingCalendar
+
+SAMPLE_WORKING_HOURS = {
+    day: [["08:00", "12:00"], ["13:00", "18:00"]]
+    for day in ("mon", "tue", "wed", "thu", "fri")
+}
+
+
+def _walk(calendar: WorkingCalendar, start, duration):
+    """
+    Referência lenta: anda minuto a minuto até somar `duration`
+    (para conferir o resultado do índice).
+    """
+    step = timedelta(minutes=1)
+    remaining = duration
+    current = start
+    while True:
+        local = current.astimezone(calendar.tz)
+        minute = local.hour * 60 + local.minute
+        working = local.date() not in calendar.holidays and any(
+            begin <= minute < end for begin, end in calendar.week[local.weekday()]
+        )
+        if working:
+            # até o fim deste minuto (start pode não estar no minuto cheio)
+            boundary = local.replace(second=0, microsecond=0) + step
+            available = boundary - local
+            if remaining <= available:
+                return (local + remaining).astimezone(start.tzinfo)
+            remaining -= available
+            current = boundary
+        else:
+            current = (local.replace(second=0, microsecond=0) + step).astimezone(start.tzinfo)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede somas de horas úteis no calendário de SLA (índice com busca "
+        "binária), confere o resultado contra uma contagem minuto a minuto "
+        "e mede o caminho do import (calculate_sla -> get_sla_calendar, por "
+        "linha do OrderBulkImporter), com os calendários do banco."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--calls", type=int, default=100_000, help="Cálculos de SLA medidos.")
+        parser.add_argument("--check", type=int, default=200, help="Cálculos conferidos minuto a minuto.")
+        parser.add_argument("--import-rows", type=int, default=20_000, help="Linhas medidas no caminho do import.")
+        parser.add_argument(
+            "--provider",
+            default=None,
+            help="Usa o SLACalendar deste prestador ('' = padrão) em vez do calendário de exemplo.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def _calendar(self, provider):
+        if provider is None:
+            today = timezone.localdate()
+            holidays = [today.replace(month=12, day=25), today.replace(month=1, day=1)]
+            return WorkingCalendar(SAMPLE_WORKING_HOURS, holidays)
+        calendar = SLACalendar.objects.filter(provider=provider).first()
+        if calendar is None:
+            raise CommandError(f"Nenhum SLACalendar para o prestador {provider!r}.")
+        return WorkingCalendar(calendar.working_hours, calendar.holidays, calendar.timezone)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        calendar = self._calendar(options["provider"])
+        deltas = list(SLA_DELTAS.values())
+        now = timezone.now()
+        # aberturas espalhadas por um ano, em qualquer horário
+        starts = [
+            now + timedelta(seconds=rng.randint(-180 * 86400, 180 * 86400), microseconds=rng.randint(0, 999_999))
+            for _ in range(max(options["calls"], options["check"], 1))
+        ]
+
+        started = time.perf_counter()
+        calendar.add(now, timedelta(hours=1))
+        build = time.perf_counter() - started
+
+        walk_time = 0.0
+        for start in starts[: options["check"]]:
+            delta = rng.choice(deltas)
+            walk_started = time.perf_counter()
+            expected = _walk(calendar, start, delta)
+            walk_time += time.perf_counter() - walk_started
+            got = calendar.add(start, delta)
+            if got != expected:
+                raise CommandError(f"Resultado diferente para {start} + {delta}: {got} != {expected}")
+
+        calls = starts[: options["calls"]]
+        work = [(start, deltas[i % len(deltas)]) for i, start in enumerate(calls)]
+        add = calendar.add
+        started = time.perf_counter()
+        for start, delta in work:
+            add(start, delta)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"índice montado em {build * 1000:.1f}ms")
+        if options["check"]:
+            self.stdout.write(
+                f"minuto a minuto: {options['check']} cálculo(s) conferido(s), "
+                f"{walk_time / options['check'] * 1000:.2f}ms por cálculo"
+            )
+        self.stdout.write(
+            f"índice: cálculos={len(work)}  tempo={elapsed * 1000:.1f}ms  "
+            f"cálculos/ms={len(work) / (elapsed * 1000):,.1f}"
+        )
+        self._import_path(options, starts, list(SLA_DELTAS))
+
+    def _import_path(self, options, starts, priorities):
+        """
+        O que o import paga por linha: OrderBulkImporter._new_order monta
+        a O.S. e chama calculate_sla, que busca o calendário do prestador
+        (cache do processo) e soma as horas úteis.
+        """
+        provider = options["provider"] or ""
+        calendar = get_sla_calendar(provider)
+        mode = "horas corridas (nenhum SLACalendar no banco)" if calendar is None else "horas úteis"
+        rows = [
+            {
+                "protocol": f"BENCH-{i}",
+                "so_number": f"SO{i}",
+                "recipient_name": "Cliente",
+                "description": "benchmark",
+                "provider": provider,
+                "priority": priorities[i % len(priorities)],
+                "open_date": start,
+            }
+            for i, start in enumerate(starts[: max(options["import_rows"], 1)])
+        ]
+        importer = OrderBulkImporter(user=None)
+
+        started = time.perf_counter()
+        orders = [importer._new_order(data) for data in rows]
+        per_row = (time.perf_counter() - started) / len(rows)
+
+        started = time.perf_counter()
+        for order in orders:
+            calculate_sla(order)
+        per_sla = (time.perf_counter() - started) / len(orders)
+
+        self.stdout.write(
+            f"import ({mode}): calculate_sla/ms={1 / (per_sla * 1000):,.1f}  "
+            f"_new_order/ms={1 / (per_row * 1000):,.1f}  "
+            f"(SLA = {per_sla / per_row:.0%} do tempo por linha)"
+        )
+        # teto medido, não a meta: em Python o calculate_sla fica em
+        # centenas/ms, e montar a O.S. custa mais que o próprio SLA
+        self.stdout.write(
+            f"teto do import nesta máquina: {1 / (per_sla * 1000):,.0f} SLAs/ms; "
+            f"o lote é limitado por _new_order ({1 / (per_row * 1000):,.0f} linhas/ms)"
+        )
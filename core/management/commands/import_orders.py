@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import ImportMode
+from core.services.parallel_import_service import import_csv_parallel
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa O.S. de um CSV grande dividindo o arquivo em faixas de bytes "
+        "processadas em paralelo (um processo e uma conexão por worker)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help="Caminho do arquivo CSV.")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Username do usuário registrado como criador das O.S.",
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Número de processos.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Linhas por lote.")
+        parser.add_argument(
+            "--mode",
+            choices=ImportMode.values,
+            default=ImportMode.INSERT,
+            help="insert (padrão) ou upsert por protocolo.",
+        )
+        parser.add_argument(
+            "--errors-file",
+            help=(
+                "Grava todos os erros por linha neste arquivo JSON "
+                "(a saída do comando mostra no máximo CSV_IMPORT_MAX_ERRORS)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers deve ser >= 1.")
+
+        try:
+            user = User.objects.get(username=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"Usuário não encontrado: {options['user']}")
+
+        result = import_csv_parallel(
+            options["file"],
+            user,
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            mode=options["mode"],
+            errors_file=options["errors_file"],
+        )
+
+        for error in result["errors"][:20]:
+            self.stderr.write(f"linha {error['line']}: {error['error']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['rows_processed']} linha(s) em {result['elapsed_seconds']}s "
+            f"({result['rows_per_second']} linhas/s, {result['workers']} worker(s)): "
+            f"{result['created']} criada(s), {result['updated']} atualizada(s), "
+            f"{result['unchanged']} sem alteração, {result['error_count']} erro(s)."
+        ))
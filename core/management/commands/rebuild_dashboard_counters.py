@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from core.services.counter_service import find_counter_drift, rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recria os contadores do dashboard a partir das O.S. e reporta divergências."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Apenas reporta as divergências, sem recriar os contadores.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = find_counter_drift()
+        else:
+            drift = rebuild_counters()
+
+        for item in drift:
+            self.stdout.write(
+                f"{item['status']}/{item['priority']}/{item['type']}/{item['provider']}: "
+                f"armazenado={item['stored']} esperado={item['expected']}"
+            )
+
+        if drift:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} contador(es) divergente(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Nenhuma divergência encontrada."))
+
+        if not options["check"]:
+            self.stdout.write(self.style.SUCCESS("Contadores recriados."))
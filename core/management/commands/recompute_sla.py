@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.sla_recompute_service import recompute_sla
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula o SLA das O.S. abertas/em andamento com as regras atuais "
+        "(SLA por prioridade e calendários de SLA), em blocos por pk."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="O.S. por bloco/transação.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Só mostra o que mudaria, sem gravar.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Segundos de pausa entre blocos (para não disputar o banco com as requests).",
+        )
+
+    def _progress(self, summary):
+        self.stdout.write(
+            f"bloco {summary['chunks']}: {summary['chunk_examined']} O.S., "
+            f"{summary['chunk_changed']} com prazo novo "
+            f"(total: {summary['examined']} lidas, {summary['changed']} com prazo novo)"
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size deve ser maior que zero.")
+
+        summary = recompute_sla(
+            chunk_size=options["chunk_size"],
+            dry_run=options["dry_run"],
+            pause=max(options["pause"], 0),
+            on_chunk=self._progress,
+        )
+
+        for priority, group in sorted(summary["groups"].items()):
+            self.stdout.write(
+                f"{priority}: {group['examined']} lida(s), {group['changed']} com prazo novo "
+                f"({group['earlier']} antecipado(s), {group['later']} adiado(s), "
+                f"maior diferença {group['max_shift']})"
+            )
+
+        verb = "mudariam" if options["dry_run"] else "atualizada(s)"
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['changed']} de {summary['examined']} O.S. {verb}."
+        ))
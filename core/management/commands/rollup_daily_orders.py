@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.services.rollup_service import rollup_days, rollup_pending_days
+
+
+def _parse_day(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Data inválida (use AAAA-MM-DD): {value}")
+
+
+class Command(BaseCommand):
+    help = "Consolida os totais diários de O.S. (abertas, concluídas, SLAs estourados)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--until",
+            help="Último dia a consolidar (AAAA-MM-DD). Padrão: ontem.",
+        )
+        parser.add_argument(
+            "--since",
+            help=(
+                "Reprocessa a partir deste dia (AAAA-MM-DD), mesmo se já consolidado. "
+                "Sem ele, refaz só os dias pendentes e os últimos ROLLUP_REROLL_DAYS."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        until = _parse_day(options["until"]) if options["until"] else None
+
+        if options["since"]:
+            start_day = _parse_day(options["since"])
+            until = until or timezone.localdate() - timedelta(days=1)
+            rows = rollup_days(start_day, until)
+        else:
+            start_day, until, rows = rollup_pending_days(until)
+
+        if start_day is None:
+            self.stdout.write(self.style.SUCCESS("Nenhum dia pendente."))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rollup de {start_day} a {until}: {rows} linha(s) gravada(s).")
+        )
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.import_job_service import claim_next_job, run_import_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Processa importações de CSV pendentes. Também retoma jobs cujo "
+        "worker morreu, a partir do último lote commitado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Processa os jobs disponíveis e sai (para uso em cron).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Segundos entre buscas por novos jobs.",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=None,
+            help="Segundos sem heartbeat para considerar um job RUNNING abandonado.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_next_job(options["stale_after"])
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(f"Processando importação {job.pk} (a partir da linha {job.last_line + 1})...")
+            try:
+                job = run_import_job(job.pk, job.claim_token)
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f"Importação {job.pk} falhou: {e}"))
+                continue
+
+            self.stdout.write(self.style.SUCCESS(
+                f"Importação {job.pk}: {job.rows_created} criada(s), "
+                f"{job.rows_updated} atualizada(s), {job.rows_failed} com erro, {job.rows_processed} linha(s)."
+            ))
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.sla_breach_service import get_notifier, scan_sla_breaches
+
+
+class Command(BaseCommand):
+    help = (
+        "Registra eventos de SLA (O.S. que estouraram o prazo ou entraram "
+        "na janela de 24h) desde a última varredura e os envia ao notificador."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Faz uma varredura e sai (para uso em cron).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60.0,
+            help="Segundos entre varreduras.",
+        )
+        parser.add_argument(
+            "--notifier",
+            default=None,
+            help="Caminho da classe notificadora (padrão: settings.SLA_BREACH_NOTIFIER).",
+        )
+
+    def handle(self, *args, **options):
+        notifier = get_notifier(options["notifier"])
+        while True:
+            summary = scan_sla_breaches(notifier)
+            self.stdout.write(
+                f"{summary['since']:%Y-%m-%d %H:%M:%S} -> {summary['until']:%Y-%m-%d %H:%M:%S}: "
+                f"{summary['overdue']} SLA(s) estourado(s), "
+                f"{summary['nearing_due_date']} com prazo próximo."
+            )
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,61 @@
+import logging
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from core.utils.query_budget import QueryRecorder, record_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryBudgetMiddleware:
+    """
+    Conta queries e tempo de banco por request e acusa quando passam
+    do orçamento (QUERY_BUDGET_*), inclusive queries repetidas com o
+    mesmo formato (N+1). Com QUERY_BUDGET_ACTION="raise" a request
+    falha; senão, só gera um warning no log. Métodos que escrevem
+    (POST/PATCH/...) sempre só logam: a view já commitou, e falhar
+    agora devolveria 500 para uma escrita feita.
+
+    Também devolve os números nos headers X-DB-Queries / X-DB-Time-Ms.
+    Respostas em streaming só contam as queries feitas antes do envio.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_BUDGET_ENABLED:
+            return self.get_response(request)
+
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        response["X-DB-Queries"] = str(recorder.count)
+        response["X-DB-Time-Ms"] = str(recorder.duration_ms)
+
+        problems = self._check(recorder)
+        if problems:
+            message = f"{request.method} {request.path}: " + "; ".join(problems)
+            if settings.QUERY_BUDGET_ACTION == "raise" and request.method in SAFE_METHODS:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def _check(self, recorder: QueryRecorder):
+        problems = []
+        if recorder.count > settings.QUERY_BUDGET_MAX_QUERIES:
+            problems.append(
+                f"{recorder.count} queries (limite {settings.QUERY_BUDGET_MAX_QUERIES})"
+            )
+        if recorder.duration_ms > settings.QUERY_BUDGET_MAX_DB_MS:
+            problems.append(
+                f"{recorder.duration_ms} ms de banco (limite {settings.QUERY_BUDGET_MAX_DB_MS})"
+            )
+        for shape, n in recorder.repeated(settings.QUERY_BUDGET_MAX_REPEATED):
+            problems.append(f"N+1? {n}x {shape[:200]}")
+        return problems
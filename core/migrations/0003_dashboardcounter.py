@@ -0,0 +1,48 @@
+# Generated by Django 5.0.4 on 2026-10-17 19:30
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    OrderService = apps.get_model("core", "OrderService")
+    DashboardCounter = apps.get_model("core", "DashboardCounter")
+
+    rows = (
+        OrderService.objects.filter(is_deleted=False)
+        .order_by()
+        .values("status", "priority", "type", "provider")
+        .annotate(total=Count("id"))
+    )
+    DashboardCounter.objects.bulk_create([DashboardCounter(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_user_is_deleted'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('open', 'Aberta'), ('in_progress', 'Em andamento'), ('completed', 'Concluída'), ('cancelled', 'Cancelada')], max_length=50)),
+                ('priority', models.CharField(choices=[('critical', 'Crítica'), ('high', 'Alta'), ('medium', 'Média'), ('low', 'Baixa')], max_length=50)),
+                ('type', models.CharField(choices=[('administrative', 'Administrativa'), ('installation', 'Instalação'), ('preventive_maintenance', 'Manutenção Preventiva'), ('corrective_maintenance', 'Manutenção Corretiva'), ('predictive_maintenance', 'Manutenção Preditiva'), ('inspection', 'Vistoria'), ('technical_assistance', 'Assistência Técnica'), ('work_safety', 'Segurança do Trabalho'), ('budget', 'Orçamento'), ('events', 'Eventos')], max_length=50)),
+                ('provider', models.CharField(choices=[('technical', 'Técnico'), ('specialized', 'Especializado'), ('consulting', 'Consultivo'), ('administrative_provider', 'Administrativo'), ('logistics', 'Logístico'), ('operational', 'Operacional'), ('technological', 'Tecnológico'), ('commercial', 'Comercial'), ('maintenance_provider', 'Manutenção'), ('security', 'Segurança'), ('educational', 'Educacional'), ('communication', 'Comunicação'), ('other', 'Outros Serviços')], max_length=50)),
+                ('total', models.IntegerField(default=0, verbose_name='Total')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Contador do dashboard',
+                'verbose_name_plural': 'Contadores do dashboard',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardcounter',
+            constraint=models.UniqueConstraint(fields=('status', 'priority', 'type', 'provider'), name='uniq_dashboard_counter_key'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-17 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_cacheversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyOrderRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Dia')),
+                ('type', models.CharField(choices=[('administrative', 'Administrativa'), ('installation', 'Instalação'), ('preventive_maintenance', 'Manutenção Preventiva'), ('corrective_maintenance', 'Manutenção Corretiva'), ('predictive_maintenance', 'Manutenção Preditiva'), ('inspection', 'Vistoria'), ('technical_assistance', 'Assistência Técnica'), ('work_safety', 'Segurança do Trabalho'), ('budget', 'Orçamento'), ('events', 'Eventos')], max_length=50)),
+                ('priority', models.CharField(choices=[('critical', 'Crítica'), ('high', 'Alta'), ('medium', 'Média'), ('low', 'Baixa')], max_length=50)),
+                ('opened', models.PositiveIntegerField(default=0, verbose_name='Abertas')),
+                ('completed', models.PositiveIntegerField(default=0, verbose_name='Concluídas')),
+                ('sla_breaches', models.PositiveIntegerField(default=0, verbose_name='SLAs estourados')),
+            ],
+            options={
+                'verbose_name': 'Rollup diário de O.S.',
+                'verbose_name_plural': 'Rollups diários de O.S.',
+                'ordering': ['day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyorderrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'type', 'priority'), name='uniq_daily_rollup_key'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.4 on 2026-10-17 19:35
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_dailyorderrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file', models.FileField(upload_to='imports/', verbose_name='Arquivo CSV')),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('running', 'Em execução'), ('completed', 'Concluído'), ('failed', 'Falhou')], default='pending', max_length=10, verbose_name='Status')),
+                ('batch_size', models.PositiveIntegerField(verbose_name='Tamanho do lote')),
+                ('last_line', models.PositiveIntegerField(default=0, verbose_name='Última linha processada')),
+                ('rows_processed', models.PositiveIntegerField(default=0, verbose_name='Linhas processadas')),
+                ('rows_created', models.PositiveIntegerField(default=0, verbose_name='O.S. criadas')),
+                ('rows_failed', models.PositiveIntegerField(default=0, verbose_name='Linhas com erro')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Erros')),
+                ('error_message', models.TextField(blank=True, default='', verbose_name='Erro fatal')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='Último lote em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizado em')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Importação de CSV',
+                'verbose_name_plural': 'Importações de CSV',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
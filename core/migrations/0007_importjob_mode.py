@@ -0,0 +1,28 @@
+# Generated by Django 5.0.4 on 2026-10-17 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='mode',
+            field=models.CharField(choices=[('insert', 'Somente inserção'), ('upsert', 'Inserção ou atualização por protocolo')], default='insert', max_length=10, verbose_name='Modo'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='rows_unchanged',
+            field=models.PositiveIntegerField(default=0, verbose_name='O.S. sem alteração'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='rows_updated',
+            field=models.PositiveIntegerField(default=0, verbose_name='O.S. atualizadas'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.4 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_importjob_mode'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_at', 'id'], name='os_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['open_date', 'id'], name='os_active_open_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['sla_datetime', 'id'], name='os_active_sla_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['priority', 'id'], name='os_active_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'created_at'], name='os_active_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['type', 'created_at'], name='os_active_type_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-17 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_order_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'sla_datetime', 'id'], name='os_active_status_sla_idx'),
+        ),
+    ]
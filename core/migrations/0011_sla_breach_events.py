@@ -0,0 +1,48 @@
+# Generated by Django 5.0.4 on 2026-10-17 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_order_queue_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SLAScanState',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('scanned_until', models.DateTimeField(verbose_name='Varrido até')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Estado do scanner de SLA',
+                'verbose_name_plural': 'Estados do scanner de SLA',
+            },
+        ),
+        migrations.CreateModel(
+            name='SLABreachEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('nearing_due_date', 'Prazo próximo'), ('overdue', 'SLA estourado')], max_length=20, verbose_name='Tipo')),
+                ('sla_datetime', models.DateTimeField(verbose_name='Prazo (SLA)')),
+                ('status', models.CharField(choices=[('open', 'Aberta'), ('in_progress', 'Em andamento'), ('completed', 'Concluída'), ('cancelled', 'Cancelada')], max_length=50)),
+                ('priority', models.CharField(choices=[('critical', 'Crítica'), ('high', 'Alta'), ('medium', 'Média'), ('low', 'Baixa')], max_length=50)),
+                ('detected_at', models.DateTimeField(verbose_name='Detectado em')),
+                ('order_service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sla_events', to='core.orderservice', verbose_name='Ordem de Serviço')),
+            ],
+            options={
+                'verbose_name': 'Evento de SLA',
+                'verbose_name_plural': 'Eventos de SLA',
+                'ordering': ['-detected_at'],
+                'indexes': [models.Index(fields=['detected_at'], name='sla_event_detected_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='slabreachevent',
+            constraint=models.UniqueConstraint(fields=('order_service', 'kind', 'sla_datetime'), name='uniq_sla_event_key'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.4 on 2026-10-17 20:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_sla_breach_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SLACalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nome')),
+                ('provider', models.CharField(blank=True, choices=[('technical', 'Técnico'), ('specialized', 'Especializado'), ('consulting', 'Consultivo'), ('administrative_provider', 'Administrativo'), ('logistics', 'Logístico'), ('operational', 'Operacional'), ('technological', 'Tecnológico'), ('commercial', 'Comercial'), ('maintenance_provider', 'Manutenção'), ('security', 'Segurança'), ('educational', 'Educacional'), ('communication', 'Comunicação'), ('other', 'Outros Serviços')], default='', max_length=50, unique=True, verbose_name='Prestador')),
+                ('timezone', models.CharField(default='America/Sao_Paulo', max_length=64, verbose_name='Fuso horário')),
+                ('working_hours', models.JSONField(default=dict, verbose_name='Horário de trabalho')),
+                ('holidays', models.JSONField(blank=True, default=list, verbose_name='Feriados')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Calendário de SLA',
+                'verbose_name_plural': 'Calendários de SLA',
+            },
+        ),
+    ]
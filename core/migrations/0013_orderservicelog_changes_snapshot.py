@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_sla_calendar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderservicelog',
+            name='changes',
+            field=models.JSONField(blank=True, null=True, verbose_name='Alterações'),
+        ),
+        migrations.AddField(
+            model_name='orderservicelog',
+            name='snapshot',
+            field=models.JSONField(blank=True, null=True, verbose_name='Snapshot'),
+        ),
+    ]
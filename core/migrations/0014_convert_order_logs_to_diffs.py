@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.db import migrations
+
+# logs convertidos por vez; o estado de cada O.S. passa de um lote para o outro
+LOGS_PER_BATCH = 2000
+
+
+def _order_fields(apps):
+    # mesmas chaves do model_to_dict usado nos logs antigos
+    OrderService = apps.get_model('core', 'OrderService')
+    return {field.name for field in OrderService._meta.concrete_fields if field.editable}
+
+
+def _batches(apps):
+    """
+    Logs em ordem (order_service_id, id), em lotes de LOGS_PER_BATCH por
+    keyset: o índice da FK dá a ordem e cada lote para no LIMIT, sem
+    carregar o histórico inteiro de nenhuma O.S. Os logs antigos foram
+    gravados um a um, então o id segue o changed_at dentro da O.S.
+    """
+    OrderServiceLog = apps.get_model('core', 'OrderServiceLog')
+    logs = OrderServiceLog.objects.order_by('order_service_id', 'id')
+    position = None
+    while True:
+        batch = logs
+        if position is not None:
+            order_id, log_id = position
+            batch = batch.filter(order_service_id__gte=order_id).exclude(order_service_id=order_id, id__lte=log_id)
+        batch = list(batch[:LOGS_PER_BATCH].iterator())
+        if not batch:
+            return
+        yield batch
+        position = batch[-1].order_service_id, batch[-1].id
+
+
+def to_diffs(apps, schema_editor):
+    """
+    old_values/new_values completos -> changes {campo: [antes, depois]},
+    com snapshot no CREATED (ou no primeiro log com o estado completo,
+    para O.S. sem CREATED) e a cada ORDER_LOG_SNAPSHOT_INTERVAL logs.
+    """
+    OrderServiceLog = apps.get_model('core', 'OrderServiceLog')
+    interval = getattr(settings, 'ORDER_LOG_SNAPSHOT_INTERVAL', 50)
+    full = _order_fields(apps)
+
+    order_id = since_snapshot = None
+    for logs in _batches(apps):
+        for log in logs:
+            if log.order_service_id != order_id:
+                # None: nenhum snapshot ainda para esta O.S.
+                order_id, since_snapshot = log.order_service_id, None
+            old, new = log.old_values or {}, log.new_values or {}
+
+            if log.change_type == 'CREATED':
+                log.changes, log.snapshot = None, new
+                since_snapshot = 0
+                continue
+
+            log.changes = {key: [old.get(key), value] for key, value in new.items() if old.get(key) != value}
+            log.snapshot = None
+            if since_snapshot is not None:
+                since_snapshot += 1
+            if (since_snapshot is None or since_snapshot >= interval) and full <= set(new):
+                log.snapshot = new
+                since_snapshot = 0
+        OrderServiceLog.objects.bulk_update(logs, ['changes', 'snapshot'], batch_size=1000)
+
+
+def to_values(apps, schema_editor):
+    """
+    Volta para old_values/new_values com o estado completo, refazendo o
+    histórico de cada O.S. a partir do CREATED ou do primeiro snapshot
+    (mesma regra de log_service.legacy_log_values). Logs anteriores ao
+    primeiro snapshot ficam só com os campos alterados.
+    """
+    OrderServiceLog = apps.get_model('core', 'OrderServiceLog')
+
+    order_id = state = None
+    for logs in _batches(apps):
+        for log in logs:
+            if log.order_service_id != order_id:
+                order_id, state = log.order_service_id, None
+            changes = log.changes or {}
+            before = state
+            if log.snapshot is not None:
+                state = dict(log.snapshot)
+            elif state is not None:
+                state = dict(state)
+                state.update({key: value for key, (_, value) in changes.items()})
+
+            if log.change_type == 'CREATED':
+                log.old_values, log.new_values = None, log.snapshot
+            elif state is None:
+                log.old_values = {key: value for key, (value, _) in changes.items()}
+                log.new_values = {key: value for key, (_, value) in changes.items()}
+            else:
+                if before is None:
+                    # primeiro snapshot da O.S.: o antes é o snapshot sem o diff
+                    before = dict(state)
+                    before.update({key: value for key, (value, _) in changes.items()})
+                log.old_values, log.new_values = before, dict(state)
+        OrderServiceLog.objects.bulk_update(logs, ['old_values', 'new_values'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_orderservicelog_changes_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(to_diffs, to_values),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-17 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_convert_order_logs_to_diffs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderservicelog',
+            index=models.Index(fields=['order_service', 'changed_at', 'id'], name='os_log_order_changed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderservicelog',
+            index=models.Index(condition=models.Q(('snapshot__isnull', False)), fields=['order_service', 'changed_at', 'id'], name='os_log_snapshot_idx'),
+        ),
+    ]
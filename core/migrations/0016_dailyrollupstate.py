@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-17 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_orderservicelog_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollupState',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('rolled_until', models.DateField(verbose_name='Consolidado até')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Estado do rollup diário',
+                'verbose_name_plural': 'Estados do rollup diário',
+            },
+        ),
+    ]
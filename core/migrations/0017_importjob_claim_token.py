@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-17 20:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_dailyrollupstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='claim_token',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='Reivindicação'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 import uuid
+from zoneinfo import ZoneInfoNotFoundError
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -196,6 +199,47 @@ class OrderService(models.Model):
         verbose_name = _("Ordem de Serviço")
         verbose_name_plural = _("Ordens de Serviço")
         ordering = ["-created_at"]
+        # Índices parciais (só O.S. não deletadas), casando com as queries reais:
+        # ordenação/paginação keyset por (campo, id), filtros por status/tipo
+        # com a ordenação padrão e os buckets de SLA do dashboard.
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="os_active_created_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["open_date", "id"],
+                name="os_active_open_date_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["sla_datetime", "id"],
+                name="os_active_sla_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["priority", "id"],
+                name="os_active_priority_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["status", "created_at"],
+                name="os_active_status_created_idx",
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["type", "created_at"],
+                name="os_active_type_created_idx",
+                condition=Q(is_deleted=False),
+            ),
+            # fila de atendimento: abertas/em andamento por urgência de SLA
+            models.Index(
+                fields=["status", "sla_datetime", "id"],
+                name="os_active_status_sla_idx",
+                condition=Q(is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return f"O.S. {self.so_number} ({self.get_status_display()})"
@@ -232,10 +276,306 @@ class OrderServiceLog(models.Model):
         choices=ChangeType.choices,
         verbose_name=_("Tipo de alteração"),
     )
-    old_values = models.JSONField(null=True, blank=True, verbose_name=_("Valores antigos"))
-    new_values = models.JSONField(null=True, blank=True, verbose_name=_("Novos valores"))
+    # só os campos alterados: {"status": ["open", "completed"], ...}
+    changes = models.JSONField(null=True, blank=True, verbose_name=_("Alterações"))
+    # estado completo da O.S. depois da alteração: no CREATED e a cada
+    # ORDER_LOG_SNAPSHOT_INTERVAL logs (ponto de partida para reconstruir)
+    snapshot = models.JSONField(null=True, blank=True, verbose_name=_("Snapshot"))
+    # formato antigo (estado completo antes/depois), convertido pela 0014 e
+    # não mais gravado. As colunas ficam até um release seguinte, depois de
+    # conferida a conversão: a volta da 0014 precisa delas
+    old_values = models.JSONField(blank=True, null=True, verbose_name=_("Valores antigos"))
+    new_values = models.JSONField(blank=True, null=True, verbose_name=_("Novos valores"))
 
     class Meta:
         ordering = ["-changed_at"]
         verbose_name = _("Log de O.S.")
         verbose_name_plural = _("Logs de O.S.")
+        # histórico de uma O.S. em ordem (changed_at, id) e o snapshot
+        # mais próximo antes de um instante (reconstrução do estado)
+        indexes = [
+            models.Index(
+                fields=["order_service", "changed_at", "id"],
+                name="os_log_order_changed_idx",
+            ),
+            models.Index(
+                fields=["order_service", "changed_at", "id"],
+                name="os_log_snapshot_idx",
+                condition=Q(snapshot__isnull=False),
+            ),
+        ]
+
+
+# =========================
+# CONTADORES DO DASHBOARD
+# =========================
+class DashboardCounter(models.Model):
+    """
+    Rollup de O.S. não deletadas por (status, prioridade, tipo, prestador).
+    Mantido incrementalmente pelo core/services/order_service.py.
+    """
+
+    status = models.CharField(max_length=50, choices=ServiceOrderStatus.choices)
+    priority = models.CharField(max_length=50, choices=ServiceOrderPriority.choices)
+    type = models.CharField(max_length=50, choices=ServiceOrderType.choices)
+    provider = models.CharField(max_length=50, choices=ServiceProviderType.choices)
+
+    total = models.IntegerField(default=0, verbose_name=_("Total"))
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Atualizado em"))
+
+    class Meta:
+        verbose_name = _("Contador do dashboard")
+        verbose_name_plural = _("Contadores do dashboard")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["status", "priority", "type", "provider"],
+                name="uniq_dashboard_counter_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.status}/{self.priority}/{self.type}/{self.provider}: {self.total}"
+
+
+# =========================
+# VERSÕES DE CACHE
+# =========================
+class CacheVersion(models.Model):
+    """
+    Contador global de versão usado nas chaves do cache de respostas.
+    Fica no banco para ser compartilhado entre todos os workers.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        verbose_name = _("Versão de cache")
+        verbose_name_plural = _("Versões de cache")
+
+    def __str__(self):
+        return f"{self.name}: v{self.version}"
+
+
+# =========================
+# ROLLUP DIÁRIO DE O.S.
+# =========================
+class DailyOrderRollup(models.Model):
+    """
+    Totais diários por (tipo, prioridade) para os gráficos de tendência.
+    Preenchido pelo comando `manage.py rollup_daily_orders`.
+    """
+
+    day = models.DateField(verbose_name=_("Dia"))
+    type = models.CharField(max_length=50, choices=ServiceOrderType.choices)
+    priority = models.CharField(max_length=50, choices=ServiceOrderPriority.choices)
+
+    opened = models.PositiveIntegerField(default=0, verbose_name=_("Abertas"))
+    completed = models.PositiveIntegerField(default=0, verbose_name=_("Concluídas"))
+    sla_breaches = models.PositiveIntegerField(default=0, verbose_name=_("SLAs estourados"))
+
+    class Meta:
+        ordering = ["day"]
+        verbose_name = _("Rollup diário de O.S.")
+        verbose_name_plural = _("Rollups diários de O.S.")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "type", "priority"],
+                name="uniq_daily_rollup_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.type}/{self.priority}"
+
+
+class DailyRollupState(models.Model):
+    """
+    Marca d'água do rollup diário: último dia já consolidado (inclusive
+    dias sem movimento, que não geram linhas em DailyOrderRollup).
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    rolled_until = models.DateField(verbose_name=_("Consolidado até"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Atualizado em"))
+
+    class Meta:
+        verbose_name = _("Estado do rollup diário")
+        verbose_name_plural = _("Estados do rollup diário")
+
+    def __str__(self):
+        return f"{self.name}: {self.rolled_until}"
+
+
+# =========================
+# CALENDÁRIOS DE SLA
+# =========================
+class SLACalendar(models.Model):
+    """
+    Horário de atendimento do contrato de um tipo de prestador: o SLA
+    das O.S. desse prestador conta só horas úteis (ver
+    core/utils/business_hours.py). O calendário com `provider` vazio
+    vale para os demais; sem nenhum calendário, o SLA é em horas corridas.
+
+    working_hours: {"mon": [["08:00", "12:00"], ["13:00", "18:00"]], ...}
+    holidays: ["2026-12-25", ...]
+    """
+
+    name = models.CharField(max_length=100, verbose_name=_("Nome"))
+    provider = models.CharField(
+        max_length=50,
+        choices=ServiceProviderType.choices,
+        blank=True,
+        default="",
+        unique=True,
+        verbose_name=_("Prestador"),
+    )
+    timezone = models.CharField(max_length=64, default=settings.TIME_ZONE, verbose_name=_("Fuso horário"))
+    working_hours = models.JSONField(default=dict, verbose_name=_("Horário de trabalho"))
+    holidays = models.JSONField(default=list, blank=True, verbose_name=_("Feriados"))
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Atualizado em"))
+
+    class Meta:
+        verbose_name = _("Calendário de SLA")
+        verbose_name_plural = _("Calendários de SLA")
+
+    def __str__(self):
+        return f"{self.name} ({self.provider or 'padrão'})"
+
+    def clean(self):
+        from core.utils.business_hours import WorkingCalendar
+
+        try:
+            WorkingCalendar(self.working_hours, self.holidays, self.timezone)
+        except (TypeError, ValueError, ZoneInfoNotFoundError) as e:
+            raise ValidationError(str(e))
+
+
+# =========================
+# EVENTOS DE SLA
+# =========================
+class SLABreachEvent(models.Model):
+    """
+    O.S. que estourou o SLA ou entrou na janela de 24h, detectada pelo
+    `manage.py scan_sla_breaches`. Um evento por (O.S., tipo, prazo):
+    se o prazo muda (ex.: nova prioridade), o novo prazo gera outro.
+    """
+
+    class Kind(models.TextChoices):
+        NEARING_DUE_DATE = "nearing_due_date", _("Prazo próximo")
+        OVERDUE = "overdue", _("SLA estourado")
+
+    order_service = models.ForeignKey(
+        OrderService,
+        related_name="sla_events",
+        on_delete=models.CASCADE,
+        verbose_name=_("Ordem de Serviço"),
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices, verbose_name=_("Tipo"))
+    sla_datetime = models.DateTimeField(verbose_name=_("Prazo (SLA)"))
+    # status/prioridade da O.S. no momento da detecção
+    status = models.CharField(max_length=50, choices=ServiceOrderStatus.choices)
+    priority = models.CharField(max_length=50, choices=ServiceOrderPriority.choices)
+    detected_at = models.DateTimeField(verbose_name=_("Detectado em"))
+
+    class Meta:
+        ordering = ["-detected_at"]
+        verbose_name = _("Evento de SLA")
+        verbose_name_plural = _("Eventos de SLA")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["order_service", "kind", "sla_datetime"],
+                name="uniq_sla_event_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["detected_at"], name="sla_event_detected_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.order_service_id} ({self.sla_datetime})"
+
+
+class SLAScanState(models.Model):
+    """
+    Marca d'água do scanner de SLA: até onde o tempo já foi varrido.
+    Cada execução olha só o intervalo (scanned_until, agora].
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    scanned_until = models.DateTimeField(verbose_name=_("Varrido até"))
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Atualizado em"))
+
+    class Meta:
+        verbose_name = _("Estado do scanner de SLA")
+        verbose_name_plural = _("Estados do scanner de SLA")
+
+    def __str__(self):
+        return f"{self.name}: {self.scanned_until}"
+
+
+# =========================
+# JOBS DE IMPORTAÇÃO DE CSV
+# =========================
+class ImportMode(models.TextChoices):
+    INSERT = "insert", _("Somente inserção")
+    UPSERT = "upsert", _("Inserção ou atualização por protocolo")
+
+
+class ImportJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pendente")
+        RUNNING = "running", _("Em execução")
+        COMPLETED = "completed", _("Concluído")
+        FAILED = "failed", _("Falhou")
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    file = models.FileField(upload_to="imports/", verbose_name=_("Arquivo CSV"))
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("Status"),
+    )
+    mode = models.CharField(
+        max_length=10,
+        choices=ImportMode.choices,
+        default=ImportMode.INSERT,
+        verbose_name=_("Modo"),
+    )
+    batch_size = models.PositiveIntegerField(verbose_name=_("Tamanho do lote"))
+
+    # progresso (gravado junto com cada lote commitado)
+    last_line = models.PositiveIntegerField(default=0, verbose_name=_("Última linha processada"))
+    rows_processed = models.PositiveIntegerField(default=0, verbose_name=_("Linhas processadas"))
+    rows_created = models.PositiveIntegerField(default=0, verbose_name=_("O.S. criadas"))
+    rows_updated = models.PositiveIntegerField(default=0, verbose_name=_("O.S. atualizadas"))
+    rows_unchanged = models.PositiveIntegerField(default=0, verbose_name=_("O.S. sem alteração"))
+    rows_failed = models.PositiveIntegerField(default=0, verbose_name=_("Linhas com erro"))
+    errors = models.JSONField(default=list, blank=True, verbose_name=_("Erros"))
+    error_message = models.TextField(blank=True, default="", verbose_name=_("Erro fatal"))
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="import_jobs",
+        verbose_name=_("Criado por"),
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Criado em"))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Iniciado em"))
+    heartbeat_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Último lote em"))
+    # muda a cada reivindicação: o worker que perdeu o job não grava mais progresso
+    claim_token = models.UUIDField(null=True, blank=True, editable=False, verbose_name=_("Reivindicação"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Finalizado em"))
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = _("Importação de CSV")
+        verbose_name_plural = _("Importações de CSV")
+
+    def __str__(self):
+        return f"Importação {self.pk} ({self.get_status_display()})"
@@ -1,6 +1,12 @@
 from django.urls import path
-from core.controllers.dashboard_controller import DashboardOverviewView
+from core.controllers.dashboard_controller import (
+    CacheStatsView,
+    DashboardOverviewView,
+    DashboardTimeseriesView,
+)
 
 urlpatterns = [
     path("overview/", DashboardOverviewView.as_view(), name="dashboard-overview"),
+    path("timeseries/", DashboardTimeseriesView.as_view(), name="dashboard-timeseries"),
+    path("cache-stats/", CacheStatsView.as_view(), name="dashboard-cache-stats"),
 ]
@@ -1,14 +1,34 @@
 from django.urls import path
 from core.controllers.order_service_controller import (
     OrderServiceListCreateView,
+    OrderServiceBulkView,
     OrderServiceDetailView,
+    OrderServiceExportView,
+    OrderServiceHistoryView,
+    OrderServiceLogExportView,
     OrderServiceLogsView,
+    OrderServiceQueueClaimView,
+    OrderServiceQueueView,
+)
+from core.controllers.csv_import_controller import (
+    ImportJobDetailView,
+    OrderServiceCSVImportView,
 )
-from core.controllers.csv_import_controller import OrderServiceCSVImportView
 
 urlpatterns = [
     path("", OrderServiceListCreateView.as_view(), name="orders-list-create"),
+    path("bulk/", OrderServiceBulkView.as_view(), name="orders-bulk"),
+    path("fila/", OrderServiceQueueView.as_view(), name="orders-queue"),
+    path("fila/reivindicar/", OrderServiceQueueClaimView.as_view(), name="orders-queue-claim"),
+    path("exportar/", OrderServiceExportView.as_view(), name="orders-export"),
+    path("exportar/logs/", OrderServiceLogExportView.as_view(), name="orders-logs-export"),
     path("<uuid:id>/", OrderServiceDetailView.as_view(), name="orders-detail"),
     path("<uuid:id>/logs/", OrderServiceLogsView.as_view(), name="orders-logs"),
+    path("<uuid:id>/historico/", OrderServiceHistoryView.as_view(), name="orders-history"),
     path("importar-csv/", OrderServiceCSVImportView.as_view(), name="orders-import-csv"),
+    path(
+        "importar-csv/<uuid:job_id>/",
+        ImportJobDetailView.as_view(),
+        name="orders-import-csv-job",
+    ),
 ]
@@ -0,0 +1,45 @@
+from rest_framework import serializers
+
+from core.models import ImportJob
+from core.services.import_job_service import get_job_progress
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source="get_status_display", read_only=True)
+    created_by_username = serializers.ReadOnlyField(source="created_by.username")
+
+    elapsed_seconds = serializers.SerializerMethodField()
+    rows_per_second = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "status",
+            "status_display",
+            "mode",
+            "batch_size",
+            "rows_processed",
+            "rows_created",
+            "rows_updated",
+            "rows_unchanged",
+            "rows_failed",
+            "last_line",
+            "errors",
+            "error_message",
+            "elapsed_seconds",
+            "rows_per_second",
+            "created_by",
+            "created_by_username",
+            "created_at",
+            "started_at",
+            "heartbeat_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_elapsed_seconds(self, obj: ImportJob) -> float:
+        return get_job_progress(obj)["elapsed_seconds"]
+
+    def get_rows_per_second(self, obj: ImportJob):
+        return get_job_progress(obj)["rows_per_second"]
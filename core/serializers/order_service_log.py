@@ -1,13 +1,74 @@
 from rest_framework import serializers
 from core.models import OrderServiceLog
 from core.serializers.users import UserSerializer  # você já tem esse serializer
+from core.services.log_service import legacy_log_values
+from core.utils.fieldsets import SparseFieldsetSerializerMixin
 
 
-class OrderServiceLogSerializer(serializers.ModelSerializer):
+class LegacyLogListSerializer(serializers.ListSerializer):
+    """
+    Monta o old_values/new_values de todos os logs da lista de uma vez
+    (uma query pelo histórico das O.S. envolvidas).
+    """
+
+    def to_representation(self, data):
+        logs = list(data.all() if hasattr(data, "all") else data)
+        if {"old_values", "new_values"} & set(self.child.fields):
+            self.child.legacy_values = legacy_log_values(logs)
+        return super().to_representation(logs)
+
+
+class LegacyLogValuesMixin(serializers.Serializer):
+    """
+    Formato antigo dos logs (?formato=legado): old_values/new_values com
+    o estado da O.S. antes e depois, refeito a partir dos diffs.
+    """
+
+    old_values = serializers.SerializerMethodField()
+    new_values = serializers.SerializerMethodField()
+
+    legacy_values = None
+
+    def _legacy(self, obj):
+        if self.legacy_values is None:
+            self.legacy_values = legacy_log_values([obj])
+        return self.legacy_values.get(obj.id, (None, None))
+
+    def get_old_values(self, obj):
+        return self._legacy(obj)[0]
+
+    def get_new_values(self, obj):
+        return self._legacy(obj)[1]
+
+
+class OrderServiceLogSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     changed_by = UserSerializer(read_only=True)
 
+    field_sources = {
+        "changed_by": ("changed_by",) + tuple(
+            f"changed_by__{name}" for name in UserSerializer.Meta.fields
+        ),
+        # refeitos a partir do histórico da O.S. (formato legado)
+        "old_values": ("order_service",),
+        "new_values": ("order_service",),
+    }
+
     class Meta:
         model = OrderServiceLog
+        fields = [
+            "id",
+            "order_service",
+            "changed_by",
+            "changed_at",
+            "change_type",
+            "changes",
+            "snapshot",
+        ]
+        read_only_fields = fields
+
+
+class OrderServiceLogLegacySerializer(LegacyLogValuesMixin, OrderServiceLogSerializer):
+    class Meta(OrderServiceLogSerializer.Meta):
         fields = [
             "id",
             "order_service",
@@ -18,3 +79,4 @@ class OrderServiceLogSerializer(serializers.ModelSerializer):
             "new_values",
         ]
         read_only_fields = fields
+        list_serializer_class = LegacyLogListSerializer
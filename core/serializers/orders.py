@@ -1,11 +1,26 @@
 # core/serializers/orders.py
-from rest_framework import serializers
+from operator import itemgetter
 
-from core.models import OrderService, OrderServiceLog
-from core.services.sla_service import get_sla_status
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
+from core.models import (
+    OrderService,
+    OrderServiceLog,
+    ServiceOrderPriority,
+    ServiceOrderStatus,
+    ServiceProviderType,
+)
+from core.serializers.order_service_log import LegacyLogListSerializer, LegacyLogValuesMixin
+from core.services.sla_service import get_sla_status, sla_status_at
+from core.utils.fieldsets import SparseFieldsetSerializerMixin, required_columns
 
-class OrderServiceSerializer(serializers.ModelSerializer):
+_SKIP = object()
+
+
+class OrderServiceSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     created_by_username = serializers.ReadOnlyField(source="created_by.username")
     updated_by_username = serializers.ReadOnlyField(source="updated_by.username")
 
@@ -18,6 +33,18 @@ class OrderServiceSerializer(serializers.ModelSerializer):
     sla_status = serializers.SerializerMethodField()
     due_date = serializers.DateTimeField(source="sla_datetime", read_only=True)
 
+    # colunas lidas por campo (para ?fields= / ?exclude=)
+    field_sources = {
+        "type_display": ("type",),
+        "status_display": ("status",),
+        "provider_display": ("provider",),
+        "priority_display": ("priority",),
+        "due_date": ("sla_datetime",),
+        "sla_status": ("sla_datetime",),
+        "created_by_username": ("created_by", "created_by__username"),
+        "updated_by_username": ("updated_by", "updated_by__username"),
+    }
+
     class Meta:
         model = OrderService
         fields = [
@@ -64,11 +91,254 @@ class OrderServiceSerializer(serializers.ModelSerializer):
         return get_sla_status(obj)
 
 
-class OrderServiceLogSerializer(serializers.ModelSerializer):
+class OrderServiceListSerializer(serializers.BaseSerializer):
+    """
+    Serializer só de leitura para a listagem, a partir de linhas
+    `.values(*value_fields)` em vez de instâncias do model.
+
+    Gera exatamente o mesmo JSON do OrderServiceSerializer (mesmas
+    chaves, na mesma ordem, e sem `*_username` quando o usuário é nulo),
+    mas com os labels das choices em tabelas montadas uma vez e um
+    único `now` para o sla_status de todas as linhas (ou a anotação
+    `sla_status`, quando o queryset a tiver).
+    """
+
+    value_fields = (
+        "id",
+        "protocol",
+        "so_number",
+        "type",
+        "status",
+        "recipient_name",
+        "cpf",
+        "provider",
+        "priority",
+        "description",
+        "open_date",
+        "sla_datetime",
+        "created_by",
+        "created_by__username",
+        "updated_by",
+        "updated_by__username",
+        "created_at",
+        "updated_at",
+    )
+    choice_fields = ("type", "status", "provider", "priority")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.now = timezone.now()
+        # labels traduzidos no idioma ativo da request
+        self.labels = {
+            name: {
+                value: str(label)
+                for value, label in OrderService._meta.get_field(name).flatchoices
+            }
+            for name in self.choice_fields
+        }
+        self._datetime_field = serializers.DateTimeField()
+        self._timezone = None
+        if settings.USE_TZ and api_settings.DATETIME_FORMAT == ISO_8601:
+            self._timezone = timezone.get_current_timezone()
+
+        self.fieldset = self.context.get("fieldset")
+        if self.fieldset is not None:
+            getters = self._getters()
+            self._plan = [(name, getters.get(name, itemgetter(name))) for name in self.fieldset]
+
+    @classmethod
+    def get_values(cls, queryset, fieldset=None, extra_columns=()):
+        """
+        `fieldset` (?fields=) limita as colunas lidas; `extra_columns`
+        são as que a paginação precisa mesmo fora do fieldset.
+        """
+        columns = cls.value_fields
+        if fieldset is not None:
+            columns = required_columns(fieldset, OrderServiceSerializer.field_sources)
+            columns += [column for column in extra_columns if column not in columns]
+        # anotações (ex.: search_rank) seguem junto para a paginação
+        return queryset.values(*columns, *queryset.query.annotations)
+
+    def _datetime(self, value):
+        if not value:
+            return None
+        if self._timezone is None or value.tzinfo is None:
+            return self._datetime_field.to_representation(value)
+        text = value.astimezone(self._timezone).isoformat()
+        if text.endswith("+00:00"):
+            text = text[:-6] + "Z"
+        return text
+
+    def _sla_status(self, row):
+        # anotado pelo SlaStatusFilter (mesmo `now` do filtro ?sla_status=)
+        status = row.get("sla_status")
+        if status is None:
+            status = sla_status_at(row["sla_datetime"], self.now)
+        return status
+
+    def _getters(self):
+        labels = self.labels
+
+        def label(field):
+            return lambda row: labels[field].get(row[field], row[field])
+
+        def datetime(field):
+            return lambda row: self._datetime(row[field])
+
+        def username(field):
+            # ausente (e não None) quando o usuário é nulo, como no ModelSerializer
+            return lambda row: _SKIP if row[field] is None else row[f"{field}__username"]
+
+        return {
+            "id": lambda row: str(row["id"]),
+            "type_display": label("type"),
+            "status_display": label("status"),
+            "provider_display": label("provider"),
+            "priority_display": label("priority"),
+            "open_date": datetime("open_date"),
+            "sla_datetime": datetime("sla_datetime"),
+            "due_date": datetime("sla_datetime"),
+            "sla_status": self._sla_status,
+            "created_by_username": username("created_by"),
+            "updated_by_username": username("updated_by"),
+            "created_at": datetime("created_at"),
+            "updated_at": datetime("updated_at"),
+        }
+
+    def _sparse_representation(self, row):
+        data = {}
+        for name, getter in self._plan:
+            value = getter(row)
+            if value is not _SKIP:
+                data[name] = value
+        return data
+
+    def to_representation(self, row):
+        if self.fieldset is not None:
+            return self._sparse_representation(row)
+
+        labels = self.labels
+        sla_datetime = row["sla_datetime"]
+        due_date = self._datetime(sla_datetime)
+
+        data = {
+            "id": str(row["id"]),
+            "protocol": row["protocol"],
+            "so_number": row["so_number"],
+            "type": row["type"],
+            "type_display": labels["type"].get(row["type"], row["type"]),
+            "status": row["status"],
+            "status_display": labels["status"].get(row["status"], row["status"]),
+            "recipient_name": row["recipient_name"],
+            "cpf": row["cpf"],
+            "provider": row["provider"],
+            "provider_display": labels["provider"].get(row["provider"], row["provider"]),
+            "priority": row["priority"],
+            "priority_display": labels["priority"].get(row["priority"], row["priority"]),
+            "description": row["description"],
+            "open_date": self._datetime(row["open_date"]),
+            "sla_datetime": due_date,
+            "due_date": due_date,
+            "sla_status": self._sla_status(row),
+        }
+
+        # ReadOnlyField com source="created_by.username" some da saída
+        # quando o usuário é nulo; repete o mesmo comportamento
+        data["created_by"] = row["created_by"]
+        if row["created_by"] is not None:
+            data["created_by_username"] = row["created_by__username"]
+        data["updated_by"] = row["updated_by"]
+        if row["updated_by"] is not None:
+            data["updated_by_username"] = row["updated_by__username"]
+
+        data["created_at"] = self._datetime(row["created_at"])
+        data["updated_at"] = self._datetime(row["updated_at"])
+        return data
+
+
+class OrderServiceImportSerializer(OrderServiceSerializer):
+    """
+    Validação de linhas do CSV. A unicidade do protocolo é checada
+    por lote no import (uma query por lote, não por linha).
+    """
+
+    class Meta(OrderServiceSerializer.Meta):
+        extra_kwargs = {"protocol": {"validators": []}}
+
+
+class OrderServiceBulkSerializer(serializers.Serializer):
+    """
+    Corpo de /ordens-servico/bulk/. Sem `ids`, a operação vale para as
+    O.S. que casam com os filtros da query string (os mesmos da listagem).
+    """
+
+    VALUE_CHOICES = {
+        "status": ServiceOrderStatus.values,
+        "priority": ServiceOrderPriority.values,
+        "reassign": ServiceProviderType.values,
+    }
+
+    operation = serializers.ChoiceField(choices=["status", "priority", "reassign", "delete"])
+    value = serializers.CharField(required=False)
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        max_length=settings.BULK_MAX_ORDERS,
+    )
+
+    def validate(self, data):
+        choices = self.VALUE_CHOICES.get(data["operation"])
+        if choices is not None and data.get("value") not in choices:
+            raise serializers.ValidationError({"value": f"Use um de: {', '.join(choices)}."})
+        return data
+
+
+class OrderServiceQueueSerializer(serializers.Serializer):
+    """
+    Parâmetros da fila (?limit=, ?status=) e da reivindicação ({"limit": n}).
+    """
+
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    status = serializers.ChoiceField(
+        choices=[ServiceOrderStatus.OPEN, ServiceOrderStatus.IN_PROGRESS],
+        required=False,
+    )
+
+
+class OrderServiceHistoryQuerySerializer(serializers.Serializer):
+    """
+    Parâmetros do histórico da O.S. (?at=, sem fuso = horário local;
+    padrão: agora).
+    """
+
+    at = serializers.DateTimeField(required=False)
+
+
+class OrderServiceLogSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     changed_by_username = serializers.ReadOnlyField(source="changed_by.username")
 
+    field_sources = {
+        "changed_by_username": ("changed_by", "changed_by__username"),
+        # refeitos a partir do histórico da O.S. (formato legado)
+        "old_values": ("order_service",),
+        "new_values": ("order_service",),
+    }
+
     class Meta:
         model = OrderServiceLog
+        fields = [
+            "id",
+            "change_type",
+            "changed_at",
+            "changed_by_username",
+            "changes",
+            "snapshot",
+        ]
+
+
+class OrderServiceLogLegacySerializer(LegacyLogValuesMixin, OrderServiceLogSerializer):
+    class Meta(OrderServiceLogSerializer.Meta):
         fields = [
             "id",
             "change_type",
@@ -77,3 +347,4 @@ class OrderServiceLogSerializer(serializers.ModelSerializer):
             "old_values",
             "new_values",
         ]
+        list_serializer_class = LegacyLogListSerializer
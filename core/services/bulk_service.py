@@ -0,0 +1,137 @@
+# core/services/bulk_service.py
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import OrderService
+from core.services.cache_service import bump_orders_version
+from core.services.counter_service import track_order_changes
+from core.services.log_service import build_order_log, save_order_logs
+from core.services.sla_calendar_service import get_sla_calendars
+from core.services.sla_service import calculate_sla, sla_delta
+
+# operação -> campo alterado (delete é o delete lógico)
+BULK_OPERATIONS = {
+    "status": "status",
+    "priority": "priority",
+    "reassign": "provider",
+    "delete": "is_deleted",
+}
+
+
+def _report(results: List[Dict[str, Any]], operation: str) -> Dict[str, Any]:
+    summary = {"updated": 0, "unchanged": 0, "not_found": 0}
+    for item in results:
+        summary[item["result"]] += 1
+    return {
+        "operation": operation,
+        "matched": summary["updated"] + summary["unchanged"],
+        **summary,
+        "results": results,
+    }
+
+
+def apply_order_changes(orders: List[OrderService], field: str, value: Any, user) -> List[OrderService]:
+    """
+    Grava `field = value` nas O.S. (já carregadas e travadas pela
+    transação do chamador) em que o valor muda: um UPDATE, um
+    bulk_create dos logs, contadores em lote e invalidação de cache.
+    Devolve as O.S. alteradas (atualizadas também em memória).
+    """
+    now = timezone.now()
+    calendars = bool(get_sla_calendars())
+    # com calendários de SLA, o prazo depende também do prestador
+    recompute_sla = field == "priority" or (field == "provider" and calendars)
+    changes = []
+    for order in orders:
+        if getattr(order, field) == value:
+            continue
+        old_instance = deepcopy(order)
+        setattr(order, field, value)
+        if recompute_sla:
+            calculate_sla(order)
+        order.updated_by = user
+        order.updated_at = now
+        changes.append((old_instance, order))
+
+    if not changes:
+        return []
+
+    changed = [order for _, order in changes]
+    update = {field: value, "updated_by": user, "updated_at": now}
+    if recompute_sla and not calendars:
+        # mesma regra do calculate_sla (horas corridas), direto no banco
+        update["sla_datetime"] = F("open_date") + sla_delta(value)
+    OrderService.objects.filter(pk__in=[order.pk for order in changed]).update(**update)
+    if recompute_sla and calendars:
+        # horas úteis não cabem num UPDATE: grava os prazos já calculados
+        OrderService.objects.bulk_update(changed, ["sla_datetime"], batch_size=500)
+
+    deleting = field == "is_deleted"
+    # o log guarda só o diff: basta comparar os campos que o UPDATE mexe
+    fields = [field, "updated_by"] + (["sla_datetime"] if recompute_sla else [])
+    save_order_logs([
+        build_order_log(
+            order,
+            user,
+            "DELETED" if deleting else "UPDATED",
+            old_instance=old_instance,
+            fields=fields,
+        )
+        for old_instance, order in changes
+    ])
+    track_order_changes(changes)
+    bump_orders_version()
+    return changed
+
+
+def bulk_update_orders(
+    queryset,
+    operation: str,
+    value: Any,
+    user,
+    ids: Optional[Sequence] = None,
+) -> Dict[str, Any]:
+    """
+    Aplica uma operação a várias O.S. de uma vez, numa transação:
+    um UPDATE para todas as O.S. afetadas (com o SLA recalculado no
+    próprio UPDATE quando muda a prioridade), um bulk_create dos logs,
+    contadores do dashboard em lote e uma invalidação de cache.
+
+    Devolve o resultado por id: updated, unchanged ou not_found
+    (só com `ids`: inexistente ou já deletada).
+    """
+    field = BULK_OPERATIONS[operation]
+    if operation == "delete":
+        value = True
+
+    queryset = queryset.filter(is_deleted=False)
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+
+    with transaction.atomic():
+        # sem select_related: FOR UPDATE não vale no lado nulo de um LEFT JOIN (updated_by)
+        orders = list(
+            queryset.select_related(None).select_for_update().order_by("pk")[: settings.BULK_MAX_ORDERS + 1]
+        )
+        if len(orders) > settings.BULK_MAX_ORDERS:
+            raise ValidationError(
+                {"detail": f"A operação afeta mais de {settings.BULK_MAX_ORDERS} O.S.; refine o filtro."}
+            )
+
+        changed = apply_order_changes(orders, field, value, user)
+        changed_ids = {order.pk for order in changed}
+        results = [
+            {"id": str(order.pk), "result": "updated" if order.pk in changed_ids else "unchanged"}
+            for order in orders
+        ]
+
+    if ids is not None:
+        found = {order.pk for order in orders}
+        results += [{"id": str(pk), "result": "not_found"} for pk in dict.fromkeys(ids) if pk not in found]
+    return _report(results, operation)
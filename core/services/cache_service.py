@@ -0,0 +1,167 @@
+# core/services/cache_service.py
+import hashlib
+import threading
+from functools import wraps
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import CacheVersion
+
+ORDERS_VERSION = "orders"
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def get_orders_version() -> int:
+    version = (
+        CacheVersion.objects
+        .filter(name=ORDERS_VERSION)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def get_request_orders_version(request) -> int:
+    """
+    Versão das O.S. lida uma vez por request (o GET condicional e o
+    cache de resposta da mesma view usam o mesmo valor).
+    """
+    version = getattr(request, "_orders_version", None)
+    if version is None:
+        version = request._orders_version = get_orders_version()
+    return version
+
+
+def _increment_orders_version() -> None:
+    updated = CacheVersion.objects.filter(name=ORDERS_VERSION).update(
+        version=F("version") + 1
+    )
+    if not updated:
+        CacheVersion.objects.get_or_create(name=ORDERS_VERSION)
+
+
+def bump_orders_version() -> None:
+    """
+    Invalida todas as respostas cacheadas que dependem das O.S.
+    O incremento só acontece após o commit, para que nenhuma requisição
+    guarde dados antigos sob a versão nova.
+    """
+    transaction.on_commit(_increment_orders_version)
+
+
+def _normalize_params(query_params) -> str:
+    items = sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+    )
+    return "&".join(f"{key}={value}" for key, value in items)
+
+
+def build_cache_key(endpoint: str, query_params, version: int, extra: str = "") -> str:
+    raw = _normalize_params(query_params) + (f"|{extra}" if extra else "")
+    params_hash = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"resp:{endpoint}:v{version}:{params_hash}"
+
+
+def _record(endpoint: str, outcome: str) -> None:
+    with _stats_lock:
+        endpoint_stats = _stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+        endpoint_stats[outcome] += 1
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Contadores de hit/miss por endpoint (deste processo).
+    """
+    with _stats_lock:
+        return {endpoint: dict(values) for endpoint, values in _stats.items()}
+
+
+def reset_cache_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def cached_response(endpoint: str, vary=None):
+    """
+    Decorator para métodos GET de views DRF.
+    Cacheia response.data das respostas 200 usando a chave
+    (endpoint, query params normalizados, versão das O.S.).
+
+    vary(view, request) -> str entra na chave: para o que muda a
+    resposta sem passar por uma escrita (ex.: sla_status com o tempo).
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            version = get_request_orders_version(request)
+            extra = vary(view, request) if vary else ""
+            key = build_cache_key(endpoint, request.query_params, version, extra)
+
+            data = cache.get(key)
+            if data is not None:
+                _record(endpoint, "hits")
+                return Response(data)
+
+            _record(endpoint, "misses")
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+
+def conditional_response(view_method):
+    """
+    Decorator para métodos GET de views DRF (GET condicional).
+
+    A view implementa get_conditional_validators(request, *args, **kwargs)
+    -> (etag, last_modified), calculados com uma query barata. Se o
+    cliente já tem essa versão (If-None-Match / If-Modified-Since),
+    responde 304 sem executar o método (nem serializar nada).
+    """
+
+    @wraps(view_method)
+    def wrapper(view, request, *args, **kwargs):
+        etag, last_modified = view.get_conditional_validators(request, *args, **kwargs)
+        if etag is None and last_modified is None:
+            # ex.: objeto inexistente; o método devolve o 404
+            return view_method(view, request, *args, **kwargs)
+
+        # a representação muda com a URL (filtros, cursor, ordering)
+        # e com o formato negociado (JSON x browsable API)
+        etag = quote_etag(make_etag(etag, request.get_full_path(), request.accepted_media_type))
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    return wrapper
@@ -0,0 +1,164 @@
+# core/services/counter_service.py
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, QuerySet, Sum
+
+from core.models import DashboardCounter, OrderService
+
+COUNTER_FIELDS = ("status", "priority", "type", "provider")
+
+CounterKey = Tuple[str, str, str, str]
+
+
+def _counter_key(order: Optional[OrderService]) -> Optional[CounterKey]:
+    """
+    Chave do contador para a O.S., ou None se ela não deve ser contada.
+    """
+    if order is None or order.is_deleted:
+        return None
+    return tuple(getattr(order, field) for field in COUNTER_FIELDS)
+
+
+def _apply_delta(key: CounterKey, delta: int) -> None:
+    if not delta:
+        return
+
+    lookup = dict(zip(COUNTER_FIELDS, key))
+    updated = DashboardCounter.objects.filter(**lookup).update(total=F("total") + delta)
+    if not updated:
+        counter, _ = DashboardCounter.objects.get_or_create(**lookup)
+        DashboardCounter.objects.filter(pk=counter.pk).update(total=F("total") + delta)
+
+
+def track_order_change(
+    old_instance: Optional[OrderService],
+    new_instance: Optional[OrderService],
+) -> None:
+    """
+    Ajusta os contadores para a transição old -> new de uma O.S.
+    Deve ser chamado dentro da mesma transação da escrita.
+    """
+    old_key = _counter_key(old_instance)
+    new_key = _counter_key(new_instance)
+    if old_key == new_key:
+        return
+
+    if old_key is not None:
+        _apply_delta(old_key, -1)
+    if new_key is not None:
+        _apply_delta(new_key, 1)
+
+
+def track_order_changes(
+    changes: Iterable[Tuple[Optional[OrderService], Optional[OrderService]]],
+) -> None:
+    """
+    Versão em lote de track_order_change: soma as transições
+    e faz um UPDATE por categoria afetada.
+    """
+    deltas: Counter = Counter()
+    for old_instance, new_instance in changes:
+        old_key = _counter_key(old_instance)
+        new_key = _counter_key(new_instance)
+        if old_key == new_key:
+            continue
+        if old_key is not None:
+            deltas[old_key] -= 1
+        if new_key is not None:
+            deltas[new_key] += 1
+
+    # ordem fixa das linhas travadas: dois lotes concorrentes (imports
+    # paralelos, bulk) com as mesmas categorias não entram em deadlock
+    keys = sorted(key for key, delta in deltas.items() if delta)
+    if not keys:
+        return
+
+    # cria de uma vez as categorias que ainda não têm contador;
+    # depois é um UPDATE por categoria
+    DashboardCounter.objects.bulk_create(
+        [DashboardCounter(**dict(zip(COUNTER_FIELDS, key))) for key in keys],
+        ignore_conflicts=True,
+    )
+    for key in keys:
+        lookup = dict(zip(COUNTER_FIELDS, key))
+        DashboardCounter.objects.filter(**lookup).update(total=F("total") + deltas[key])
+
+
+def untrack_queryset(qs: QuerySet) -> None:
+    """
+    Desconta dos contadores todas as O.S. do queryset
+    (usado antes de updates em massa de is_deleted).
+    """
+    rows = (
+        qs.filter(is_deleted=False)
+        .order_by()
+        .values(*COUNTER_FIELDS)
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        key = tuple(row[field] for field in COUNTER_FIELDS)
+        _apply_delta(key, -row["n"])
+
+
+def get_status_breakdown() -> List[Dict]:
+    return list(
+        DashboardCounter.objects
+        .values("status")
+        .annotate(total=Sum("total"))
+        .filter(total__gt=0)
+        .order_by("status")
+    )
+
+
+def _live_counts() -> Dict[CounterKey, int]:
+    rows = (
+        OrderService.objects.filter(is_deleted=False)
+        .order_by()
+        .values(*COUNTER_FIELDS)
+        .annotate(n=Count("id"))
+    )
+    return {tuple(row[field] for field in COUNTER_FIELDS): row["n"] for row in rows}
+
+
+def _stored_counts() -> Dict[CounterKey, int]:
+    rows = DashboardCounter.objects.values_list(*COUNTER_FIELDS, "total")
+    return {tuple(row[:-1]): row[-1] for row in rows if row[-1]}
+
+
+def _diff_counts(live: Dict[CounterKey, int], stored: Dict[CounterKey, int]) -> List[Dict]:
+    drift = []
+    for key in sorted(set(live) | set(stored)):
+        expected = live.get(key, 0)
+        actual = stored.get(key, 0)
+        if expected != actual:
+            drift.append({
+                **dict(zip(COUNTER_FIELDS, key)),
+                "expected": expected,
+                "stored": actual,
+            })
+    return drift
+
+
+def find_counter_drift() -> List[Dict]:
+    """
+    Compara os contadores com a tabela de O.S. e retorna as divergências.
+    """
+    return _diff_counts(_live_counts(), _stored_counts())
+
+
+def rebuild_counters() -> List[Dict]:
+    """
+    Recria todos os contadores a partir da tabela de O.S.
+    Retorna as divergências encontradas antes da reconstrução.
+    """
+    with transaction.atomic():
+        live = _live_counts()
+        drift = _diff_counts(live, _stored_counts())
+        DashboardCounter.objects.all().delete()
+        DashboardCounter.objects.bulk_create([
+            DashboardCounter(**dict(zip(COUNTER_FIELDS, key)), total=total)
+            for key, total in live.items()
+        ])
+    return drift
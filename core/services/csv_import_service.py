@@ -0,0 +1,342 @@
+# core/services/csv_import_service.py
+import csv
+import io
+from contextlib import contextmanager
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import ImportMode, OrderService
+from core.serializers.orders import OrderServiceImportSerializer
+from core.services.cache_service import bump_orders_version
+from core.services.counter_service import track_order_changes
+from core.services.log_service import build_order_log, save_order_logs
+from core.services.order_service import create_order, update_order
+from core.services.sla_service import calculate_sla
+
+PROTOCOL_EXISTS_ERROR = {"protocol": ["Já existe uma O.S. com este protocolo."]}
+PROTOCOL_DELETED_ERROR = {
+    "protocol": ["A O.S. com este protocolo foi excluída; restaure-a antes de atualizar pelo CSV."]
+}
+
+
+class ImportErrorCollector:
+    """
+    Guarda no máximo `limit` erros, mas conta todos.
+    Evita que um arquivo cheio de linhas inválidas estoure a resposta.
+    Com `sink`, todo erro (mesmo além do limite) também é entregue a ele.
+    """
+
+    def __init__(self, limit: int, sink: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.limit = limit
+        self.sink = sink
+        self.count = 0
+        self.items: List[Dict[str, Any]] = []
+
+    def add(self, line: int, error: Any) -> None:
+        self.count += 1
+        entry = {"line": line, "error": error}
+        if self.sink is not None:
+            self.sink(entry)
+        if len(self.items) < self.limit:
+            self.items.append(entry)
+
+    @property
+    def truncated(self) -> bool:
+        return self.count > len(self.items)
+
+
+class OrderBulkImporter:
+    """
+    Valida linhas em memória e grava as O.S. (e seus logs) com
+    bulk_create/bulk_update em lotes de `batch_size`, um lote por transação.
+
+    - mode=insert: protocolo já existente vira erro na linha.
+    - mode=upsert: protocolo existente é atualizado; o log guarda só
+      os campos que mudaram e linhas sem mudança não geram escrita.
+      Protocolo de O.S. excluída (lógica) vira erro na linha: o CSV
+      não restaura nem altera O.S. excluídas.
+    """
+
+    def __init__(
+        self,
+        user,
+        batch_size: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        mode: str = ImportMode.INSERT,
+    ):
+        self.user = user
+        self.mode = mode
+        self.batch_size = batch_size or settings.CSV_IMPORT_BATCH_SIZE
+        self.errors = ImportErrorCollector(
+            settings.CSV_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        )
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.rows_processed = 0
+        self.last_line = 0
+        # uma instância só: os fields do ModelSerializer são montados uma vez
+        self._serializer = OrderServiceImportSerializer()
+        self._batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    def add_row(self, line: int, row: Dict[str, Any]) -> None:
+        self.rows_processed += 1
+        self.last_line = line
+        try:
+            data = self._serializer.run_validation(row)
+        except ValidationError as e:
+            self.errors.add(line, e.detail)
+            return
+
+        self._batch.append((line, data))
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def add_error(self, line: int, error: Any) -> None:
+        self.errors.add(line, error)
+
+    def flush(self) -> None:
+        batch, self._batch = self._batch, []
+        if batch:
+            self._write_batch(batch)
+        else:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """
+        Chamado a cada lote gravado (dentro da transação do lote,
+        quando houver). Subclasses usam para persistir o progresso.
+        """
+
+    def _new_order(self, data: Dict[str, Any]) -> OrderService:
+        order = OrderService(**data)
+        order.created_by = self.user
+        calculate_sla(order)
+        return order
+
+    def _plan_insert(self, batch):
+        protocols = [data["protocol"] for _, data in batch]
+        existing = set(
+            OrderService.objects
+            .filter(protocol__in=protocols)
+            .values_list("protocol", flat=True)
+        )
+
+        rows = []
+        new_orders = []
+        for line, data in batch:
+            if data["protocol"] in existing:
+                self.errors.add(line, PROTOCOL_EXISTS_ERROR)
+                continue
+            existing.add(data["protocol"])
+
+            rows.append((line, data))
+            new_orders.append(self._new_order(data))
+        return rows, new_orders, [], 0
+
+    def _plan_upsert(self, batch):
+        protocols = [data["protocol"] for _, data in batch]
+        # um SELECT por lote para todos os protocolos do lote
+        existing: Dict[str, OrderService] = {}
+        deleted = set()
+        for order in OrderService.objects.filter(protocol__in=protocols):
+            if order.is_deleted:
+                deleted.add(order.protocol)
+            else:
+                existing[order.protocol] = order
+
+        rows = []
+        new_orders: Dict[str, OrderService] = {}
+        originals: Dict[str, OrderService] = {}
+        for line, data in batch:
+            protocol = data["protocol"]
+            if protocol in deleted:
+                self.errors.add(line, PROTOCOL_DELETED_ERROR)
+                continue
+            rows.append((line, data))
+
+            order = new_orders.get(protocol) or existing.get(protocol)
+            if order is None:
+                new_orders[protocol] = self._new_order(data)
+                continue
+
+            # protocolo repetido no arquivo: a última linha vence
+            if protocol in existing and protocol not in originals:
+                originals[protocol] = deepcopy(order)
+            for key, value in data.items():
+                setattr(order, key, value)
+            calculate_sla(order)
+
+        now = timezone.now()
+        updates = []
+        unchanged = 0
+        for protocol, old_instance in originals.items():
+            order = existing[protocol]
+            changed = _changed_fields(old_instance, order)
+            if not changed:
+                unchanged += 1
+                continue
+            order.updated_at = now
+            updates.append((old_instance, order, changed))
+
+        return rows, list(new_orders.values()), updates, unchanged
+
+    def _write_batch(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if self.mode == ImportMode.UPSERT:
+            rows, new_orders, updates, unchanged = self._plan_upsert(batch)
+        else:
+            rows, new_orders, updates, unchanged = self._plan_insert(batch)
+
+        self.unchanged += unchanged
+        if not new_orders and not updates:
+            self.checkpoint()
+            return
+
+        counts_before = (self.created, self.updated)
+        try:
+            with transaction.atomic():
+                logs = []
+                if new_orders:
+                    OrderService.objects.bulk_create(new_orders)
+                    logs += [
+                        build_order_log(order, self.user, change_type="CREATED")
+                        for order in new_orders
+                    ]
+                if updates:
+                    update_fields = set().union(*(changed for _, _, changed in updates))
+                    OrderService.objects.bulk_update(
+                        [order for _, order, _ in updates],
+                        sorted(update_fields | {"updated_at"}),
+                    )
+                    logs += [
+                        build_order_log(
+                            order,
+                            self.user,
+                            change_type="UPDATED",
+                            old_instance=old_instance,
+                            fields=changed,
+                        )
+                        for old_instance, order, changed in updates
+                    ]
+                save_order_logs(logs)
+
+                track_order_changes(
+                    [(None, order) for order in new_orders]
+                    + [(old_instance, order) for old_instance, order, _ in updates]
+                )
+                bump_orders_version()
+                self.created += len(new_orders)
+                self.updated += len(updates)
+                self.checkpoint()
+        except DatabaseError:
+            # algum conflito no lote (ex.: protocolo inserido em paralelo):
+            # refaz linha a linha para apontar o erro na linha certa
+            self.created, self.updated = counts_before
+            self.unchanged -= unchanged
+            self._write_rows_one_by_one(rows)
+
+    def _write_rows_one_by_one(self, rows) -> None:
+        """
+        Uma transação para o lote inteiro, com um savepoint por linha: as
+        linhas boas e o checkpoint são commitados juntos (uma retomada não
+        relê linhas já gravadas) e a linha com erro só desfaz o próprio
+        savepoint.
+        """
+        counts_before = (self.created, self.updated)
+        try:
+            with transaction.atomic():
+                for line, data in rows:
+                    try:
+                        with transaction.atomic():
+                            existing = None
+                            if self.mode == ImportMode.UPSERT:
+                                existing = OrderService.objects.filter(protocol=data["protocol"]).first()
+                                if existing is not None and existing.is_deleted:
+                                    raise ValidationError(PROTOCOL_DELETED_ERROR)
+
+                            if existing is not None:
+                                update_order(existing, data, self.user)
+                            else:
+                                create_order(data, self.user)
+                    except ValidationError as e:
+                        self.errors.add(line, e.detail)
+                    except Exception as e:
+                        self.errors.add(line, str(e))
+                    else:
+                        if existing is not None:
+                            self.updated += 1
+                        else:
+                            self.created += 1
+                self.checkpoint()
+        except Exception:
+            self.created, self.updated = counts_before
+            raise
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "rows_processed": self.rows_processed,
+            "errors": sorted(self.errors.items, key=lambda error: error["line"]),
+            "error_count": self.errors.count,
+            "errors_truncated": self.errors.truncated,
+        }
+
+
+def _changed_fields(old_instance: OrderService, order: OrderService) -> List[str]:
+    return [
+        field.name
+        for field in OrderService._meta.concrete_fields
+        if getattr(old_instance, field.attname) != getattr(order, field.attname)
+    ]
+
+
+@contextmanager
+def open_csv_stream(file) -> Iterator[csv.DictReader]:
+    """
+    Lê o upload como texto, decodificando em blocos (sem carregar o
+    arquivo inteiro na memória). O BOM do Excel é descartado.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield csv.DictReader(text)
+    finally:
+        # não fecha o arquivo do upload junto com o wrapper
+        text.detach()
+
+
+def run_importer(importer: OrderBulkImporter, file, start_after: int = 0) -> Dict[str, Any]:
+    """
+    Alimenta o importer com as linhas do CSV, pulando as linhas
+    <= start_after (já processadas numa execução anterior).
+    """
+    line = 0
+    with open_csv_stream(file) as reader:
+        try:
+            for line, row in enumerate(reader, start=1):
+                if line <= start_after:
+                    continue
+                importer.add_row(line, row)
+        except UnicodeDecodeError:
+            importer.add_error(line + 1, "Arquivo CSV deve estar em UTF-8.")
+        except csv.Error as e:
+            importer.add_error(line + 1, f"CSV inválido: {e}")
+
+    importer.flush()
+    return importer.result()
+
+
+def import_orders_from_csv(
+    file,
+    user,
+    batch_size: Optional[int] = None,
+    mode: str = ImportMode.INSERT,
+) -> Dict[str, Any]:
+    return run_importer(OrderBulkImporter(user, batch_size=batch_size, mode=mode), file)
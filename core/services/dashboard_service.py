@@ -1,38 +1,41 @@
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import Count
+from django.db.models import Count, Q
 from core.models import OrderService
-from core.services.sla_service import get_sla_status
+from core.services.counter_service import get_status_breakdown
 
 
 def get_overview():
+    """
+    Resumo do dashboard calculado inteiramente no banco:
+    uma agregação para total + buckets de SLA, e o breakdown por
+    status lido da tabela de contadores (DashboardCounter).
+    """
     qs = OrderService.objects.filter(is_deleted=False)
-    total = qs.count()
-
-    by_status = qs.values("status").annotate(total=Count("id"))
 
     now = timezone.now()
-    in_24h = 0
-    in_48h = 0
-    late = 0
+    limit_24h = now + timedelta(hours=24)
+    limit_48h = now + timedelta(hours=48)
 
-    for order in qs:
-        status = get_sla_status(order)
-        if status == "late":
-            late += 1
-        elif order.sla_datetime:
-            delta = order.sla_datetime - now
-            if delta <= timedelta(hours=24):
-                in_24h += 1
-            elif delta <= timedelta(hours=48):
-                in_48h += 1
+    totals = qs.aggregate(
+        total=Count("id"),
+        late=Count("id", filter=Q(sla_datetime__lt=now)),
+        due_in_24h=Count(
+            "id",
+            filter=Q(sla_datetime__gte=now, sla_datetime__lte=limit_24h),
+        ),
+        due_in_48h=Count(
+            "id",
+            filter=Q(sla_datetime__gt=limit_24h, sla_datetime__lte=limit_48h),
+        ),
+    )
 
     return {
-        "total_orders": total,
-        "by_status": list(by_status),
+        "total_orders": totals["total"],
+        "by_status": get_status_breakdown(),
         "sla": {
-            "due_in_24h": in_24h,
-            "due_in_48h": in_48h,
-            "late": late,
+            "due_in_24h": totals["due_in_24h"],
+            "due_in_48h": totals["due_in_48h"],
+            "late": totals["late"],
         },
     }
@@ -0,0 +1,121 @@
+# core/services/export_service.py
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import serializers
+
+from core.models import OrderServiceLog
+from core.serializers.orders import OrderServiceListSerializer, OrderServiceSerializer
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+ORDER_EXPORT_COLUMNS = list(OrderServiceSerializer.Meta.fields)
+LOG_EXPORT_COLUMNS = [
+    "id",
+    "order_service",
+    "change_type",
+    "changed_at",
+    "changed_by",
+    "changed_by_username",
+    "changes",
+    "snapshot",
+]
+
+
+class _Echo:
+    """
+    "Arquivo" que só devolve o que recebe: o csv.writer formata a linha
+    e o gerador repassa o texto para a resposta.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, cls=DjangoJSONEncoder)
+    return value
+
+
+def _batched(lines: Iterable[str], size: int) -> Iterator[str]:
+    # agrupa linhas para não mandar um chunk HTTP por registro
+    buffer: List[str] = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def _csv_lines(rows: Iterable[Dict[str, Any]], columns: Sequence[str]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    # BOM para o Excel reconhecer UTF-8 (o import de CSV já o descarta)
+    yield "\ufeff" + writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_csv_value(row.get(column)) for column in columns])
+
+
+def _ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_rows(rows: Iterable[Dict[str, Any]], columns: Sequence[str], fmt: str) -> Iterator[str]:
+    lines = _csv_lines(rows, columns) if fmt == "csv" else _ndjson_lines(rows)
+    return _batched(lines, settings.EXPORT_CHUNK_SIZE)
+
+
+def iter_order_rows(queryset) -> Iterator[Dict[str, Any]]:
+    """
+    O.S. no mesmo formato da listagem, lidas em blocos (iterator):
+    a memória não cresce com o tamanho da exportação.
+    """
+    serializer = OrderServiceListSerializer()
+    rows = OrderServiceListSerializer.get_values(queryset)
+    for row in rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        data = serializer.to_representation(row)
+        yield {column: data.get(column) for column in ORDER_EXPORT_COLUMNS}
+
+
+def iter_order_log_rows(order_queryset) -> Iterator[Dict[str, Any]]:
+    """
+    Logs das O.S. do queryset (já filtrado), do mais antigo ao mais novo.
+    """
+    datetime_field = serializers.DateTimeField()
+    logs = (
+        OrderServiceLog.objects
+        .filter(order_service__in=order_queryset.values("pk"))
+        .order_by("changed_at", "id")
+        .values(
+            "id",
+            "order_service",
+            "change_type",
+            "changed_at",
+            "changed_by",
+            "changed_by__username",
+            "changes",
+            "snapshot",
+        )
+    )
+    for row in logs.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield {
+            "id": row["id"],
+            "order_service": str(row["order_service"]),
+            "change_type": row["change_type"],
+            "changed_at": datetime_field.to_representation(row["changed_at"]),
+            "changed_by": str(row["changed_by"]) if row["changed_by"] else None,
+            "changed_by_username": row["changed_by__username"],
+            "changes": row["changes"],
+            "snapshot": row["snapshot"],
+        }
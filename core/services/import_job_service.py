@@ -0,0 +1,201 @@
+# core/services/import_job_service.py
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from core.models import ImportJob, ImportMode
+from core.services.csv_import_service import OrderBulkImporter, run_importer
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class ImportJobClaimLost(Exception):
+    """
+    Outro worker reivindicou o job (este ficou sem heartbeat): o lote
+    em andamento é desfeito e este worker para.
+    """
+
+
+class JobImporter(OrderBulkImporter):
+    """
+    Importer que grava o progresso no ImportJob a cada lote,
+    na mesma transação das O.S. do lote.
+    """
+
+    def __init__(self, job: ImportJob, claim_token=None):
+        super().__init__(job.created_by, batch_size=job.batch_size, mode=job.mode)
+        self.job = job
+        self.claim_token = claim_token or job.claim_token
+
+        # retomada: continua de onde o último lote commitado parou
+        self.created = job.rows_created
+        self.updated = job.rows_updated
+        self.unchanged = job.rows_unchanged
+        self.rows_processed = job.rows_processed
+        self.last_line = job.last_line
+        self.errors.items = list(job.errors)
+        self.errors.count = job.rows_failed
+
+    def checkpoint(self) -> None:
+        saved = ImportJob.objects.filter(pk=self.job.pk, claim_token=self.claim_token).update(
+            last_line=self.last_line,
+            rows_processed=self.rows_processed,
+            rows_created=self.created,
+            rows_updated=self.updated,
+            rows_unchanged=self.unchanged,
+            rows_failed=self.errors.count,
+            errors=self.errors.items,
+            heartbeat_at=timezone.now(),
+        )
+        if not saved:
+            # dentro da transação do lote: as O.S. dele também são desfeitas
+            raise ImportJobClaimLost(f"Importação {self.job.pk} reivindicada por outro worker.")
+
+
+def create_import_job(
+    file,
+    user,
+    batch_size: Optional[int] = None,
+    mode: str = ImportMode.INSERT,
+) -> ImportJob:
+    job = ImportJob.objects.create(
+        file=file,
+        created_by=user,
+        mode=mode,
+        batch_size=batch_size or settings.CSV_IMPORT_BATCH_SIZE,
+    )
+    if settings.CSV_IMPORT_JOB_BACKEND == "thread":
+        transaction.on_commit(lambda: _submit(job.pk))
+    return job
+
+
+def _submit(job_id) -> None:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.CSV_IMPORT_JOB_THREADS,
+            thread_name_prefix="csv-import",
+        )
+    _executor.submit(_run_in_thread, job_id)
+
+
+def _run_in_thread(job_id) -> None:
+    close_old_connections()
+    try:
+        claim_token = claim_job(job_id)
+        if claim_token:
+            run_import_job(job_id, claim_token)
+    except Exception:
+        logger.exception("Falha ao processar importação %s", job_id)
+    finally:
+        # conexões são por thread; não deixar abertas no pool
+        connection.close()
+
+
+def _stale_cutoff(stale_after: Optional[int] = None):
+    seconds = settings.CSV_IMPORT_JOB_STALE_SECONDS if stale_after is None else stale_after
+    return timezone.now() - timedelta(seconds=seconds)
+
+
+def claim_job(job_id, stale_after: Optional[int] = None) -> Optional[uuid.UUID]:
+    """
+    Marca o job como RUNNING. Só um worker consegue: o UPDATE é condicional
+    (job pendente, ou rodando sem heartbeat recente = worker morreu).
+
+    Devolve o token da reivindicação (None se não conseguiu). Os
+    checkpoints só gravam com o token atual, então o worker antigo de
+    um job retomado não sobrescreve o progresso do novo.
+    """
+    now = timezone.now()
+    token = uuid.uuid4()
+    claimed = ImportJob.objects.filter(
+        pk=job_id, status=ImportJob.Status.PENDING
+    ).update(status=ImportJob.Status.RUNNING, started_at=now, heartbeat_at=now, claim_token=token)
+    if claimed:
+        return token
+
+    taken_over = ImportJob.objects.filter(
+        pk=job_id,
+        status=ImportJob.Status.RUNNING,
+        heartbeat_at__lt=_stale_cutoff(stale_after),
+    ).update(heartbeat_at=now, claim_token=token)
+    return token if taken_over else None
+
+
+def claim_next_job(stale_after: Optional[int] = None) -> Optional[ImportJob]:
+    candidates = (
+        ImportJob.objects
+        .filter(status=ImportJob.Status.PENDING)
+        .order_by("created_at")
+        .values_list("pk", flat=True)[:10]
+    )
+    stale = (
+        ImportJob.objects
+        .filter(status=ImportJob.Status.RUNNING, heartbeat_at__lt=_stale_cutoff(stale_after))
+        .order_by("created_at")
+        .values_list("pk", flat=True)[:10]
+    )
+    for job_id in [*candidates, *stale]:
+        if claim_job(job_id, stale_after):
+            return ImportJob.objects.get(pk=job_id)
+    return None
+
+
+def run_import_job(job_id, claim_token=None) -> ImportJob:
+    """
+    Processa (ou retoma) um job já reivindicado via claim_job (com o
+    token devolvido por ele; sem token, usa o gravado no job).
+    Levanta ImportJobClaimLost se outro worker assumiu o job no meio.
+    """
+    job = ImportJob.objects.select_related("created_by").get(pk=job_id)
+    importer = JobImporter(job, claim_token)
+
+    try:
+        with job.file.open("rb") as file:
+            run_importer(importer, file, start_after=job.last_line)
+    except ImportJobClaimLost:
+        # o job é do outro worker agora: nada de estado final nem apagar o CSV
+        raise
+    except Exception as e:
+        _finish(job, importer.claim_token, ImportJob.Status.FAILED, error_message=str(e))
+        raise
+
+    _finish(job, importer.claim_token, ImportJob.Status.COMPLETED)
+    job.refresh_from_db()
+    return job
+
+
+def _finish(job: ImportJob, claim_token, status: str, **fields) -> None:
+    """
+    Estado final do job. O CSV só serve para processar/retomar: depois
+    disso é apagado do storage.
+    """
+    finished = ImportJob.objects.filter(pk=job.pk, claim_token=claim_token).update(
+        status=status,
+        finished_at=timezone.now(),
+        file="",
+        **fields,
+    )
+    if not finished:
+        raise ImportJobClaimLost(f"Importação {job.pk} reivindicada por outro worker.")
+    try:
+        job.file.delete(save=False)
+    except OSError:
+        logger.warning("Não foi possível apagar o arquivo da importação %s", job.pk, exc_info=True)
+
+
+def get_job_progress(job: ImportJob) -> Dict[str, Any]:
+    end = job.finished_at or job.heartbeat_at
+    elapsed = (end - job.started_at).total_seconds() if job.started_at and end else 0
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(job.rows_processed / elapsed, 1) if elapsed > 0 else None,
+    }
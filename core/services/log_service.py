@@ -1,11 +1,18 @@
 # core/services/log_service.py
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, date
 from uuid import UUID
 
+from django.conf import settings
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.forms.models import model_to_dict
 
 from core.models import OrderService, OrderServiceLog
+from core.services.cache_service import make_etag
+
+# muda quando o formato dos logs muda (ETags antigas deixam de casar)
+LOG_ETAG_FORMAT = "diffs"
 
 
 def _serialize_value(value: Any):
@@ -20,28 +27,178 @@ def _serialize_value(value: Any):
     return value
 
 
-def _serialize_instance(instance: OrderService) -> Dict[str, Any]:
+def _serialize_instance(
+    instance: OrderService,
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
     """
     Converte o model para dict e garante que todos os valores
-    sejam serializáveis em JSON.
+    sejam serializáveis em JSON. Com `fields`, inclui só esses campos.
     """
-    data = model_to_dict(instance)
+    data = model_to_dict(instance, fields=fields)
     return {key: _serialize_value(value) for key, value in data.items()}
 
 
-def create_order_log(
+def diff_values(old_data: Dict[str, Any], new_data: Dict[str, Any]) -> Dict[str, list]:
+    """
+    {campo: [antes, depois]} só com os campos que mudaram.
+    """
+    return {
+        key: [old_data.get(key), value]
+        for key, value in new_data.items()
+        if old_data.get(key) != value
+    }
+
+
+def apply_changes(state: Optional[Dict[str, Any]], log) -> Dict[str, Any]:
+    """
+    Estado da O.S. depois do log (`log` com .changes/.snapshot ou um
+    dict de .values()), a partir do estado antes dele.
+    """
+    snapshot = log["snapshot"] if isinstance(log, dict) else log.snapshot
+    if snapshot is not None:
+        return dict(snapshot)
+    changes = log["changes"] if isinstance(log, dict) else log.changes
+    state = dict(state or {})
+    for key, (_, value) in (changes or {}).items():
+        state[key] = value
+    return state
+
+
+def build_order_log(
     order: OrderService,
     user,
     change_type: str,
     old_instance: Optional[OrderService] = None,
-) -> None:
-    old_data = _serialize_instance(old_instance) if old_instance else None
-    new_data = _serialize_instance(order)
+    fields: Optional[Iterable[str]] = None,
+) -> OrderServiceLog:
+    """
+    Monta o log sem salvar (para uso com save_order_logs).
+    Guarda só o diff; o CREATED leva o snapshot completo.
+    """
+    if change_type == OrderServiceLog.ChangeType.CREATED or old_instance is None:
+        return OrderServiceLog(
+            order_service=order,
+            changed_by=user,
+            change_type=change_type,
+            snapshot=_serialize_instance(order),
+        )
 
-    OrderServiceLog.objects.create(
+    return OrderServiceLog(
         order_service=order,
         changed_by=user,
         change_type=change_type,
-        old_values=old_data,
-        new_values=new_data,
+        changes=diff_values(
+            _serialize_instance(old_instance, fields),
+            _serialize_instance(order, fields),
+        ),
+    )
+
+
+def _logs_since_snapshot(order_ids) -> Dict[Any, int]:
+    """
+    Logs gravados depois do último snapshot, por O.S. (uma query).
+    """
+    last_snapshot = (
+        OrderServiceLog.objects
+        .filter(order_service=OuterRef("order_service"), snapshot__isnull=False)
+        .order_by("-id")
+        .values("id")[:1]
+    )
+    rows = (
+        OrderServiceLog.objects
+        .filter(order_service_id__in=order_ids)
+        .filter(id__gt=Coalesce(Subquery(last_snapshot), 0))
+        .order_by()
+        .values("order_service_id")
+        .annotate(n=Count("id"))
+    )
+    return {row["order_service_id"]: row["n"] for row in rows}
+
+
+def save_order_logs(logs: List[OrderServiceLog]) -> None:
+    """
+    Grava os logs (bulk_create). A cada ORDER_LOG_SNAPSHOT_INTERVAL
+    logs de uma O.S., o log também leva o snapshot completo dela, para
+    o histórico não ter que ser reconstruído desde o CREATED.
+    """
+    pending = [log for log in logs if log.snapshot is None]
+    if pending:
+        interval = settings.ORDER_LOG_SNAPSHOT_INTERVAL
+        counts = _logs_since_snapshot({log.order_service_id for log in pending})
+        for log in pending:
+            count = counts.get(log.order_service_id, 0) + 1
+            if count >= interval:
+                log.snapshot = _serialize_instance(log.order_service)
+                count = 0
+            counts[log.order_service_id] = count
+    OrderServiceLog.objects.bulk_create(logs)
+
+
+def create_order_log(
+    order: OrderService,
+    user,
+    change_type: str,
+    old_instance: Optional[OrderService] = None,
+) -> None:
+    save_order_logs([build_order_log(order, user, change_type, old_instance)])
+
+
+def legacy_log_values(logs: Iterable[OrderServiceLog]) -> Dict[int, Tuple[Optional[Dict], Optional[Dict]]]:
+    """
+    (old_values, new_values) no formato antigo (estado completo antes e
+    depois) para cada log, refazendo o histórico das O.S. envolvidas.
+    Antes do primeiro snapshot o estado é desconhecido: aí saem só os
+    campos do diff.
+    """
+    logs = list(logs)
+    wanted = {log.id for log in logs}
+    history = (
+        OrderServiceLog.objects
+        .filter(order_service_id__in={log.order_service_id for log in logs})
+        .order_by("order_service_id", "changed_at", "id")
+        .values("id", "order_service_id", "change_type", "changes", "snapshot")
+    )
+
+    values = {}
+    order_id = state = None
+    for row in history.iterator(chunk_size=2000):
+        if row["order_service_id"] != order_id:
+            order_id, state = row["order_service_id"], None
+        before = state
+        state = apply_changes(state, row) if (state is not None or row["snapshot"] is not None) else None
+
+        if row["id"] not in wanted:
+            continue
+        if row["change_type"] == OrderServiceLog.ChangeType.CREATED:
+            values[row["id"]] = (None, row["snapshot"])
+        elif before is not None:
+            values[row["id"]] = (before, state)
+        elif state is not None:
+            # primeiro snapshot da O.S.: o antes é o snapshot sem o diff
+            before = dict(state)
+            before.update({key: old for key, (old, _) in (row["changes"] or {}).items()})
+            values[row["id"]] = (before, state)
+        else:
+            changes = row["changes"] or {}
+            values[row["id"]] = (
+                {key: old for key, (old, _) in changes.items()},
+                {key: new for key, (_, new) in changes.items()},
+            )
+    return values
+
+
+def get_order_logs_validators(order_id):
+    """
+    (etag, last_modified) dos logs de uma O.S. para GET condicional.
+    Logs só são inseridos, então quantidade + último changed_at bastam;
+    LOG_ETAG_FORMAT separa as ETags de antes da conversão para diffs
+    (mesmos logs, outro corpo).
+    """
+    stats = OrderServiceLog.objects.filter(order_service_id=order_id).aggregate(
+        total=Count("pk"),
+        last_changed=Max("changed_at"),
     )
+    if not stats["total"]:
+        return None, None
+    return make_etag(LOG_ETAG_FORMAT, order_id, stats["total"], stats["last_changed"].isoformat()), stats["last_changed"]
@@ -0,0 +1,116 @@
+# core/services/order_history_service.py
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import OrderServiceLog
+from core.services.log_service import apply_changes
+
+# posição de um log no histórico da O.S.: (changed_at, id)
+Position = Tuple[datetime, int]
+
+
+def _cache_key(order_id) -> str:
+    return f"order_history:{order_id}"
+
+
+def _after(position: Position) -> Q:
+    changed_at, log_id = position
+    return Q(changed_at__gt=changed_at) | Q(changed_at=changed_at, id__gt=log_id)
+
+
+def _up_to(position: Position) -> Q:
+    changed_at, log_id = position
+    return Q(changed_at__lt=changed_at) | Q(changed_at=changed_at, id__lte=log_id)
+
+
+def _get_checkpoints(order_id) -> Dict[Position, Tuple[Dict[str, Any], bool]]:
+    return cache.get(_cache_key(order_id)) or {}
+
+
+def _save_checkpoints(order_id, checkpoints: Dict[Position, Tuple[Dict[str, Any], bool]]) -> None:
+    # FIFO: o dict guarda a ordem de inserção
+    limit = settings.ORDER_HISTORY_CACHE_CHECKPOINTS
+    for position in list(checkpoints)[: max(len(checkpoints) - limit, 0)]:
+        del checkpoints[position]
+    cache.set(_cache_key(order_id), checkpoints, settings.ORDER_HISTORY_CACHE_TIMEOUT)
+
+
+def order_state_at(order_id, at: datetime) -> Optional[Dict[str, Any]]:
+    """
+    Estado da O.S. no instante `at`, refeito a partir do log mais
+    recente até ali: parte do ponto conhecido mais próximo (snapshot
+    gravado no log ou estado já reconstruído em cache) e aplica os
+    diffs seguintes. None se a O.S. não tinha nenhum log até `at`.
+
+    Os estados reconstruídos ficam em cache por O.S. (checkpoints a cada
+    ORDER_LOG_SNAPSHOT_INTERVAL logs refeitos e no log pedido), e uma
+    nova consulta no mesmo trecho refaz no máximo esse intervalo. Só
+    entram no cache posições com mais de ORDER_HISTORY_SETTLE_SECONDS:
+    changed_at é o instante do save, não do commit, então uma transação
+    longa (bulk, import CSV) ainda pode publicar logs antes de uma
+    posição recente e mudar o estado nela.
+
+    `complete` é False quando não há snapshot antes de `at` (histórico
+    anterior aos snapshots): aí o estado tem só os campos alterados.
+    """
+    logs = OrderServiceLog.objects.filter(order_service_id=order_id)
+    target = (
+        logs.filter(changed_at__lte=at)
+        .order_by("-changed_at", "-id")
+        .values("id", "changed_at", "change_type")
+        .first()
+    )
+    if target is None:
+        return None
+    target_position = (target["changed_at"], target["id"])
+    result = {"log": target, "replayed": 0}
+
+    checkpoints = _get_checkpoints(order_id)
+    if target_position in checkpoints:
+        state, complete = checkpoints[target_position]
+        return {**result, "state": state, "complete": complete, "source": "cache"}
+
+    start = max((position for position in checkpoints if position < target_position), default=None)
+    snapshot = (
+        logs.filter(_up_to(target_position), snapshot__isnull=False)
+        .order_by("-changed_at", "-id")
+        .values("id", "changed_at", "snapshot")
+        .first()
+    )
+
+    if snapshot is not None and (start is None or (snapshot["changed_at"], snapshot["id"]) > start):
+        start = (snapshot["changed_at"], snapshot["id"])
+        state, complete, source = snapshot["snapshot"], True, "snapshot"
+    elif start is not None:
+        state, complete = checkpoints[start]
+        source = "cache"
+    else:
+        state, complete, source = None, False, "changes"
+
+    pending = logs.filter(_up_to(target_position))
+    if start is not None:
+        pending = pending.filter(_after(start))
+    pending = pending.order_by("changed_at", "id").values("id", "changed_at", "changes", "snapshot")
+
+    interval = settings.ORDER_LOG_SNAPSHOT_INTERVAL
+    settled = timezone.now() - timedelta(seconds=settings.ORDER_HISTORY_SETTLE_SECONDS)
+    cached = len(checkpoints)
+    replayed = 0
+    for row in pending.iterator(chunk_size=2000):
+        complete = complete or row["snapshot"] is not None
+        state = apply_changes(state, row)
+        replayed += 1
+        if replayed % interval == 0 and row["changed_at"] <= settled:
+            checkpoints[(row["changed_at"], row["id"])] = (state, complete)
+
+    state = state or {}
+    if target["changed_at"] <= settled:
+        checkpoints[target_position] = (state, complete)
+    if len(checkpoints) > cached:
+        _save_checkpoints(order_id, checkpoints)
+    return {**result, "state": state, "complete": complete, "source": source, "replayed": replayed}
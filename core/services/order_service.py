@@ -4,8 +4,11 @@ from typing import Any, Dict
 from copy import deepcopy
 
 from django.db import transaction
+from django.db.models import Q
 
 from core.models import OrderService
+from core.services.cache_service import bump_orders_version
+from core.services.counter_service import track_order_change, untrack_queryset
 from core.services.log_service import create_order_log
 from core.services.sla_service import calculate_sla
 
@@ -16,7 +19,9 @@ def create_order(data: Dict[str, Any], user) -> OrderService:
         order.created_by = user
         calculate_sla(order)
         order.save()
+        track_order_change(None, order)
         create_order_log(order, user, change_type="CREATED")
+        bump_orders_version()
         return order
 
 
@@ -33,12 +38,14 @@ def update_order(order: OrderService, data: Dict[str, Any], user) -> OrderServic
 
     with transaction.atomic():
         order.save()
+        track_order_change(old_instance, order)
         create_order_log(
             order,
             user,
             change_type="UPDATED",
             old_instance=old_instance,
         )
+        bump_orders_version()
     return order
 
 
@@ -46,11 +53,10 @@ def soft_delete_order(order: OrderService, user) -> None:
     old_instance = deepcopy(order)
 
     with transaction.atomic():
-        # se seu modelo tiver is_deleted:
-        # order.is_deleted = True
-        # order.save()
-        # senão, delete físico:
-        order.delete()
+        # delete lógico: o log precisa da O.S. existindo (FK com CASCADE)
+        order.is_deleted = True
+        order.save(update_fields=["is_deleted", "updated_at"])
+        track_order_change(old_instance, order)
 
         create_order_log(
             order,
@@ -58,3 +64,16 @@ def soft_delete_order(order: OrderService, user) -> None:
             change_type="DELETED",
             old_instance=old_instance,
         )
+        bump_orders_version()
+
+
+def soft_delete_user_orders(user) -> None:
+    """
+    Marca como deletadas todas as O.S. criadas ou atualizadas pelo usuário.
+    """
+    orders = OrderService.objects.filter(Q(created_by=user) | Q(updated_by=user))
+
+    with transaction.atomic():
+        untrack_queryset(orders)
+        orders.update(is_deleted=True)
+        bump_orders_version()
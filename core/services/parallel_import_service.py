@@ -0,0 +1,261 @@
+# core/services/parallel_import_service.py
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from core.models import ImportMode
+from core.services.csv_import_service import OrderBulkImporter
+
+SCAN_BLOCK_SIZE = 4 * 1024 * 1024
+QUOTE = b'"'
+NEWLINE = b"\n"
+
+
+@dataclass
+class CsvChunk:
+    start: int  # offset do primeiro byte do chunk
+    end: int  # offset final (exclusivo), sempre logo após um fim de registro
+    first_line: int  # número (1-based) do primeiro registro de dados do chunk
+
+
+class _FileRange(io.RawIOBase):
+    """
+    Expõe só os bytes [start, end) de um arquivo, para o TextIOWrapper.
+    """
+
+    def __init__(self, path: str, start: int, end: int):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        view = memoryview(buffer)[: self._remaining]
+        n = self._file.readinto(view)
+        self._remaining -= n
+        return n
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _read_header(path: str):
+    with open(path, "rb") as file:
+        header_bytes = file.readline()
+    header_text = header_bytes.decode("utf-8-sig")
+    return next(csv.reader([header_text])), len(header_bytes)
+
+
+def plan_chunks(path: str, parts: int) -> List[CsvChunk]:
+    """
+    Divide o CSV em até `parts` faixas de bytes que terminam em fim de
+    registro. Quebras de linha dentro de campos entre aspas não contam:
+    a paridade das aspas é acompanhada durante a varredura (que também
+    conta os registros, para manter a numeração de linhas do import).
+    """
+    size = os.path.getsize(path)
+    _, data_start = _read_header(path)
+    if data_start >= size:
+        return []
+
+    target = max((size - data_start) // max(parts, 1), 1)
+    chunks: List[CsvChunk] = []
+    chunk_start = data_start
+    chunk_first_line = 1
+    records = 0
+    in_quotes = False
+
+    with open(path, "rb") as file:
+        file.seek(data_start)
+        offset = data_start
+        while True:
+            block = file.read(SCAN_BLOCK_SIZE)
+            if not block:
+                break
+
+            # segmentos alternam fora/dentro de aspas a cada '"'
+            position = offset
+            for index, segment in enumerate(block.split(QUOTE)):
+                if index:
+                    in_quotes = not in_quotes
+                    position += 1
+
+                if not in_quotes and NEWLINE in segment:
+                    search_from = 0
+                    while True:
+                        found = segment.find(NEWLINE, search_from)
+                        if found < 0:
+                            break
+                        records += 1
+                        record_end = position + found + 1
+                        if record_end - chunk_start >= target and len(chunks) < parts - 1:
+                            chunks.append(CsvChunk(chunk_start, record_end, chunk_first_line))
+                            chunk_start = record_end
+                            chunk_first_line = records + 1
+                        search_from = found + 1
+
+                position += len(segment)
+            offset += len(block)
+
+    if chunk_start < size:
+        chunks.append(CsvChunk(chunk_start, size, chunk_first_line))
+    return chunks
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+    # cada processo abre a própria conexão com o banco
+    connections.close_all()
+
+
+def _import_chunk(
+    path: str,
+    chunk: CsvChunk,
+    header: List[str],
+    user_id,
+    batch_size: int,
+    mode: str,
+    max_errors: int,
+    errors_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    user = get_user_model().objects.get(pk=user_id)
+    importer = OrderBulkImporter(user, batch_size=batch_size, max_errors=max_errors, mode=mode)
+
+    errors_file = open(errors_path, "w", encoding="utf-8") if errors_path else None
+    if errors_file is not None:
+        # todos os erros vão para o arquivo (um JSON por linha), sem o limite
+        importer.errors.sink = lambda entry: errors_file.write(
+            json.dumps(entry, ensure_ascii=False) + "\n"
+        )
+
+    line = chunk.first_line - 1
+    text = io.TextIOWrapper(
+        io.BufferedReader(_FileRange(path, chunk.start, chunk.end)),
+        encoding="utf-8",
+        newline="",
+    )
+    try:
+        with text:
+            try:
+                reader = csv.DictReader(text, fieldnames=header)
+                for line, row in enumerate(reader, start=chunk.first_line):
+                    importer.add_row(line, row)
+            except UnicodeDecodeError:
+                importer.add_error(line + 1, "Arquivo CSV deve estar em UTF-8.")
+            except csv.Error as e:
+                importer.add_error(line + 1, f"CSV inválido: {e}")
+
+        importer.flush()
+    finally:
+        if errors_file is not None:
+            errors_file.close()
+    connections.close_all()
+
+    result = importer.result()
+    result["errors"] = importer.errors.items
+    result["elapsed_seconds"] = time.perf_counter() - started
+    return result
+
+
+def _merge_error_parts(parts: List[str], errors_file: str) -> None:
+    """
+    Junta os erros de cada faixa (já em ordem de faixa) num único JSON,
+    ordenados por linha, e apaga os arquivos parciais.
+    """
+    with open(errors_file, "w", encoding="utf-8") as output:
+        output.write("[")
+        first = True
+        for part in parts:
+            with open(part, encoding="utf-8") as file:
+                # dentro de uma faixa, erros de gravação do lote vêm depois
+                # dos de validação das linhas seguintes: ordena só a faixa
+                entries = sorted((json.loads(line) for line in file), key=lambda entry: entry["line"])
+            os.remove(part)
+            for entry in entries:
+                output.write("\n  " if first else ",\n  ")
+                output.write(json.dumps(entry, ensure_ascii=False))
+                first = False
+        output.write("\n]\n")
+
+
+def import_csv_parallel(
+    path: str,
+    user,
+    workers: int = 1,
+    batch_size: Optional[int] = None,
+    mode: str = ImportMode.INSERT,
+    max_errors: Optional[int] = None,
+    errors_file: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Importa um CSV grande em `workers` processos, cada um com sua
+    conexão e seu próprio OrderBulkImporter, e junta os resultados.
+
+    O resultado traz no máximo `max_errors` erros; com `errors_file`,
+    todos os erros são gravados nesse arquivo JSON (cada worker escreve
+    os seus num arquivo parcial, juntados ao final).
+    """
+    started = time.perf_counter()
+    batch_size = batch_size or settings.CSV_IMPORT_BATCH_SIZE
+    max_errors = settings.CSV_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+
+    header, _ = _read_header(path)
+    chunks = plan_chunks(path, workers)
+
+    # nenhuma conexão aberta pode ser herdada pelos processos filhos
+    connections.close_all()
+
+    parts = [f"{errors_file}.{index}.part" for index in range(len(chunks))] if errors_file else []
+
+    with ProcessPoolExecutor(max_workers=max(workers, 1), initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(
+                _import_chunk, path, chunk, header, user.pk, batch_size, mode, max_errors,
+                parts[index] if parts else None,
+            )
+            for index, chunk in enumerate(chunks)
+        ]
+        results = [future.result() for future in futures]
+
+    if errors_file:
+        _merge_error_parts(parts, errors_file)
+
+    errors = sorted(
+        (error for result in results for error in result["errors"]),
+        key=lambda error: error["line"],
+    )[:max_errors]
+    error_count = sum(result["error_count"] for result in results)
+    rows_processed = sum(result["rows_processed"] for result in results)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "workers": workers,
+        "chunks": len(chunks),
+        "created": sum(result["created"] for result in results),
+        "updated": sum(result["updated"] for result in results),
+        "unchanged": sum(result["unchanged"] for result in results),
+        "rows_processed": rows_processed,
+        "errors": errors,
+        "error_count": error_count,
+        "errors_truncated": error_count > len(errors),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows_processed / elapsed, 1) if elapsed > 0 else None,
+    }
@@ -0,0 +1,53 @@
+# core/services/queue_service.py
+import threading
+from typing import List
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from core.models import OrderService, ServiceOrderStatus
+from core.services.bulk_service import apply_order_changes
+
+QUEUE_STATUSES = (ServiceOrderStatus.OPEN, ServiceOrderStatus.IN_PROGRESS)
+
+# SQLite não tem SKIP LOCKED: as reivindicações deste processo são serializadas
+_claim_lock = threading.Lock()
+
+
+def _by_urgency(queryset):
+    # sem SLA vai para o fim; desempate por id (mesma ordem do índice)
+    return queryset.order_by(F("sla_datetime").asc(nulls_last=True), "id")
+
+
+def get_queue(statuses=QUEUE_STATUSES):
+    """
+    O.S. abertas/em andamento, da mais urgente (SLA mais próximo) para a menos.
+    Com um só status, o índice (status, sla_datetime, id) já entrega a ordem
+    (reivindicação); com status__in o banco lê uma faixa do índice por
+    status e precisa ordenar o resultado.
+    """
+    return _by_urgency(OrderService.objects.filter(is_deleted=False, status__in=statuses))
+
+
+def claim_orders(user, limit: int) -> List[OrderService]:
+    """
+    Reivindica as `limit` O.S. abertas mais urgentes, movendo-as para
+    in_progress. Com SKIP LOCKED (PostgreSQL), técnicos simultâneos
+    nunca pegam a mesma O.S. nem esperam uns pelos outros: linhas já
+    travadas por outra transação são puladas.
+    """
+    if not connection.features.has_select_for_update_skip_locked:
+        with _claim_lock:
+            return _claim(user, limit, skip_locked=False)
+    return _claim(user, limit, skip_locked=True)
+
+
+def _claim(user, limit: int, skip_locked: bool) -> List[OrderService]:
+    with transaction.atomic():
+        # a resposta serializa created_by/updated_by de cada O.S.
+        candidates = get_queue(statuses=[ServiceOrderStatus.OPEN]).select_related("created_by", "updated_by")
+        if skip_locked:
+            # trava só as O.S. (não os usuários do JOIN)
+            candidates = candidates.select_for_update(skip_locked=True, of=("self",))
+        orders = list(candidates[:limit])
+        return apply_order_changes(orders, "status", ServiceOrderStatus.IN_PROGRESS, user)
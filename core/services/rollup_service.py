@@ -0,0 +1,203 @@
+# core/services/rollup_service.py
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import (
+    DailyOrderRollup,
+    DailyRollupState,
+    OrderService,
+    OrderServiceLog,
+    ServiceOrderStatus,
+)
+from core.utils.dates import local_day_range
+
+ROLLUP_METRICS = ("opened", "completed", "sla_breaches")
+TIMESERIES_GROUP_FIELDS = ("type", "priority")
+
+CLOSED_STATUSES = [ServiceOrderStatus.COMPLETED, ServiceOrderStatus.CANCELLED]
+
+RollupKey = Tuple[date, str, str]
+
+ROLLUP_STATE = "daily_orders"
+
+
+def _count_opened(start: datetime, end: datetime, totals: Dict) -> None:
+    rows = (
+        OrderService.objects
+        .filter(is_deleted=False, open_date__gte=start, open_date__lt=end)
+        .annotate(day=TruncDate("open_date"))
+        .order_by()
+        .values("day", "type", "priority")
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        totals[(row["day"], row["type"], row["priority"])]["opened"] += row["n"]
+
+
+def _status_became(statuses) -> Q:
+    """
+    Logs em que o status passou a um de `statuses`: diff do status
+    ({"status": [antes, depois]}) ou O.S. já criada nele.
+    """
+    return Q(changes__status__1__in=statuses) | Q(
+        change_type=OrderServiceLog.ChangeType.CREATED,
+        snapshot__status__in=statuses,
+    )
+
+
+def _count_completed(start: datetime, end: datetime, totals: Dict) -> None:
+    """
+    Conclusões = logs em que o status passou a 'completed'.
+    """
+    rows = (
+        OrderServiceLog.objects
+        .filter(
+            _status_became([ServiceOrderStatus.COMPLETED]),
+            changed_at__gte=start,
+            changed_at__lt=end,
+            order_service__is_deleted=False,
+        )
+        .annotate(day=TruncDate("changed_at"))
+        .order_by()
+        .values("day", "order_service__type", "order_service__priority")
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        key = (row["day"], row["order_service__type"], row["order_service__priority"])
+        totals[key]["completed"] += row["n"]
+
+
+def _count_sla_breaches(start: datetime, end: datetime, totals: Dict) -> None:
+    """
+    SLA estourado no dia do sla_datetime quando a O.S. não foi
+    concluída/cancelada até esse momento.
+    """
+    closed_at = (
+        OrderServiceLog.objects
+        .filter(_status_became(CLOSED_STATUSES), order_service=OuterRef("pk"))
+        .order_by("changed_at")
+        .values("changed_at")[:1]
+    )
+    rows = (
+        OrderService.objects
+        .filter(is_deleted=False, sla_datetime__gte=start, sla_datetime__lt=end)
+        .annotate(closed_at=Subquery(closed_at))
+        .filter(Q(closed_at__isnull=True) | Q(closed_at__gt=F("sla_datetime")))
+        .annotate(day=TruncDate("sla_datetime"))
+        .order_by()
+        .values("day", "type", "priority")
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        totals[(row["day"], row["type"], row["priority"])]["sla_breaches"] += row["n"]
+
+
+def _first_day() -> Optional[date]:
+    first_open = OrderService.objects.aggregate(first=Min("open_date"))["first"]
+    if first_open is None:
+        return None
+    return timezone.localdate(first_open)
+
+
+def _rolled_until() -> Optional[date]:
+    state = DailyRollupState.objects.filter(name=ROLLUP_STATE).first()
+    if state is not None:
+        return state.rolled_until
+    # bancos consolidados antes da marca d'água: parte do último dia com linhas
+    return DailyOrderRollup.objects.aggregate(last=Max("day"))["last"]
+
+
+def _advance_rolled_until(start_day: date, end_day: date) -> None:
+    """
+    Move a marca d'água para end_day se [start_day, end_day] emenda com
+    o que já estava consolidado (um --since isolado mais à frente não
+    pode pular os dias anteriores).
+    """
+    rolled_until = _rolled_until()
+    if rolled_until is None:
+        first_day = _first_day()
+        if first_day is not None and start_day > first_day:
+            return
+    elif start_day > rolled_until + timedelta(days=1) or end_day <= rolled_until:
+        return
+    DailyRollupState.objects.update_or_create(
+        name=ROLLUP_STATE,
+        defaults={"rolled_until": end_day},
+    )
+
+
+def rollup_days(start_day: date, end_day: date) -> int:
+    """
+    (Re)calcula o rollup dos dias [start_day, end_day].
+    Retorna o número de linhas gravadas.
+    """
+    if start_day > end_day:
+        return 0
+
+    start, end = local_day_range(start_day, end_day)
+
+    totals: Dict[RollupKey, Dict[str, int]] = defaultdict(
+        lambda: dict.fromkeys(ROLLUP_METRICS, 0)
+    )
+    _count_opened(start, end, totals)
+    _count_completed(start, end, totals)
+    _count_sla_breaches(start, end, totals)
+
+    with transaction.atomic():
+        DailyOrderRollup.objects.filter(day__gte=start_day, day__lte=end_day).delete()
+        DailyOrderRollup.objects.bulk_create([
+            DailyOrderRollup(day=day, type=type_, priority=priority, **metrics)
+            for (day, type_, priority), metrics in sorted(totals.items())
+        ])
+        _advance_rolled_until(start_day, end_day)
+    return len(totals)
+
+
+def rollup_pending_days(until: Optional[date] = None) -> Tuple[Optional[date], date, int]:
+    """
+    Processa os dias completos ainda não consolidados (depois da marca
+    d'água até `until`, por padrão ontem) e refaz os últimos
+    ROLLUP_REROLL_DAYS dias, que podem ter recebido O.S./logs atrasados.
+    Atrasos mais antigos que isso: `rollup_days` (comando com --since).
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+    first_day = _first_day()
+    if first_day is None:
+        return None, until, 0
+
+    rolled_until = _rolled_until()
+    start_day = until - timedelta(days=settings.ROLLUP_REROLL_DAYS - 1)
+    if rolled_until is None:
+        start_day = first_day
+    else:
+        start_day = max(min(start_day, rolled_until + timedelta(days=1)), first_day)
+    if start_day > until:
+        return None, until, 0
+    return start_day, until, rollup_days(start_day, until)
+
+
+def get_timeseries(
+    start_day: date,
+    end_day: date,
+    group_by: Sequence[str] = (),
+    filters: Optional[Dict[str, str]] = None,
+) -> List[Dict]:
+    qs = DailyOrderRollup.objects.filter(day__gte=start_day, day__lte=end_day)
+    if filters:
+        qs = qs.filter(**filters)
+
+    fields = ["day", *group_by]
+    rows = (
+        qs.order_by()
+        .values(*fields)
+        .annotate(**{metric: Sum(metric) for metric in ROLLUP_METRICS})
+        .order_by(*fields)
+    )
+    return list(rows)
@@ -0,0 +1,196 @@
+# core/services/sla_breach_service.py
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import OrderService, SLABreachEvent, SLAScanState
+from core.services.queue_service import QUEUE_STATUSES
+from core.services.sla_service import NEARING_DUE_WINDOW
+
+SCAN_STATE_NAME = "sla_breaches"
+
+
+# ---- notificadores ----
+class BaseBreachNotifier:
+    """
+    Recebe os eventos novos de cada varredura (já gravados no banco).
+    Implementações trocam o destino: arquivo, memória, e-mail, fila...
+    """
+
+    def notify(self, events: List[SLABreachEvent]) -> None:
+        raise NotImplementedError
+
+
+def event_payload(event: SLABreachEvent) -> Dict:
+    return {
+        "order_service": str(event.order_service_id),
+        "kind": str(event.kind),
+        "sla_datetime": event.sla_datetime,
+        "status": event.status,
+        "priority": event.priority,
+        "detected_at": event.detected_at,
+    }
+
+
+class FileBreachNotifier(BaseBreachNotifier):
+    """
+    Acrescenta um evento por linha (NDJSON) em SLA_BREACH_NOTIFY_FILE.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.SLA_BREACH_NOTIFY_FILE
+
+    def notify(self, events: List[SLABreachEvent]) -> None:
+        with open(self.path, "a", encoding="utf-8") as output:
+            for event in events:
+                output.write(json.dumps(event_payload(event), cls=DjangoJSONEncoder) + "\n")
+
+
+class MemoryBreachNotifier(BaseBreachNotifier):
+    """
+    Guarda os eventos na memória do processo (para testes e scripts).
+    """
+
+    _lock = threading.Lock()
+    sent: List[Dict] = []
+
+    def notify(self, events: List[SLABreachEvent]) -> None:
+        with self._lock:
+            self.sent.extend(event_payload(event) for event in events)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls.sent.clear()
+
+
+def get_notifier(path: Optional[str] = None) -> BaseBreachNotifier:
+    return import_string(path or settings.SLA_BREACH_NOTIFIER)()
+
+
+# ---- varredura ----
+def _candidates(since: datetime, now: datetime):
+    """
+    O.S. abertas/em andamento cujo SLA mudou de faixa entre since e now:
+
+    - overdue: sla_datetime em [since, now)
+    - nearing_due_date: entrou na janela de 24h, ou seja, sla_datetime
+      em (since + 24h, now + 24h]
+
+    Nas duas faixas, as criadas/alteradas depois de `since` já dentro
+    dela (ex.: prioridade crítica, O.S. reaberta com prazo vencido)
+    também contam.
+
+    Os intervalos em sla_datetime são lidos pelo índice (status,
+    sla_datetime); o OR com updated_at só olha as O.S. que já estão
+    na faixa.
+    """
+    active = OrderService.objects.filter(is_deleted=False, status__in=QUEUE_STATUSES)
+    # sem o ORDER BY created_at padrão do model
+    active = active.order_by()
+    columns = ("id", "sla_datetime", "status", "priority")
+
+    overdue = (
+        active
+        .filter(sla_datetime__lt=now)
+        .filter(Q(sla_datetime__gte=since) | Q(updated_at__gt=since))
+        .values(*columns)
+    )
+    nearing = (
+        active
+        .filter(sla_datetime__gte=now, sla_datetime__lte=now + NEARING_DUE_WINDOW)
+        .filter(Q(sla_datetime__gt=since + NEARING_DUE_WINDOW) | Q(updated_at__gt=since))
+        .values(*columns)
+    )
+    return [
+        (SLABreachEvent.Kind.OVERDUE, row) for row in overdue
+    ] + [
+        (SLABreachEvent.Kind.NEARING_DUE_DATE, row) for row in nearing
+    ]
+
+
+def _new_events(candidates, now: datetime) -> List[SLABreachEvent]:
+    if not candidates:
+        return []
+    # descarta os que já têm evento para o mesmo prazo (uma query)
+    existing = set(
+        SLABreachEvent.objects
+        .filter(order_service_id__in={row["id"] for _, row in candidates})
+        .values_list("order_service_id", "kind", "sla_datetime")
+    )
+    return [
+        SLABreachEvent(
+            order_service_id=row["id"],
+            kind=kind,
+            sla_datetime=row["sla_datetime"],
+            status=row["status"],
+            priority=row["priority"],
+            detected_at=now,
+        )
+        for kind, row in candidates
+        if (row["id"], kind, row["sla_datetime"]) not in existing
+    ]
+
+
+def _inserted(events: List[SLABreachEvent], now: datetime) -> List[SLABreachEvent]:
+    """
+    Relê os eventos que este scanner de fato gravou: com ignore_conflicts
+    o bulk_create não diz quais linhas o banco descartou (chave já
+    gravada por outro scanner, com outro detected_at).
+    """
+    if not events:
+        return []
+    keys = {(event.order_service_id, event.kind, event.sla_datetime) for event in events}
+    saved = (
+        SLABreachEvent.objects
+        .filter(order_service_id__in={key[0] for key in keys}, detected_at=now)
+        .order_by("pk")
+    )
+    return [event for event in saved if (event.order_service_id, event.kind, event.sla_datetime) in keys]
+
+
+def scan_sla_breaches(
+    notifier: Optional[BaseBreachNotifier] = None,
+    now: Optional[datetime] = None,
+) -> Dict:
+    """
+    Varre o intervalo desde a última execução (marca d'água em
+    SLAScanState), grava os eventos novos com um bulk_create e os
+    entrega ao notificador depois do commit.
+
+    Na primeira execução, olha SLA_BREACH_LOOKBACK_HOURS para trás.
+    """
+    now = now or timezone.now()
+    notifier = notifier or get_notifier()
+
+    with transaction.atomic():
+        state, _ = SLAScanState.objects.select_for_update().get_or_create(
+            name=SCAN_STATE_NAME,
+            defaults={"scanned_until": now - timedelta(hours=settings.SLA_BREACH_LOOKBACK_HOURS)},
+        )
+        since = state.scanned_until
+        if since >= now:
+            return {"since": since, "until": now, "overdue": 0, "nearing_due_date": 0, "events": []}
+
+        events = _new_events(_candidates(since, now), now)
+        # ignore_conflicts: outro scanner pode ter gravado o mesmo evento
+        SLABreachEvent.objects.bulk_create(events, ignore_conflicts=True)
+        events = _inserted(events, now)
+        state.scanned_until = now
+        state.save(update_fields=["scanned_until", "updated_at"])
+
+        if events:
+            transaction.on_commit(lambda: notifier.notify(events))
+
+    summary = {"since": since, "until": now, "overdue": 0, "nearing_due_date": 0, "events": events}
+    for event in events:
+        summary[event.kind] += 1
+    return summary
@@ -0,0 +1,108 @@
+# core/services/sla_calendar_service.py
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from zoneinfo import ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from core.models import CacheVersion, SLACalendar
+from core.utils.business_hours import WorkingCalendar
+
+logger = logging.getLogger(__name__)
+
+CALENDARS_VERSION = "sla_calendars"
+
+# calendários compilados deste processo: {provider ("" = padrão): WorkingCalendar}
+_lock = threading.Lock()
+_calendars: Optional[Dict[str, WorkingCalendar]] = None
+_version: Optional[int] = None
+_checked_at = 0.0
+
+
+def _get_version() -> int:
+    version = (
+        CacheVersion.objects
+        .filter(name=CALENDARS_VERSION)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def _increment_version() -> None:
+    updated = CacheVersion.objects.filter(name=CALENDARS_VERSION).update(version=F("version") + 1)
+    if not updated:
+        CacheVersion.objects.get_or_create(name=CALENDARS_VERSION)
+
+
+def _load() -> Dict[str, WorkingCalendar]:
+    calendars = {}
+    for calendar in SLACalendar.objects.all():
+        try:
+            calendars[calendar.provider] = WorkingCalendar(
+                calendar.working_hours, calendar.holidays, calendar.timezone
+            )
+        except (TypeError, ValueError, ZoneInfoNotFoundError) as e:
+            # linha gravada sem full_clean(): não pode derrubar todo cálculo
+            # de SLA; o prestador cai no calendário padrão (ou horas corridas)
+            logger.error("SLACalendar %s inválido, ignorado: %s", calendar.pk, e)
+    return calendars
+
+
+def get_sla_calendars() -> Dict[str, WorkingCalendar]:
+    """
+    Calendários compilados, em cache no processo (com o índice de
+    horas úteis já montado). Mudanças feitas neste processo limpam o
+    cache na hora; as de outros processos são vistas pela versão em
+    CacheVersion, conferida no máximo a cada SLA_CALENDAR_CACHE_SECONDS.
+    """
+    global _calendars, _version, _checked_at
+
+    calendars = _calendars
+    if calendars is not None and time.monotonic() - _checked_at < settings.SLA_CALENDAR_CACHE_SECONDS:
+        return calendars
+
+    with _lock:
+        if _calendars is not None and time.monotonic() - _checked_at < settings.SLA_CALENDAR_CACHE_SECONDS:
+            return _calendars
+        version = _get_version()
+        if _calendars is None or version != _version:
+            _calendars = _load()
+            _version = version
+        _checked_at = time.monotonic()
+        return _calendars
+
+
+def get_sla_calendar(provider) -> Optional[WorkingCalendar]:
+    """
+    Calendário do prestador, ou o padrão (provider vazio), ou None
+    (SLA em horas corridas).
+    """
+    calendars = get_sla_calendars()
+    if not calendars:
+        return None
+    return calendars.get(provider) or calendars.get("")
+
+
+def _clear() -> None:
+    global _calendars
+    with _lock:
+        _calendars = None
+
+
+def _changed() -> None:
+    _increment_version()
+    # de novo após o commit: outra thread pode ter lido a versão antiga
+    _clear()
+
+
+def invalidate_sla_calendars(**kwargs) -> None:
+    """
+    Chamado quando um SLACalendar muda (signals em core/apps.py).
+    """
+    _clear()
+    transaction.on_commit(_changed)
@@ -0,0 +1,123 @@
+# core/services/sla_recompute_service.py
+import time
+from collections import defaultdict
+from copy import copy
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import OrderService
+from core.services.cache_service import bump_orders_version
+from core.services.log_service import build_order_log, save_order_logs
+from core.services.queue_service import QUEUE_STATUSES
+from core.services.sla_calendar_service import get_sla_calendars
+from core.services.sla_service import calculate_sla, sla_delta
+
+
+def _empty_group() -> Dict:
+    return {"examined": 0, "changed": 0, "earlier": 0, "later": 0, "max_shift": timedelta(0)}
+
+
+def _plan(orders: List[OrderService]) -> List[tuple]:
+    """
+    (O.S. antiga, O.S. com o novo prazo) para as que mudam de prazo.
+    """
+    changes = []
+    for order in orders:
+        updated = copy(order)
+        calculate_sla(updated)
+        if updated.sla_datetime != order.sla_datetime:
+            changes.append((order, updated))
+    return changes
+
+
+def _apply(changes: List[tuple], calendars: bool) -> None:
+    now = timezone.now()
+    by_priority = defaultdict(list)
+    for _, order in changes:
+        order.updated_at = now
+        by_priority[order.priority].append(order)
+
+    for priority, orders in by_priority.items():
+        if calendars:
+            # horas úteis: um UPDATE ... CASE por grupo com os prazos já calculados
+            OrderService.objects.bulk_update(orders, ["sla_datetime", "updated_at"], batch_size=500)
+        else:
+            # horas corridas: a regra do calculate_sla direto no banco
+            OrderService.objects.filter(
+                pk__in=[order.pk for order in orders],
+                priority=priority,
+            ).update(sla_datetime=F("open_date") + sla_delta(priority), updated_at=now)
+
+    # diff só do prazo
+    save_order_logs([
+        build_order_log(order, None, "UPDATED", old_instance=old, fields=["sla_datetime"])
+        for old, order in changes
+    ])
+    bump_orders_version()
+
+
+def recompute_sla(
+    chunk_size: int = 1000,
+    dry_run: bool = False,
+    pause: float = 0.0,
+    on_chunk: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Recalcula o sla_datetime das O.S. abertas/em andamento (ex.: depois
+    de mudar SLA_DELTAS ou um calendário de SLA).
+
+    Anda por blocos de `chunk_size` em ordem de pk (cursor estável:
+    pk > último visto), cada um numa transação curta, com `pause`
+    segundos entre blocos para não competir com o tráfego. Os prazos
+    mudam com um UPDATE por prioridade; com `dry_run`, só o resumo.
+    """
+    calendars = bool(get_sla_calendars())
+    queryset = (
+        OrderService.objects
+        .filter(is_deleted=False, status__in=QUEUE_STATUSES)
+        .order_by("pk")
+    )
+
+    groups: Dict[str, Dict] = defaultdict(_empty_group)
+    summary = {"chunks": 0, "examined": 0, "changed": 0, "dry_run": dry_run, "groups": groups}
+    last_pk = None
+
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        with transaction.atomic():
+            if not dry_run:
+                # trava só o bloco: uma mudança de prioridade concorrente espera
+                chunk = chunk.select_for_update()
+            orders = list(chunk[:chunk_size])
+            if not orders:
+                break
+            changes = _plan(orders)
+            if changes and not dry_run:
+                _apply(changes, calendars)
+
+        last_pk = orders[-1].pk
+        for order in orders:
+            groups[order.priority]["examined"] += 1
+        for old, order in changes:
+            group = groups[order.priority]
+            shift = order.sla_datetime - old.sla_datetime if old.sla_datetime else timedelta(0)
+            group["changed"] += 1
+            group["earlier" if shift < timedelta(0) else "later"] += 1
+            group["max_shift"] = max(group["max_shift"], abs(shift))
+
+        summary["chunks"] += 1
+        summary["examined"] += len(orders)
+        summary["changed"] += len(changes)
+        if on_chunk:
+            on_chunk({**summary, "chunk_examined": len(orders), "chunk_changed": len(changes), "last_pk": last_pk})
+
+        if len(orders) < chunk_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    return summary
@@ -1,27 +1,40 @@
 # core/services/sla_service.py
 from datetime import timedelta
 
+from django.db.models import Case, CharField, Q, Value, When
 from django.utils import timezone
 
 from core.models import OrderService, ServiceOrderPriority
+from core.services.sla_calendar_service import get_sla_calendar
+
+
+SLA_DELTAS = {
+    ServiceOrderPriority.CRITICAL: timedelta(hours=4),
+    ServiceOrderPriority.HIGH: timedelta(hours=24),
+    ServiceOrderPriority.MEDIUM: timedelta(hours=48),
+    ServiceOrderPriority.LOW: timedelta(hours=72),
+}
+DEFAULT_SLA_DELTA = timedelta(hours=72)  # qualquer outro valor
+NEARING_DUE_WINDOW = timedelta(hours=24)
+
+SLA_STATUSES = ("overdue", "nearing_due_date", "on_time")
+
+
+def sla_delta(priority) -> timedelta:
+    return SLA_DELTAS.get(priority, DEFAULT_SLA_DELTA)
 
 
 def calculate_sla(order: OrderService) -> None:
     """
-    Preenche order.sla_datetime com base na prioridade.
+    Preenche order.sla_datetime com base na prioridade: em horas úteis
+    quando há calendário de SLA para o prestador, senão em horas corridas.
     """
     base_datetime = getattr(order, "open_date", None) or timezone.now()
-
-    if order.priority == ServiceOrderPriority.CRITICAL:
-        delta = timedelta(hours=4)
-    elif order.priority == ServiceOrderPriority.HIGH:
-        delta = timedelta(hours=24)
-    elif order.priority == ServiceOrderPriority.MEDIUM:
-        delta = timedelta(hours=48)
-    else:  # LOW ou qualquer outro valor
-        delta = timedelta(hours=72)
-
-    order.sla_datetime = base_datetime + delta
+    calendar = get_sla_calendar(order.provider)
+    if calendar is None:
+        order.sla_datetime = base_datetime + sla_delta(order.priority)
+    else:
+        order.sla_datetime = calendar.add(base_datetime, sla_delta(order.priority))
 
 
 def get_sla_status(order: OrderService) -> str:
@@ -32,15 +45,83 @@ def get_sla_status(order: OrderService) -> str:
     - 'nearing_due_date' -> faltam <= 24h para vencer
     - 'on_time'          -> ainda no prazo
     """
-    if not order.sla_datetime:
-        return "on_time"
+    return sla_status_at(order.sla_datetime, timezone.now())
 
-    now = timezone.now()
 
-    if order.sla_datetime < now:
+def sla_status_at(sla_datetime, now) -> str:
+    """
+    Mesma regra de get_sla_status, com `now` informado
+    (para listar várias O.S. com um único instante de referência).
+    """
+    if not sla_datetime:
+        return "on_time"
+
+    if sla_datetime < now:
         return "overdue"
 
-    if order.sla_datetime - now <= timedelta(hours=24):
+    if sla_datetime - now <= NEARING_DUE_WINDOW:
         return "nearing_due_date"
 
     return "on_time"
+
+
+def sla_status_changed_at(sla_datetime, now):
+    """
+    Último instante (<= now) em que sla_status_at mudou sozinho, só pela
+    passagem do tempo; None se ainda não mudou.
+    """
+    if not sla_datetime:
+        return None
+    for changed_at in (sla_datetime, sla_datetime - NEARING_DUE_WINDOW):
+        if changed_at <= now:
+            return changed_at
+    return None
+
+
+def sla_status_q(status: str, now) -> Q:
+    """
+    Filtro equivalente a sla_status_at(sla_datetime, now) == status,
+    só com intervalos em sla_datetime (usa o índice da coluna).
+    """
+    limit = now + NEARING_DUE_WINDOW
+    if status == "overdue":
+        return Q(sla_datetime__lt=now)
+    if status == "nearing_due_date":
+        return Q(sla_datetime__gte=now, sla_datetime__lte=limit)
+    if status == "on_time":
+        return Q(sla_datetime__gt=limit) | Q(sla_datetime__isnull=True)
+    raise ValueError(f"sla_status inválido: {status}")
+
+
+def sla_status_case(now) -> Case:
+    """
+    sla_status_at em SQL (Case/When), para anotar o queryset.
+    """
+    return Case(
+        When(sla_datetime__isnull=True, then=Value("on_time")),
+        When(sla_datetime__lt=now, then=Value("overdue")),
+        When(sla_datetime__lte=now + NEARING_DUE_WINDOW, then=Value("nearing_due_date")),
+        default=Value("on_time"),
+        output_field=CharField(),
+    )
+
+
+def next_sla_transitions(now):
+    """
+    Próximos instantes em que alguma O.S. ativa muda de sla_status só
+    pela passagem do tempo: (vira overdue, entra na janela de 24h).
+    Duas leituras do início do índice de sla_datetime, sem agregar.
+    """
+    active = (
+        OrderService.objects.filter(is_deleted=False)
+        .order_by("sla_datetime")
+        .values_list("sla_datetime", flat=True)
+    )
+    return (
+        active.filter(sla_datetime__gte=now).first(),
+        active.filter(sla_datetime__gt=now + NEARING_DUE_WINDOW).first(),
+    )
+
+
+def annotate_sla_status(queryset, now=None, name: str = "sla_status"):
+    return queryset.annotate(**{name: sla_status_case(now or timezone.now())})
@@ -0,0 +1,32 @@
+from itertools import count
+
+from core.models import User
+from core.services.order_service import create_order
+
+_sequence = count(1)
+
+
+def make_user(**fields) -> User:
+    n = next(_sequence)
+    fields.setdefault("username", f"user{n}")
+    fields.setdefault("email", f"user{n}@example.com")
+    return User.objects.create_user(password="senha-teste", **fields)
+
+
+def order_data(**fields) -> dict:
+    n = next(_sequence)
+    data = {
+        "protocol": f"P-TESTE-{n}",
+        "so_number": f"SO{n}",
+        "recipient_name": f"Cliente {n}",
+        "description": "descrição",
+    }
+    data.update(fields)
+    return data
+
+
+def make_order(user, **fields):
+    """
+    O.S. criada pelo serviço (contadores, log CREATED e SLA como na API).
+    """
+    return create_order(order_data(**fields), user)
@@ -0,0 +1,147 @@
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import OrderService, OrderServiceLog
+from core.services.bulk_service import apply_order_changes
+from core.services.cache_service import get_orders_version
+from core.services.counter_service import find_counter_drift, get_status_breakdown
+from core.services.sla_service import sla_delta
+from core.tests.helpers import make_order, make_user
+
+URL = "/api/v1/ordens-servico/bulk/"
+
+
+class ApplyOrderChangesTests(TestCase):
+    def setUp(self):
+        self.owner = make_user()
+        self.user = make_user()
+
+    def bulk_logs(self, orders):
+        return list(
+            OrderServiceLog.objects
+            .filter(order_service__in=orders)
+            .exclude(change_type=OrderServiceLog.ChangeType.CREATED)
+            .values_list("order_service_id", "change_type", "changes")
+        )
+
+    def test_each_operation(self):
+        cases = [
+            ("status", "completed", "UPDATED", {"status", "updated_by"}),
+            ("priority", "critical", "UPDATED", {"priority", "updated_by", "sla_datetime"}),
+            ("provider", "logistics", "UPDATED", {"provider", "updated_by"}),
+            ("is_deleted", True, "DELETED", {"is_deleted", "updated_by"}),
+        ]
+        for field, value, change_type, changed_fields in cases:
+            with self.subTest(field=field):
+                orders = [make_order(self.owner), make_order(self.owner), make_order(self.owner, **{field: value})]
+                version = get_orders_version()
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    changed = apply_order_changes(orders, field, value, self.user)
+
+                self.assertEqual({order.pk for order in changed}, {orders[0].pk, orders[1].pk})
+                rows = OrderService.objects.filter(pk__in=[order.pk for order in changed])
+                for row in rows:
+                    self.assertEqual(getattr(row, field), value)
+                    self.assertEqual(row.updated_by_id, self.user.pk)
+                    if field == "priority":
+                        self.assertEqual(row.sla_datetime, row.open_date + sla_delta(value))
+
+                # um log por O.S. alterada, só com o diff dos campos do UPDATE
+                logs = self.bulk_logs(orders)
+                self.assertEqual(sorted(log[0] for log in logs), sorted(order.pk for order in changed))
+                for _, logged_type, changes in logs:
+                    self.assertEqual(logged_type, change_type)
+                    self.assertEqual(set(changes), changed_fields)
+
+                self.assertEqual(find_counter_drift(), [])
+                self.assertEqual(get_orders_version(), version + 1)
+
+    def test_nothing_to_change(self):
+        orders = [make_order(self.owner, status="completed")]
+        version = get_orders_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(apply_order_changes(orders, "status", "completed", self.user), [])
+
+        self.assertEqual(self.bulk_logs(orders), [])
+        self.assertEqual(get_orders_version(), version)
+
+
+class BulkEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.open = [make_order(self.user, status="open") for _ in range(3)]
+        self.done = make_order(self.user, status="completed")
+
+    def post(self, body, query=""):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(URL + query, body, format="json")
+
+    def statuses(self):
+        return dict(OrderService.objects.values_list("pk", "status"))
+
+    def test_ids(self):
+        missing = uuid4()
+        ids = [self.open[0].pk, self.done.pk, missing]
+        response = self.post({"operation": "status", "value": "completed", "ids": [str(pk) for pk in ids]})
+
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual((body["matched"], body["updated"], body["unchanged"], body["not_found"]), (2, 1, 1, 1))
+        self.assertEqual(
+            {row["id"]: row["result"] for row in body["results"]},
+            {str(self.open[0].pk): "updated", str(self.done.pk): "unchanged", str(missing): "not_found"},
+        )
+        self.assertEqual(self.statuses()[self.open[1].pk], "open")
+        self.assertEqual(
+            {row["status"]: row["total"] for row in get_status_breakdown()},
+            {"open": 2, "completed": 2},
+        )
+
+    def test_filters(self):
+        version = get_orders_version()
+        response = self.post({"operation": "delete"}, "?status=open")
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["updated"], 3)
+        self.assertEqual(
+            set(OrderService.objects.filter(is_deleted=False).values_list("pk", flat=True)),
+            {self.done.pk},
+        )
+        self.assertEqual(OrderServiceLog.objects.filter(change_type=OrderServiceLog.ChangeType.DELETED).count(), 3)
+        self.assertEqual(find_counter_drift(), [])
+        self.assertEqual(get_orders_version(), version + 1)
+
+    def test_no_ids_and_no_filter(self):
+        before = self.statuses()
+        for query in ("", "?page_size=10"):
+            with self.subTest(query=query):
+                response = self.post({"operation": "status", "value": "cancelled"}, query)
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.statuses(), before)
+
+    @override_settings(BULK_MAX_ORDERS=2)
+    def test_cap(self):
+        before = self.statuses()
+        logs = OrderServiceLog.objects.count()
+        version = get_orders_version()
+
+        response = self.post({"operation": "status", "value": "cancelled"}, "?status=open")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("2", response.json()["detail"])
+        self.assertEqual(self.statuses(), before)
+        self.assertEqual(OrderServiceLog.objects.count(), logs)
+        self.assertEqual(get_orders_version(), version)
+
+        # no limite, passa
+        response = self.post({"operation": "status", "value": "cancelled", "ids": [str(self.open[0].pk), str(self.open[1].pk)]})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["updated"], 2)
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+
+from core.models import SLACalendar
+from core.services import sla_calendar_service
+from core.services.sla_calendar_service import get_sla_calendar
+from core.utils.business_hours import WorkingCalendar
+
+SAO_PAULO = ZoneInfo("America/Sao_Paulo")
+OFFICE_HOURS = {day: [["08:00", "12:00"], ["13:00", "18:00"]] for day in ("mon", "tue", "wed", "thu", "fri")}
+
+
+def local(*args) -> datetime:
+    return datetime(*args, tzinfo=SAO_PAULO)
+
+
+class WorkingCalendarTests(TestCase):
+    """
+    Novembro: até 2019 era horário de verão em São Paulo; hoje o fuso é
+    UTC-3 o ano todo.
+    """
+
+    def setUp(self):
+        self.calendar = WorkingCalendar(OFFICE_HOURS, ["2026-11-02"], "America/Sao_Paulo")
+
+    def test_within_a_day_skips_lunch(self):
+        self.assertEqual(self.calendar.add(local(2026, 11, 3, 11, 30), timedelta(hours=1)), local(2026, 11, 3, 13, 30))
+
+    def test_weekend_span(self):
+        # sexta 17:00 + 2h úteis = segunda 09:00
+        self.assertEqual(self.calendar.add(local(2026, 11, 6, 17), timedelta(hours=2)), local(2026, 11, 9, 9))
+
+    def test_start_outside_working_hours(self):
+        self.assertEqual(self.calendar.add(local(2026, 11, 7, 10), timedelta(hours=1)), local(2026, 11, 9, 9))
+        self.assertEqual(self.calendar.add(local(2026, 11, 5, 19), timedelta(minutes=30)), local(2026, 11, 6, 8, 30))
+
+    def test_holiday(self):
+        # segunda 02/11 é feriado: sexta 17:00 + 2h = terça 09:00
+        self.assertEqual(self.calendar.add(local(2026, 10, 30, 17), timedelta(hours=2)), local(2026, 11, 3, 9))
+
+    def test_multi_day_duration(self):
+        # 72h úteis = 8 dias de 9h; segunda 08:00 -> quarta da semana seguinte 18:00
+        self.assertEqual(self.calendar.add(local(2026, 11, 9, 8), timedelta(hours=72)), local(2026, 11, 18, 18))
+
+    def test_no_dst_in_sao_paulo(self):
+        result = self.calendar.add(local(2026, 11, 3, 8), timedelta(hours=1))
+        self.assertEqual(result.utcoffset(), timedelta(hours=-3))
+        # o resultado vem no fuso do início
+        utc = self.calendar.add(datetime(2026, 11, 3, 11, tzinfo=dt_timezone.utc), timedelta(hours=1))
+        self.assertEqual(utc, datetime(2026, 11, 3, 12, tzinfo=dt_timezone.utc))
+        self.assertIs(utc.tzinfo, dt_timezone.utc)
+
+    def test_overnight_shift(self):
+        overnight = WorkingCalendar({day: [["22:00", "24:00"], ["00:00", "06:00"]] for day in ("mon", "tue")}, tz="America/Sao_Paulo")
+        # segunda 23:00 + 2h: passa da meia-noite sem pausa
+        self.assertEqual(overnight.add(local(2026, 11, 9, 23), timedelta(hours=2)), local(2026, 11, 10, 1))
+        # terça 05:00 + 2h: 1h até 06:00, a outra a partir de terça 22:00
+        self.assertEqual(overnight.add(local(2026, 11, 10, 5), timedelta(hours=2)), local(2026, 11, 10, 23))
+
+    def test_zero_duration_and_naive_start(self):
+        start = local(2026, 11, 7, 10)
+        self.assertEqual(self.calendar.add(start, timedelta(0)), start)
+        self.assertEqual(
+            self.calendar.add(datetime(2026, 11, 3, 11, 30), timedelta(hours=1)),
+            local(2026, 11, 3, 13, 30),
+        )
+
+    def test_invalid_definitions(self):
+        for working_hours, holidays in [
+            ({"monday": [["08:00", "12:00"]]}, []),
+            ({"mon": [["12:00", "08:00"]]}, []),
+            ({"mon": [["8h", "12h"]]}, []),
+            ({}, []),
+            ([["08:00", "12:00"]], []),
+            (OFFICE_HOURS, ["25/12/2026"]),
+        ]:
+            with self.subTest(working_hours=working_hours, holidays=holidays), self.assertRaises(ValueError):
+                WorkingCalendar(working_hours, holidays)
+
+
+class SlaCalendarLookupTests(TestCase):
+    def setUp(self):
+        sla_calendar_service._clear()
+        self.addCleanup(sla_calendar_service._clear)
+
+    def test_no_calendars(self):
+        self.assertIsNone(get_sla_calendar("technical"))
+
+    def test_provider_then_default(self):
+        SLACalendar.objects.create(name="Padrão", provider="", working_hours=OFFICE_HOURS)
+        SLACalendar.objects.create(name="Técnico", provider="technical", working_hours={"sat": [["08:00", "12:00"]]})
+
+        self.assertEqual(get_sla_calendar("technical").week[5], [(480, 720)])
+        self.assertEqual(get_sla_calendar("logistics").week[0], [(480, 720), (780, 1080)])
+        self.assertEqual(get_sla_calendar("").week[0], [(480, 720), (780, 1080)])
+
+    def test_invalid_row_is_skipped(self):
+        SLACalendar.objects.create(name="Padrão", provider="", working_hours=OFFICE_HOURS)
+        # gravado sem full_clean()
+        SLACalendar.objects.create(name="Quebrado", provider="technical", working_hours={"mon": 5})
+        SLACalendar.objects.create(name="Fuso", provider="logistics", working_hours=OFFICE_HOURS, timezone="Marte/Base")
+
+        with self.assertLogs("core.services.sla_calendar_service", level="ERROR") as logs:
+            calendar = get_sla_calendar("technical")
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(calendar.week[0], [(480, 720), (780, 1080)])
+        self.assertIs(get_sla_calendar("logistics"), calendar)
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from core.services.order_service import soft_delete_order, update_order
+from core.tests.helpers import make_order, make_user
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        self.older = make_order(self.user, status="open")
+        self.newer = make_order(self.user, status="open")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def write(self, function, *args):
+        # a versão do cache só sobe no on_commit
+        with self.captureOnCommitCallbacks(execute=True):
+            function(*args)
+
+    def assertNotModified(self, url, **headers):
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_list_etag(self):
+        url = "/api/v1/ordens-servico/?status=open"
+        etag = self.client.get(url)["ETag"]
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.write(update_order, self.newer, {"description": "editada"}, self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_moves_with_sla_status(self):
+        url = "/api/v1/ordens-servico/?status=open"
+        first = self.client.get(url)
+        self.assertEqual({row["sla_status"] for row in first.json()["results"]}, {"on_time"})
+
+        # sem escrita: o relógio passa do prazo da O.S. mais urgente
+        later = min(self.older.sla_datetime, self.newer.sla_datetime) + timedelta(seconds=1)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        # e o cache de resposta também não devolve a página antiga
+        self.assertIn("overdue", {row["sla_status"] for row in response.json()["results"]})
+
+    def test_list_304_does_not_aggregate(self):
+        url = "/api/v1/ordens-servico/?status=open"
+        etag = self.client.get(url)["ETag"]
+        # versão + duas leituras do índice de sla_datetime
+        with self.assertNumQueries(3):
+            self.assertNotModified(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_list_order_leaving_filter(self):
+        url = "/api/v1/ordens-servico/?status=open"
+        first = self.client.get(url)
+        self.assertEqual(len(first.json()["results"]), 2)
+        self.assertFalse(first.has_header("Last-Modified"))
+
+        # a O.S. mais antiga sai do filtro: Max(updated_at) do filtro não muda
+        self.write(update_order, self.older, {"status": "completed"}, self.user)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+        self.write(soft_delete_order, self.newer, self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_detail_etag_and_last_modified(self):
+        url = f"/api/v1/ordens-servico/{self.older.pk}/"
+        first = self.client.get(url)
+        self.assertNotModified(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertNotModified(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+
+        self.write(update_order, self.older, {"description": "editada"}, self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["description"], "editada")
+
+    def test_detail_last_modified_moves_with_sla_status(self):
+        url = f"/api/v1/ordens-servico/{self.older.pk}/"
+        first = self.client.get(url)
+        self.assertEqual(first.json()["sla_status"], "on_time")
+
+        # sem escrita na O.S.: só o relógio passa do prazo
+        later = self.older.sla_datetime + timedelta(minutes=1)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["sla_status"], "overdue")
+            self.assertNotModified(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+    def test_detail_of_deleted_order(self):
+        url = f"/api/v1/ordens-servico/{self.older.pk}/"
+        first = self.client.get(url)
+        self.write(soft_delete_order, self.older, self.user)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,34 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import DashboardCounter, OrderService
+from core.services.counter_service import track_order_changes
+
+
+class TrackOrderChangesTests(TestCase):
+    def test_counters_are_locked_in_key_order(self):
+        statuses = ["open", "completed", "in_progress"]
+        changes = [(None, OrderService(status=status)) for status in statuses]
+        # mesmas categorias, outra ordem de chegada no lote
+        reordered = [(None, OrderService(status=status)) for status in reversed(statuses)]
+
+        for batch in (changes, reordered):
+            with CaptureQueriesContext(connection) as queries:
+                track_order_changes(batch)
+            updates = [
+                query["sql"] for query in queries.captured_queries
+                if query["sql"].startswith('UPDATE "core_dashboardcounter"')
+            ]
+            touched = [next(status for status in statuses if f"'{status}'" in sql) for sql in updates]
+            self.assertEqual(touched, sorted(statuses))
+
+        totals = dict(DashboardCounter.objects.values_list("status", "total"))
+        self.assertEqual(totals, {status: 2 for status in statuses})
+
+    def test_transitions_net_out(self):
+        old = OrderService(status="open")
+        new = OrderService(status="completed")
+        track_order_changes([(None, old), (old, new), (None, OrderService(status="open"))])
+        totals = dict(DashboardCounter.objects.values_list("status", "total"))
+        self.assertEqual(totals, {"open": 1, "completed": 1})
@@ -0,0 +1,63 @@
+import io
+from unittest import mock
+
+from django.db import IntegrityError
+from django.db.models.query import QuerySet
+from django.test import TestCase
+
+from core.models import ImportMode, OrderService
+from core.services.csv_import_service import PROTOCOL_DELETED_ERROR, import_orders_from_csv
+from core.services.order_service import soft_delete_order
+from core.tests.helpers import make_order, make_user
+
+
+def csv_bytes(rows) -> io.BytesIO:
+    lines = ["protocol,so_number,recipient_name,description"]
+    lines += [",".join(row) for row in rows]
+    return io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+class UpsertDeletedOrderTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.live = make_order(self.user, protocol="P-VIVA", description="antes")
+        self.deleted = make_order(self.user, protocol="P-EXCLUIDA", description="antes")
+        soft_delete_order(self.deleted, self.user)
+
+    def rows(self):
+        return [
+            ("P-VIVA", "SO1", "Cliente", "depois"),
+            ("P-EXCLUIDA", "SO2", "Cliente", "depois"),
+            ("P-NOVA", "SO3", "Cliente", "nova"),
+        ]
+
+    def assert_deleted_untouched(self, result):
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(result["errors"], [{"line": 2, "error": PROTOCOL_DELETED_ERROR}])
+
+        self.deleted.refresh_from_db()
+        self.assertTrue(self.deleted.is_deleted)
+        self.assertEqual(self.deleted.description, "antes")
+        self.live.refresh_from_db()
+        self.assertEqual(self.live.description, "depois")
+
+    def test_upsert_reports_deleted_protocol(self):
+        result = import_orders_from_csv(csv_bytes(self.rows()), self.user, mode=ImportMode.UPSERT)
+        self.assert_deleted_untouched(result)
+
+    def test_row_by_row_fallback_reports_deleted_protocol(self):
+        bulk_create = QuerySet.bulk_create
+
+        def failing_bulk_create(queryset, objs, *args, **kwargs):
+            if queryset.model is OrderService:
+                raise IntegrityError("conflito simulado")
+            return bulk_create(queryset, objs, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, "bulk_create", failing_bulk_create):
+            result = import_orders_from_csv(csv_bytes(self.rows()), self.user, mode=ImportMode.UPSERT)
+        self.assertEqual(result["errors"][0]["line"], 2)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["updated"], 1)
+        self.deleted.refresh_from_db()
+        self.assertEqual(self.deleted.description, "antes")
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import Count
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import OrderService, ServiceOrderStatus, User
+from core.services.cache_service import reset_cache_stats
+from core.services.dashboard_service import get_overview
+from core.services.order_service import soft_delete_order
+from core.services.sla_service import get_sla_status
+from core.tests.helpers import make_order, make_user
+
+
+def loop_overview(now):
+    """
+    Cálculo anterior (uma O.S. por vez em Python), com a comparação de
+    atraso corrigida para 'overdue', que é o que get_sla_status devolve.
+    """
+    qs = OrderService.objects.filter(is_deleted=False)
+    in_24h = in_48h = late = 0
+    for order in qs:
+        if get_sla_status(order) == "overdue":
+            late += 1
+        elif order.sla_datetime:
+            delta = order.sla_datetime - now
+            if delta <= timedelta(hours=24):
+                in_24h += 1
+            elif delta <= timedelta(hours=48):
+                in_48h += 1
+    return {
+        "total_orders": qs.count(),
+        "by_status": list(qs.values("status").annotate(total=Count("id")).order_by("status")),
+        "sla": {"due_in_24h": in_24h, "due_in_48h": in_48h, "late": late},
+    }
+
+
+class OverviewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now().replace(microsecond=0)
+        user = make_user()
+        offsets = [
+            None,
+            timedelta(hours=-30), timedelta(seconds=-1),
+            timedelta(0), timedelta(hours=5), timedelta(hours=24),
+            timedelta(hours=24, seconds=1), timedelta(hours=40), timedelta(hours=48),
+            timedelta(hours=48, seconds=1), timedelta(days=10),
+        ]
+        statuses = list(ServiceOrderStatus.values)
+        for i, offset in enumerate(offsets * 3):
+            order = make_order(user, status=statuses[i % len(statuses)])
+            sla = None if offset is None else cls.now + offset
+            OrderService.objects.filter(pk=order.pk).update(sla_datetime=sla)
+            if i % 7 == 0:
+                order.refresh_from_db()
+                soft_delete_order(order, user)
+
+    def test_matches_python_loop(self):
+        with mock.patch("django.utils.timezone.now", return_value=self.now):
+            expected = loop_overview(self.now)
+            overview = get_overview()
+
+        self.assertEqual(overview["total_orders"], expected["total_orders"])
+        self.assertEqual(overview["sla"], expected["sla"])
+        self.assertEqual(
+            {row["status"]: row["total"] for row in overview["by_status"]},
+            {row["status"]: row["total"] for row in expected["by_status"]},
+        )
+
+    def test_boundaries(self):
+        with mock.patch("django.utils.timezone.now", return_value=self.now):
+            sla = get_overview()["sla"]
+        # cada offset aparece 3x, menos as O.S. deletadas (i % 7 == 0)
+        live = OrderService.objects.filter(is_deleted=False)
+        self.assertEqual(sla["late"], live.filter(sla_datetime__lt=self.now).count())
+        self.assertEqual(
+            sla["due_in_24h"],
+            live.filter(sla_datetime__gte=self.now, sla_datetime__lte=self.now + timedelta(hours=24)).count(),
+        )
+        self.assertGreater(sla["late"], 0)
+        self.assertGreater(sla["due_in_48h"], 0)
+
+
+class CacheStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.addCleanup(reset_cache_stats)
+        self.client = APIClient()
+        self.client.force_authenticate(make_user(role=User.Roles.ADMIN))
+
+    def test_reset(self):
+        for _ in range(2):
+            self.client.get("/api/v1/dashboard/overview/")
+        stats = self.client.get("/api/v1/dashboard/cache-stats/").json()
+        self.assertEqual(stats["endpoints"], {"dashboard-overview": {"hits": 1, "misses": 1}})
+
+        self.assertEqual(self.client.delete("/api/v1/dashboard/cache-stats/").status_code, 204)
+        self.assertEqual(self.client.get("/api/v1/dashboard/cache-stats/").json()["endpoints"], {})
+
+    def test_reset_requires_admin(self):
+        self.client.get("/api/v1/dashboard/overview/")
+        self.client.force_authenticate(make_user())
+        self.assertEqual(self.client.delete("/api/v1/dashboard/cache-stats/").status_code, 403)
+
+        self.client.force_authenticate(make_user(role=User.Roles.ADMIN))
+        self.assertEqual(self.client.get("/api/v1/dashboard/cache-stats/").json()["endpoints"], {
+            "dashboard-overview": {"hits": 0, "misses": 1},
+        })
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.services.log_service import _serialize_instance
+from core.services.order_service import update_order
+from core.tests.helpers import make_order, make_user
+
+URL = "/api/v1/ordens-servico/"
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.order = make_order(cls.user)
+        cls.states = [_serialize_instance(cls.order)]
+        for i in range(2):
+            cls.order = update_order(cls.order, {"description": f"edição {i}"}, cls.user)
+            cls.states.append(_serialize_instance(cls.order))
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), [query["sql"] for query in queries.captured_queries]
+
+    def test_unknown_field(self):
+        for url, params in [
+            (URL, {"fields": "id,nao_existe"}),
+            (URL, {"exclude": "nao_existe"}),
+            (f"{URL}{self.order.pk}/", {"fields": "id,nao_existe"}),
+            (f"{URL}{self.order.pk}/logs/", {"fields": "changes,old_values"}),
+            # changes não existe no formato legado
+            (f"{URL}{self.order.pk}/logs/", {"fields": "changes", "formato": "legado"}),
+        ]:
+            with self.subTest(url=url, params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("fields", response.json())
+
+    def test_detail_prunes_columns(self):
+        data, queries = self.get(f"{URL}{self.order.pk}/", {"fields": "created_by_username,id"})
+
+        self.assertEqual(data, {"id": str(self.order.pk), "created_by_username": self.user.username})
+        # só o usuário que o fieldset lê, e só o username dele
+        (select,) = [sql for sql in queries if 'JOIN "core_user"' in sql]
+        self.assertEqual(select.count('JOIN "core_user"'), 1)
+        self.assertIn('"core_user"."username"', select)
+        self.assertNotIn('"core_user"."email"', select)
+        self.assertNotIn('"core_orderservice"."description"', select)
+        self.assertNotIn('"core_orderservice"."updated_by_id"', select)
+
+    def test_list_prunes_columns(self):
+        data, queries = self.get(URL, {"fields": "updated_by_username,status_display"})
+
+        self.assertEqual(data["results"], [{"status_display": "Aberta"}])
+        page = [sql for sql in queries if 'FROM "core_orderservice"' in sql][-1]
+        self.assertIn('"core_orderservice"."status"', page)
+        self.assertIn("username", page)
+        self.assertNotIn('"core_orderservice"."description"', page)
+        self.assertNotIn('"core_orderservice"."cpf"', page)
+
+    def test_legacy_log_format_with_fieldset(self):
+        data, queries = self.get(
+            f"{URL}{self.order.pk}/logs/",
+            {"formato": "legado", "fields": "new_values,id,old_values"},
+        )
+
+        # logs do mais novo para o mais antigo
+        self.assertEqual([list(row) for row in data], [["id", "old_values", "new_values"]] * 3)
+        self.assertEqual(
+            [(row["old_values"], row["new_values"]) for row in data],
+            [(self.states[1], self.states[2]), (self.states[0], self.states[1]), (None, self.states[0])],
+        )
+        # changed_by fora do fieldset: sem JOIN com o usuário
+        self.assertFalse([sql for sql in queries if 'JOIN "core_user"' in sql])
+        for sql in queries:
+            self.assertNotIn('"core_orderservicelog"."old_values"', sql)
+
+        data, _ = self.get(f"{URL}{self.order.pk}/logs/", {"formato": "legado", "exclude": "old_values,new_values"})
+        self.assertEqual(list(data[0]), ["id", "change_type", "changed_at", "changed_by_username"])
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.db.models.query import QuerySet
+from django.test import TestCase, override_settings
+
+from core.models import ImportJob, OrderService
+from core.services.csv_import_service import run_importer
+from core.services.import_job_service import (
+    ImportJobClaimLost,
+    JobImporter,
+    claim_job,
+    create_import_job,
+    run_import_job,
+)
+from core.tests.helpers import make_user
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def csv_file(rows: int, name: str = "ordens.csv") -> SimpleUploadedFile:
+    lines = ["protocol,so_number,recipient_name,description"]
+    lines += [f"P-JOB-{i},SO{i},Cliente {i},desc" for i in range(1, rows + 1)]
+    return SimpleUploadedFile(name, ("\n".join(lines) + "\n").encode("utf-8"), content_type="text/csv")
+
+
+_bulk_create = QuerySet.bulk_create
+
+
+def _failing_bulk_create(self, objs, *args, **kwargs):
+    # conflito no lote (como um protocolo inserido em paralelo)
+    if self.model is OrderService:
+        raise IntegrityError("conflito simulado")
+    return _bulk_create(self, objs, *args, **kwargs)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CSV_IMPORT_JOB_BACKEND="worker")
+class ImportJobTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = make_user()
+
+    def test_fallback_rows_commit_with_checkpoint(self):
+        job = create_import_job(csv_file(4), self.user, batch_size=10)
+        claim_job(job.pk)
+        with mock.patch.object(QuerySet, "bulk_create", _failing_bulk_create):
+            job = run_import_job(job.pk)
+
+        self.assertEqual(job.rows_created, 4)
+        self.assertEqual(job.last_line, 4)
+        self.assertEqual(job.rows_failed, 0)
+
+    def test_resume_after_crash_in_fallback_does_not_duplicate(self):
+        job = create_import_job(csv_file(4), self.user, batch_size=10)
+        claim_job(job.pk)
+
+        # o processo "morre" no checkpoint do linha a linha
+        importer = JobImporter(job)
+        with mock.patch.object(QuerySet, "bulk_create", _failing_bulk_create), \
+                mock.patch.object(JobImporter, "checkpoint", side_effect=RuntimeError("worker morreu")):
+            with self.assertRaises(RuntimeError), job.file.open("rb") as file:
+                run_importer(importer, file, start_after=job.last_line)
+        self.assertEqual(OrderService.objects.count(), 0)
+
+        job.refresh_from_db()
+        importer = JobImporter(job)
+        with job.file.open("rb") as file:
+            result = run_importer(importer, file, start_after=job.last_line)
+        self.assertEqual(result["created"], 4)
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(OrderService.objects.count(), 4)
+
+    def test_file_removed_when_job_completes(self):
+        job = create_import_job(csv_file(2), self.user)
+        path = job.file.path
+        self.assertTrue(os.path.exists(path))
+
+        claim_job(job.pk)
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.Status.COMPLETED)
+        self.assertFalse(job.file)
+        self.assertFalse(os.path.exists(path))
+
+    def test_file_removed_when_job_fails(self):
+        job = create_import_job(csv_file(2), self.user)
+        path = job.file.path
+        claim_job(job.pk)
+
+        with mock.patch(
+            "core.services.import_job_service.run_importer",
+            side_effect=RuntimeError("falha"),
+        ), self.assertRaises(RuntimeError):
+            run_import_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertEqual(job.error_message, "falha")
+        self.assertFalse(job.file)
+        self.assertFalse(os.path.exists(path))
+
+    def test_claim_is_exclusive(self):
+        job = create_import_job(csv_file(2), self.user)
+        self.assertIsNotNone(claim_job(job.pk))
+        # rodando com heartbeat recente: ninguém mais pega
+        self.assertIsNone(claim_job(job.pk))
+
+    def test_stale_worker_cannot_checkpoint_after_takeover(self):
+        job = create_import_job(csv_file(4), self.user, batch_size=2)
+        old_token = claim_job(job.pk)
+        # sem heartbeat "há tempo demais": outro worker assume o job
+        new_token = claim_job(job.pk, stale_after=-1)
+        self.assertNotEqual(old_token, new_token)
+
+        with self.assertRaises(ImportJobClaimLost):
+            run_import_job(job.pk, old_token)
+        # o lote do worker antigo foi desfeito e o job segue com o novo dono
+        self.assertEqual(OrderService.objects.count(), 0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_line), (ImportJob.Status.RUNNING, 0))
+        self.assertTrue(job.file)
+
+        job = run_import_job(job.pk, new_token)
+        self.assertEqual(job.status, ImportJob.Status.COMPLETED)
+        self.assertEqual(job.rows_created, 4)
+        self.assertEqual(OrderService.objects.count(), 4)
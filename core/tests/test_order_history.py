@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import OrderServiceLog
+from core.services.log_service import _serialize_instance
+from core.services.order_history_service import order_state_at
+from core.services.order_service import update_order
+from core.tests.helpers import make_order, make_user
+
+
+@override_settings(ORDER_LOG_SNAPSHOT_INTERVAL=3, ORDER_HISTORY_SETTLE_SECONDS=600)
+class OrderHistoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        self.order = make_order(self.user)
+        # estado completo depois de cada log, na ordem dos logs
+        self.states = [_serialize_instance(self.order)]
+        for i in range(10):
+            self.order = update_order(self.order, {"description": f"edição {i}"}, self.user)
+            self.states.append(_serialize_instance(self.order))
+
+    def logs(self):
+        return list(self.order.logs.order_by("changed_at", "id"))
+
+    def age_logs(self, days=2):
+        # logs antigos (já assentados): um por minuto
+        start = timezone.now() - timedelta(days=days)
+        for i, log in enumerate(self.logs()):
+            OrderServiceLog.objects.filter(pk=log.pk).update(changed_at=start + timedelta(minutes=i))
+
+    def test_snapshot_and_replay_match_every_log(self):
+        self.age_logs()
+        logs = self.logs()
+        # do fim para o começo (sem checkpoints anteriores) e de novo com o cache cheio
+        for order in (reversed, list):
+            for i in order(range(len(logs))):
+                with self.subTest(log=i, order=order.__name__):
+                    result = order_state_at(self.order.pk, logs[i].changed_at)
+                    self.assertEqual(result["log"]["id"], logs[i].id)
+                    self.assertEqual(result["state"], self.states[i])
+                    self.assertTrue(result["complete"])
+
+    def test_before_first_log(self):
+        self.age_logs()
+        self.assertIsNone(order_state_at(self.order.pk, self.logs()[0].changed_at - timedelta(seconds=1)))
+
+    def test_cache_hit(self):
+        self.age_logs()
+        at = self.logs()[-1].changed_at
+
+        first = order_state_at(self.order.pk, at)
+        self.assertEqual(first["source"], "snapshot")
+        self.assertEqual(first["replayed"], 1)
+
+        # só a query do log alvo
+        with self.assertNumQueries(1):
+            second = order_state_at(self.order.pk, at)
+        self.assertEqual(second["source"], "cache")
+        self.assertEqual(second["replayed"], 0)
+        self.assertEqual(second["state"], self.states[-1])
+
+    def test_recent_positions_are_not_cached(self):
+        logs = self.logs()
+        at = logs[-1].changed_at
+        order_state_at(self.order.pk, at)
+
+        # transação longa: log com changed_at anterior publicado depois
+        late = OrderServiceLog.objects.create(
+            order_service=self.order,
+            changed_by=self.user,
+            change_type=OrderServiceLog.ChangeType.UPDATED,
+            changes={"recipient_name": [self.order.recipient_name, "Cliente atrasado"]},
+        )
+        OrderServiceLog.objects.filter(pk=late.pk).update(changed_at=logs[-2].changed_at + (at - logs[-2].changed_at) / 2)
+
+        result = order_state_at(self.order.pk, at)
+        self.assertNotEqual(result["source"], "cache")
+        self.assertEqual(result["state"]["recipient_name"], "Cliente atrasado")
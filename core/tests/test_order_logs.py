@@ -0,0 +1,135 @@
+from datetime import timedelta
+from importlib import import_module
+from unittest import mock
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Count, Max
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.services.cache_service import make_etag
+from core.services.log_service import _serialize_instance, get_order_logs_validators, legacy_log_values
+from core.services.order_service import update_order
+from core.tests.helpers import make_order, make_user
+
+conversion = import_module("core.migrations.0014_convert_order_logs_to_diffs")
+
+CONVERTED = [("core", "0014_convert_order_logs_to_diffs")]
+
+
+@override_settings(ORDER_LOG_SNAPSHOT_INTERVAL=3)
+class OrderLogTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.order = make_order(self.user)
+        # estado completo depois de cada log, na ordem dos logs
+        self.states = [_serialize_instance(self.order)]
+        for i in range(7):
+            self.order = update_order(self.order, {"description": f"edição {i}"}, self.user)
+            self.states.append(_serialize_instance(self.order))
+
+    def logs(self):
+        return list(self.order.logs.order_by("changed_at", "id"))
+
+    def test_checkpoint_every_interval(self):
+        logs = self.logs()
+        self.assertEqual(len(logs), 8)
+        # CREATED + a cada 3 logs desde o último snapshot
+        self.assertEqual([log.snapshot is not None for log in logs], [True, False, False, True, False, False, True, False])
+        self.assertEqual(logs[3].snapshot, self.states[3])
+        self.assertEqual(logs[1].changes, {"description": ["descrição", "edição 0"]})
+
+    def test_legacy_values_are_full_states(self):
+        logs = self.logs()
+        values = legacy_log_values(logs)
+        self.assertEqual(values[logs[0].id], (None, self.states[0]))
+        for i, log in enumerate(logs[1:], start=1):
+            with self.subTest(log=i):
+                self.assertEqual(values[log.id], (self.states[i - 1], self.states[i]))
+
+    def test_etag_differs_from_pre_conversion_format(self):
+        etag, _ = get_order_logs_validators(self.order.pk)
+        stats = self.order.logs.aggregate(total=Count("pk"), last=Max("changed_at"))
+        self.assertNotEqual(etag, make_etag(self.order.pk, stats["total"], stats["last"].isoformat()))
+
+
+@override_settings(ORDER_LOG_SNAPSHOT_INTERVAL=3)
+class LogConversionMigrationTests(TransactionTestCase):
+    """
+    0014 converte old_values/new_values em diffs + snapshots e a volta
+    refaz os valores completos.
+    """
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(CONVERTED)
+        self.executor.loader.build_graph()
+        self.apps = self.executor.loader.project_state(CONVERTED).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def make_history(self, with_created: bool):
+        User = self.apps.get_model("core", "User")
+        OrderService = self.apps.get_model("core", "OrderService")
+        OrderServiceLog = self.apps.get_model("core", "OrderServiceLog")
+
+        n = OrderService.objects.count() + 1
+        user = User.objects.create(username=f"migracao{n}", email=f"migracao{n}@example.com")
+        order = OrderService.objects.create(
+            protocol=f"P-MIG-{n}",
+            so_number=f"SO{n}",
+            recipient_name="Cliente",
+            description="v0",
+            created_by=user,
+        )
+        fields = conversion._order_fields(self.apps)
+        state = {field: None for field in fields}
+        state.update(protocol=order.protocol, description="v0", created_by=str(user.pk))
+
+        # formato antigo: estado completo antes e depois em cada log
+        rows = []
+        if with_created:
+            rows.append(("CREATED", None, dict(state)))
+        for i in range(1, 6):
+            new = dict(state, description=f"v{i}")
+            rows.append(("UPDATED", state, new))
+            state = new
+        now = timezone.now()
+        for i, (change_type, old, new) in enumerate(rows):
+            OrderServiceLog.objects.create(
+                order_service=order,
+                changed_by=user,
+                change_type=change_type,
+                old_values=old,
+                new_values=new,
+                changed_at=now + timedelta(seconds=i),
+            )
+        return order.pk, rows
+
+    def logs(self, order_id):
+        OrderServiceLog = self.apps.get_model("core", "OrderServiceLog")
+        return list(OrderServiceLog.objects.filter(order_service_id=order_id).order_by("changed_at", "id"))
+
+    # lotes menores que o histórico: o estado de cada O.S. atravessa lotes
+    @mock.patch.object(conversion, "LOGS_PER_BATCH", 4)
+    def test_round_trip(self):
+        histories = [self.make_history(with_created=True), self.make_history(with_created=False)]
+        self.assertEqual(sum(len(batch) for batch in conversion._batches(self.apps)), 11)
+
+        conversion.to_diffs(self.apps, None)
+        created_logs = self.logs(histories[0][0])
+        self.assertEqual([log.snapshot is not None for log in created_logs], [True, False, False, True, False, False])
+        self.assertEqual(created_logs[1].changes, {"description": ["v0", "v1"]})
+        # sem CREATED: o primeiro log completo vira o snapshot
+        self.assertIsNotNone(self.logs(histories[1][0])[0].snapshot)
+
+        OrderServiceLog = self.apps.get_model("core", "OrderServiceLog")
+        OrderServiceLog.objects.update(old_values=None, new_values=None)
+        conversion.to_values(self.apps, None)
+
+        for order_id, rows in histories:
+            restored = [(log.change_type, log.old_values, log.new_values) for log in self.logs(order_id)]
+            self.assertEqual(restored, rows)
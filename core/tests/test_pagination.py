@@ -0,0 +1,107 @@
+import base64
+import json
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import OrderService
+from core.tests.helpers import make_order, make_user
+
+URL = "/api/v1/ordens-servico/"
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        now = timezone.now().replace(microsecond=123456)
+        # empates de valor e NULLs: a ordem depende do desempate pelo pk
+        values = [now, now, now, now + timedelta(hours=1), None, None, None]
+        priorities = ["high", "high", "low", "high", "low", "critical", "low"]
+        cls.rows = {}
+        for sla_datetime, priority in zip(values, priorities):
+            order = make_order(cls.user, priority=priority)
+            OrderService.objects.filter(pk=order.pk).update(sla_datetime=sla_datetime)
+            cls.rows[str(order.pk)] = {"sla_datetime": sla_datetime, "priority": priority}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def expected(self, field):
+        # crescente com NULL no fim; a decrescente é exatamente o inverso
+        return sorted(
+            self.rows,
+            key=lambda pk: (self.rows[pk][field] is None, self.rows[pk][field] or 0, OrderService._meta.pk.to_python(pk)),
+        )
+
+    def walk(self, ordering):
+        page = self.get(URL, {"ordering": ordering, "page_size": 2})
+        self.assertIsNone(page["previous"])
+        pages = [[row["id"] for row in page["results"]]]
+        while page["next"]:
+            page = self.get(page["next"])
+            pages.append([row["id"] for row in page["results"]])
+
+        # de volta pelo previous, a partir da última página
+        back = [pages[-1]]
+        while page["previous"]:
+            page = self.get(page["previous"])
+            back.insert(0, [row["id"] for row in page["results"]])
+        return pages, back
+
+    def test_forward_and_back_over_ties_and_nulls(self):
+        for field in ("sla_datetime", "priority"):
+            ascending = self.expected(field)
+            for ordering, expected in ((field, ascending), (f"-{field}", ascending[::-1])):
+                with self.subTest(ordering=ordering):
+                    pages, back = self.walk(ordering)
+                    seen = [pk for page in pages for pk in page]
+                    # sem repetidos nem buracos
+                    self.assertEqual(seen, expected)
+                    self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+                    self.assertEqual(back, pages)
+
+    def test_empty_page_after_the_end(self):
+        pages, _ = self.walk("sla_datetime")
+        last = self.expected("sla_datetime")[-1]
+        cursor = base64.urlsafe_b64encode(
+            json.dumps({"o": "sla_datetime", "v": None, "k": last, "r": 0}).encode()
+        ).decode()
+        page = self.get(URL, {"ordering": "sla_datetime", "page_size": 2, "cursor": cursor})
+        self.assertEqual(page["results"], [])
+        self.assertIsNone(page["next"])
+        # volta para o início
+        self.assertEqual([row["id"] for row in self.get(page["previous"])["results"]], pages[0])
+
+    def test_tampered_cursor(self):
+        page = self.get(URL, {"ordering": "sla_datetime", "page_size": 2})
+        cursor = parse_qs(urlsplit(page["next"]).query)["cursor"][0]
+        payload = json.loads(base64.urlsafe_b64decode(cursor))
+
+        def encode(**changes):
+            return base64.urlsafe_b64encode(json.dumps({**payload, **changes}).encode()).decode()
+
+        for bad in [
+            "nao-e-cursor",
+            base64.urlsafe_b64encode(b"{quebrado").decode(),
+            base64.urlsafe_b64encode(b"[1, 2]").decode(),
+            encode(o="-sla_datetime"),  # outra ordenação
+            encode(k="nao-e-uuid"),
+            encode(v="ontem"),
+            base64.urlsafe_b64encode(json.dumps({"o": "sla_datetime", "v": None}).encode()).decode(),
+        ]:
+            with self.subTest(cursor=bad):
+                response = self.client.get(URL, {"ordering": "sla_datetime", "cursor": bad})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"cursor": ["Cursor inválido."]})
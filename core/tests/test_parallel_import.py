@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase
+
+from core.models import ImportMode
+from core.services.parallel_import_service import (
+    _import_chunk,
+    _merge_error_parts,
+    _read_header,
+    plan_chunks,
+)
+from core.tests.helpers import make_user
+
+
+class ErrorsFileTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "ordens.csv")
+        lines = ["protocol,so_number,recipient_name,description"]
+        for i in range(1, 41):
+            # linhas pares sem recipient_name: 20 erros de validação
+            name = "" if i % 2 == 0 else f"Cliente {i}"
+            lines.append(f"P-PAR-{i},SO{i},{name},desc")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_errors_file_has_every_error_beyond_the_cap(self):
+        header, _ = _read_header(self.path)
+        chunks = plan_chunks(self.path, 2)
+        errors_file = os.path.join(self.dir.name, "erros.json")
+        parts = [f"{errors_file}.{index}.part" for index in range(len(chunks))]
+
+        results = [
+            _import_chunk(self.path, chunk, header, self.user.pk, 7, ImportMode.INSERT, 3, parts[index])
+            for index, chunk in enumerate(chunks)
+        ]
+        _merge_error_parts(parts, errors_file)
+
+        self.assertEqual(sum(result["error_count"] for result in results), 20)
+        self.assertTrue(all(len(result["errors"]) <= 3 for result in results))
+
+        with open(errors_file, encoding="utf-8") as file:
+            errors = json.load(file)
+        self.assertEqual([error["line"] for error in errors], list(range(2, 41, 2)))
+        self.assertIn("recipient_name", errors[0]["error"])
+        self.assertFalse(any(os.path.exists(part) for part in parts))
@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.middleware import QueryBudgetExceeded
+from core.services.order_service import update_order
+from core.tests.helpers import make_order, make_user, order_data
+from core.utils.query_budget import assert_max_queries
+
+ORDERS = 25
+
+
+@override_settings(QUERY_BUDGET_ENABLED=False)
+class EndpointQueryBudgetTests(TestCase):
+    """
+    Teto de queries por endpoint, independente do número de O.S.
+    (max_repeated=1 pega N+1 por O.S./usuário/log).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        editors = [make_user() for _ in range(3)]
+        cls.orders = []
+        for i in range(ORDERS):
+            order = make_order(editors[i % 3], status="open", priority="high")
+            update_order(order, {"description": f"editada {i}", "updated_by": editors[(i + 1) % 3]}, editors[(i + 2) % 3])
+            cls.orders.append(order)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, limit):
+        with assert_max_queries(limit, max_repeated=1):
+            response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_list(self):
+        # versão + próximas viradas de SLA (2) + página
+        response = self.get("/api/v1/ordens-servico/", 4)
+        self.assertEqual(len(response.json()["results"]), 20)
+
+    def test_detail(self):
+        self.get(f"/api/v1/ordens-servico/{self.orders[0].pk}/", 2)
+
+    def test_logs(self):
+        order = self.orders[0]
+        self.get(f"/api/v1/ordens-servico/{order.pk}/logs/", 3)
+        self.get(f"/api/v1/logsordens-servico/{order.pk}/logs/", 3)
+
+    def test_queue(self):
+        response = self.get("/api/v1/ordens-servico/fila/?limit=50", 1)
+        self.assertEqual(len(response.json()), ORDERS)
+
+    def test_claim(self):
+        # contadores do dashboard: um UPDATE por grupo (open -1, in_progress +1)
+        with assert_max_queries(10, max_repeated=2):
+            response = self.client.post("/api/v1/ordens-servico/fila/reivindicar/", {"limit": 10}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 10)
+        self.assertEqual(response.json()[0]["created_by_username"], self.orders[0].created_by.username)
+
+    def test_export(self):
+        self.get("/api/v1/ordens-servico/exportar/", 1)
+        self.get("/api/v1/ordens-servico/exportar/logs/?formato=ndjson", 1)
+
+
+@override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_ACTION="raise", QUERY_BUDGET_MAX_QUERIES=0)
+class QueryBudgetMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_raises_on_safe_methods(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/api/v1/ordens-servico/")
+
+    def test_only_logs_on_writes(self):
+        with self.assertLogs("core.middleware", level="WARNING"):
+            response = self.client.post("/api/v1/ordens-servico/", order_data(), format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(int(response["X-DB-Queries"]), 0)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import OrderService
+from core.tests.helpers import make_order, make_user
+from core.utils.dates import local_day_range
+
+
+@skipUnless(connection.vendor == "sqlite", "texto do plano (EXPLAIN QUERY PLAN) é o do SQLite")
+class OrderIndexPlanTests(TestCase):
+    """
+    As queries da listagem de O.S. usam os índices parciais de 0008.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        for i in range(20):
+            make_order(cls.user, status="open" if i % 2 else "completed", type="inspection")
+
+    def setUp(self):
+        # a listagem cacheada não chegaria a executar a query da página
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertUsesIndex(self, plan: str, index: str):
+        self.assertIn(f"USING INDEX {index}", plan)
+
+    def test_querysets(self):
+        active = OrderService.objects.filter(is_deleted=False)
+        start, end = local_day_range(timezone.localdate() - timedelta(days=7), timezone.localdate())
+
+        self.assertUsesIndex(active.order_by("-created_at", "-id")[:20].explain(), "os_active_created_idx")
+        self.assertUsesIndex(
+            active.filter(status="open").order_by("-created_at")[:20].explain(),
+            "os_active_status_created_idx",
+        )
+        self.assertUsesIndex(
+            active.filter(type="inspection").order_by("-created_at")[:20].explain(),
+            "os_active_type_created_idx",
+        )
+        self.assertUsesIndex(
+            active.filter(open_date__gte=start, open_date__lt=end).order_by("-open_date", "-id")[:20].explain(),
+            "os_active_open_date_idx",
+        )
+        self.assertUsesIndex(active.order_by("sla_datetime", "id")[:20].explain(), "os_active_sla_idx")
+
+    def plan(self, sql: str) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(row[-1] for row in cursor.fetchall())
+
+    def list_queries(self, params: str):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/v1/ordens-servico/{params}")
+        self.assertEqual(response.status_code, 200)
+        return [
+            query["sql"] for query in queries.captured_queries
+            if 'FROM "core_orderservice"' in query["sql"] and "LIMIT" in query["sql"]
+        ]
+
+    def list_plan(self, params: str) -> str:
+        # a página vem depois das leituras do GET condicional
+        return self.plan(self.list_queries(params)[-1])
+
+    def test_list_endpoint(self):
+        today = timezone.localdate()
+        self.assertUsesIndex(self.list_plan(""), "os_active_created_idx")
+        self.assertUsesIndex(self.list_plan("?status=open"), "os_active_status_created_idx")
+        self.assertUsesIndex(
+            self.list_plan(f"?data_inicio={today - timedelta(days=7)}&data_fim={today}&ordering=-open_date"),
+            "os_active_open_date_idx",
+        )
+
+    def test_list_validators_read_the_sla_index(self):
+        validators = self.list_queries("?status=open")[:-1]
+        self.assertEqual(len(validators), 2)
+        for sql in validators:
+            self.assertUsesIndex(self.plan(sql), "os_active_sla_idx")
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import DailyOrderRollup, DailyRollupState
+from core.services.rollup_service import ROLLUP_STATE, rollup_days, rollup_pending_days
+from core.tests.helpers import make_order, make_user
+from core.utils.dates import local_day_start
+
+
+@override_settings(ROLLUP_REROLL_DAYS=3)
+class RollupPendingDaysTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def open_on(self, days_ago: int):
+        day = self.today - timedelta(days=days_ago)
+        return make_order(self.user, open_date=local_day_start(day) + timedelta(hours=10))
+
+    def opened(self, days_ago: int) -> int:
+        day = self.today - timedelta(days=days_ago)
+        return sum(DailyOrderRollup.objects.filter(day=day).values_list("opened", flat=True))
+
+    def rolled_until(self):
+        return DailyRollupState.objects.get(name=ROLLUP_STATE).rolled_until
+
+    def test_high_water_mark_covers_empty_days(self):
+        self.open_on(10)
+        start_day, until, _ = rollup_pending_days()
+        self.assertEqual(start_day, self.today - timedelta(days=10))
+        self.assertEqual(until, self.yesterday)
+        self.assertEqual(self.rolled_until(), self.yesterday)
+
+        # dias vazios não viram pendentes de novo: só a janela de 3 dias
+        start_day, _, _ = rollup_pending_days()
+        self.assertEqual(start_day, self.yesterday - timedelta(days=2))
+
+    def test_late_orders_inside_window_are_counted(self):
+        self.open_on(5)
+        rollup_pending_days()
+        self.assertEqual(self.opened(2), 0)
+
+        self.open_on(2)
+        rollup_pending_days()
+        self.assertEqual(self.opened(2), 1)
+        self.assertEqual(self.opened(5), 1)
+
+    def test_older_late_orders_need_explicit_range(self):
+        self.open_on(8)
+        rollup_pending_days()
+        self.open_on(6)
+        rollup_pending_days()
+        self.assertEqual(self.opened(6), 0)
+
+        rollup_days(self.today - timedelta(days=6), self.yesterday)
+        self.assertEqual(self.opened(6), 1)
+        self.assertEqual(self.rolled_until(), self.yesterday)
+
+    def test_detached_range_does_not_move_mark(self):
+        self.open_on(10)
+        rollup_days(self.today - timedelta(days=3), self.yesterday)
+        self.assertFalse(DailyRollupState.objects.exists())
+
+        start_day, _, _ = rollup_pending_days()
+        self.assertEqual(start_day, self.today - timedelta(days=10))
+
+    def test_existing_rollup_without_state_resumes_after_last_row(self):
+        self.open_on(10)
+        DailyOrderRollup.objects.create(
+            day=self.today - timedelta(days=9), type="inspection", priority="low", opened=1,
+        )
+        start_day, _, _ = rollup_pending_days()
+        self.assertEqual(start_day, self.today - timedelta(days=8))
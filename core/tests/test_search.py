@@ -0,0 +1,78 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.tests.helpers import make_order, make_user
+from core.utils.filters import search_tokens
+
+
+class SearchTokensTests(TestCase):
+    def test_query_syntax_is_dropped(self):
+        self.assertEqual(search_tokens(['"SO-12"*', "a&b|!c:*", "João_Silva"]), ["so", "12", "a", "b", "c", "joão", "silva"])
+        self.assertEqual(search_tokens(["***", "()"]), [])
+
+
+@skipUnless(connection.vendor in ("sqlite", "postgresql"), "busca textual só nesses bancos")
+class OrderSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.joao = make_order(cls.user, so_number="SO98765", recipient_name="João Conceição", description="troca de medidor")
+        cls.maria = make_order(cls.user, so_number="SO55555", recipient_name="Maria Souza", description="religação")
+        # relevância: mais ocorrências de "bomba" (mesmo tamanho de texto) = rank maior
+        cls.pumps = {}
+        for hits in (1, 2, 3):
+            for _ in range(2):  # empates de rank
+                description = " ".join(["bomba"] * hits + ["painel"] * (4 - hits))
+                cls.pumps.setdefault(hits, []).append(make_order(cls.user, description=description).pk)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, text, **params):
+        response = self.client.get("/api/v1/ordens-servico/", {"search": text, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, text):
+        return {row["id"] for row in self.search(text)["results"]}
+
+    def test_prefix(self):
+        self.assertEqual(self.ids("SO987"), {str(self.joao.pk)})
+        self.assertEqual(self.ids("medi"), {str(self.joao.pk)})
+        # todos os termos, cada um como prefixo
+        self.assertEqual(self.ids("joa medidor"), {str(self.joao.pk)})
+        self.assertEqual(self.ids("joa religação"), set())
+
+    def test_accents(self):
+        self.assertEqual(self.ids("Joao Conceicao"), {str(self.joao.pk)})
+        self.assertEqual(self.ids("religacao"), {str(self.maria.pk)})
+
+    def test_query_syntax_is_not_an_error(self):
+        self.assertEqual(self.ids('"SO98765" OR*'), set())
+        self.assertEqual(self.ids("SO98765*"), {str(self.joao.pk)})
+        self.assertEqual(self.ids("***"), set())
+
+    def test_rank_ordering_across_keyset_pages(self):
+        rank = {str(pk): hits for hits, pks in self.pumps.items() for pk in pks}
+        page = self.search("bomba", page_size=2)
+        seen = [row["id"] for row in page["results"]]
+        while page["next"]:
+            page = self.client.get(page["next"]).json()
+            seen += [row["id"] for row in page["results"]]
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), set(rank))
+        self.assertEqual([rank[pk] for pk in seen], [3, 3, 2, 2, 1, 1])
+
+        # e de volta pelo previous, página a página
+        back = [row["id"] for row in page["results"]]
+        while page["previous"]:
+            page = self.client.get(page["previous"]).json()
+            back = [row["id"] for row in page["results"]] + back
+        self.assertEqual(back, seen)
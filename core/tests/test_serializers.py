@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.models import OrderService
+from core.serializers.orders import OrderServiceListSerializer, OrderServiceSerializer
+from core.tests.helpers import make_order, make_user
+from core.utils.fieldsets import get_requested_fields, only_columns, required_columns
+
+# fora da ordem de Meta.fields
+FIELDS = "updated_by_username,sla_status,id,status_display,due_date,cpf"
+
+
+class OrderListSerializerTests(TestCase):
+    """
+    OrderServiceListSerializer (linhas .values()) tem de gerar o mesmo
+    JSON que o OrderServiceSerializer, byte a byte.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        editor = make_user()
+        now = timezone.now()
+        # prazos longe das viradas de sla_status: os dois serializers usam `now` próprios
+        edited = make_order(cls.user, cpf="123.456.789-00")
+        OrderService.objects.filter(pk=edited.pk).update(updated_by=editor, sla_datetime=now - timedelta(days=3))
+        nearing = make_order(cls.user)  # updated_by nulo
+        OrderService.objects.filter(pk=nearing.pk).update(sla_datetime=now + timedelta(hours=12))
+        legacy = make_order(cls.user)
+        # valores fora das choices (dados antigos): o *_display repete o valor
+        OrderService.objects.filter(pk=legacy.pk).update(status="arquivada", type="vistoria_antiga", sla_datetime=None)
+        cls.ids = [edited.pk, nearing.pk, legacy.pk]
+
+    def setUp(self):
+        cache.clear()
+
+    def queryset(self):
+        return OrderService.objects.filter(pk__in=self.ids).select_related("created_by", "updated_by").order_by("pk")
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def fieldset(self):
+        request = Request(APIRequestFactory().get("/", {"fields": FIELDS}))
+        return get_requested_fields(request, OrderServiceSerializer.Meta.fields)
+
+    def test_full_representation(self):
+        rows = OrderServiceListSerializer.get_values(self.queryset())
+        expected = OrderServiceSerializer(self.queryset(), many=True).data
+
+        self.assertEqual(self.render(OrderServiceListSerializer(rows, many=True).data), self.render(expected))
+        by_id = {row["id"]: row for row in expected}
+        self.assertNotIn("updated_by_username", by_id[str(self.ids[1])])
+        self.assertEqual(by_id[str(self.ids[2])]["status_display"], "arquivada")
+
+    def test_fieldset_out_of_order(self):
+        fieldset = self.fieldset()
+        # a saída segue a ordem de Meta.fields, não a do ?fields=
+        self.assertEqual(fieldset, ["id", "status_display", "cpf", "due_date", "sla_status", "updated_by_username"])
+        context = {"fieldset": fieldset}
+        rows = OrderServiceListSerializer.get_values(self.queryset(), fieldset=fieldset)
+        instances = only_columns(self.queryset(), required_columns(fieldset, OrderServiceSerializer.field_sources))
+
+        self.assertEqual(
+            self.render(OrderServiceListSerializer(rows, many=True, context=context).data),
+            self.render(OrderServiceSerializer(instances, many=True, context=context).data),
+        )
+
+    def test_list_and_detail_endpoints_agree(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        for params in ({}, {"fields": FIELDS}):
+            with self.subTest(params=params):
+                listed = client.get("/api/v1/ordens-servico/", {**params, "ordering": "open_date"}).json()["results"]
+                self.assertEqual(len(listed), len(self.ids))
+                for row in listed:
+                    detail = client.get(f"/api/v1/ordens-servico/{row['id']}/", params)
+                    self.assertEqual(self.render(row), self.render(detail.json()))
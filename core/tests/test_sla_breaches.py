@@ -0,0 +1,83 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import OrderService, SLABreachEvent, SLAScanState
+from core.services import sla_breach_service
+from core.services.sla_breach_service import SCAN_STATE_NAME, MemoryBreachNotifier, scan_sla_breaches
+from core.tests.helpers import make_order, make_user
+
+
+class SlaBreachScanTests(TestCase):
+    def setUp(self):
+        MemoryBreachNotifier.clear()
+        self.notifier = MemoryBreachNotifier()
+        self.user = make_user()
+        self.now = timezone.now()
+        self.since = self.now - timedelta(hours=1)
+        SLAScanState.objects.create(name=SCAN_STATE_NAME, scanned_until=self.since)
+
+    def order(self, sla_datetime, updated_at=None):
+        order = make_order(self.user, status="open")
+        # update() não mexe no auto_now: updated_at fica como informado
+        OrderService.objects.filter(pk=order.pk).update(
+            sla_datetime=sla_datetime,
+            updated_at=updated_at or self.since - timedelta(days=1),
+        )
+        return order
+
+    def scan(self, now=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return scan_sla_breaches(self.notifier, now=now or self.now)
+
+    def sent(self):
+        return {(event["order_service"], event["kind"]) for event in MemoryBreachNotifier.sent}
+
+    def test_notifies_each_transition_once(self):
+        overdue = self.order(self.now - timedelta(minutes=30))
+        nearing = self.order(self.now + timedelta(hours=23, minutes=30))
+        self.order(self.now - timedelta(days=2))  # já estourado antes da varredura anterior
+        self.order(self.now + timedelta(days=3))  # no prazo
+
+        summary = self.scan()
+        self.assertEqual((summary["overdue"], summary["nearing_due_date"]), (1, 1))
+        self.assertEqual(self.sent(), {(str(overdue.pk), "overdue"), (str(nearing.pk), "nearing_due_date")})
+
+        MemoryBreachNotifier.clear()
+        self.scan(self.now + timedelta(minutes=1))
+        self.assertEqual(MemoryBreachNotifier.sent, [])
+
+    def test_order_changed_after_since_already_overdue(self):
+        # ex.: reaberta (ou importada) com prazo vencido antes de `since`
+        order = self.order(self.now - timedelta(days=2), updated_at=self.now - timedelta(minutes=5))
+
+        summary = self.scan()
+        self.assertEqual(summary["overdue"], 1)
+        self.assertEqual(self.sent(), {(str(order.pk), "overdue")})
+
+    def test_only_inserted_events_are_notified(self):
+        taken = self.order(self.now - timedelta(minutes=30))
+        mine = self.order(self.now - timedelta(minutes=20))
+        new_events = sla_breach_service._new_events
+
+        def racing_new_events(candidates, now):
+            events = new_events(candidates, now)
+            # outro scanner grava o mesmo evento antes do nosso bulk_create
+            SLABreachEvent.objects.create(
+                order_service_id=taken.pk,
+                kind=SLABreachEvent.Kind.OVERDUE,
+                sla_datetime=OrderService.objects.get(pk=taken.pk).sla_datetime,
+                status="open",
+                priority=taken.priority,
+                detected_at=now - timedelta(seconds=1),
+            )
+            return events
+
+        with mock.patch.object(sla_breach_service, "_new_events", racing_new_events):
+            summary = self.scan()
+
+        self.assertEqual(summary["overdue"], 1)
+        self.assertEqual(self.sent(), {(str(mine.pk), "overdue")})
+        self.assertEqual(SLABreachEvent.objects.filter(order_service_id=taken.pk).count(), 1)
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import OrderService, OrderServiceLog, SLACalendar
+from core.services import sla_calendar_service
+from core.services.cache_service import get_orders_version
+from core.services.sla_recompute_service import recompute_sla
+from core.services.sla_service import sla_delta
+from core.tests.helpers import make_order, make_user
+
+SAO_PAULO = ZoneInfo("America/Sao_Paulo")
+OFFICE_HOURS = {day: [["08:00", "12:00"], ["13:00", "18:00"]] for day in ("mon", "tue", "wed", "thu", "fri")}
+# terça 10:00 em São Paulo
+OPEN_DATE = datetime(2026, 11, 3, 10, tzinfo=SAO_PAULO)
+STALE_SLA = datetime(2020, 1, 1, tzinfo=SAO_PAULO)
+
+
+class RecomputeSlaTests(TestCase):
+    def setUp(self):
+        sla_calendar_service._clear()
+        self.addCleanup(sla_calendar_service._clear)
+        self.user = make_user()
+
+    def order(self, priority="medium", status="open", sla_datetime=STALE_SLA):
+        order = make_order(self.user, priority=priority, status=status)
+        OrderService.objects.filter(pk=order.pk).update(open_date=OPEN_DATE, sla_datetime=sla_datetime)
+        return order
+
+    def recompute(self, **kwargs):
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            summary = recompute_sla(**kwargs)
+        updates = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "core_orderservice"')
+        ]
+        return summary, updates
+
+    def sla(self, order):
+        return OrderService.objects.values_list("sla_datetime", flat=True).get(pk=order.pk)
+
+    def sla_logs(self, order):
+        return list(
+            OrderServiceLog.objects
+            .filter(order_service=order, change_type=OrderServiceLog.ChangeType.UPDATED)
+            .values_list("changes", flat=True)
+        )
+
+    def test_wall_clock_path(self):
+        orders = {priority: self.order(priority) for priority in ("critical", "high", "low")}
+        current = self.order("medium", sla_datetime=OPEN_DATE + sla_delta("medium"))
+
+        summary, updates = self.recompute()
+
+        self.assertEqual(summary["changed"], 3)
+        for priority, order in orders.items():
+            self.assertEqual(self.sla(order), OPEN_DATE + sla_delta(priority))
+        self.assertEqual(self.sla(current), OPEN_DATE + sla_delta("medium"))
+        # um UPDATE por prioridade, com o prazo calculado no banco
+        self.assertEqual(len(updates), 3)
+        for sql in updates:
+            self.assertIn('"open_date"', sql)
+            self.assertNotIn("CASE", sql)
+
+    def test_calendar_path(self):
+        SLACalendar.objects.create(name="Padrão", provider="", working_hours=OFFICE_HOURS)
+        critical, low = self.order("critical"), self.order("low")
+
+        summary, updates = self.recompute()
+
+        self.assertEqual(summary["changed"], 2)
+        # 4h úteis a partir de terça 10:00 (almoço no meio) / 72h úteis = 8 dias de 9h
+        self.assertEqual(self.sla(critical), datetime(2026, 11, 3, 15, tzinfo=SAO_PAULO))
+        self.assertEqual(self.sla(low), datetime(2026, 11, 13, 10, tzinfo=SAO_PAULO))
+        # bulk_update: prazos já calculados, um CASE por grupo
+        self.assertEqual(len(updates), 2)
+        for sql in updates:
+            self.assertIn("CASE", sql)
+            self.assertNotIn('"open_date"', sql)
+
+    def test_dry_run_writes_nothing(self):
+        order = self.order("high")
+        version = get_orders_version()
+        logs = OrderServiceLog.objects.count()
+
+        summary, updates = self.recompute(dry_run=True)
+
+        self.assertEqual(summary["changed"], 1)
+        self.assertEqual(summary["groups"]["high"]["earlier"], 0)
+        self.assertEqual(summary["groups"]["high"]["later"], 1)
+        self.assertEqual(updates, [])
+        self.assertEqual(self.sla(order), STALE_SLA)
+        self.assertEqual(OrderServiceLog.objects.count(), logs)
+        self.assertEqual(get_orders_version(), version)
+
+    def test_chunks_follow_the_pk_cursor(self):
+        pks = sorted(self.order().pk for _ in range(5))
+        self.order(status="completed")
+        deleted = self.order()
+        OrderService.objects.filter(pk=deleted.pk).update(is_deleted=True)
+        seen = []
+
+        summary, _ = self.recompute(chunk_size=2, on_chunk=seen.append)
+
+        self.assertEqual(summary["chunks"], 3)
+        self.assertEqual(summary["examined"], 5)
+        self.assertEqual([chunk["last_pk"] for chunk in seen], [pks[1], pks[3], pks[4]])
+        self.assertEqual([chunk["chunk_examined"] for chunk in seen], [2, 2, 1])
+        self.assertEqual(self.sla(deleted), STALE_SLA)
+
+    def test_one_sla_diff_log_per_change(self):
+        stale = self.order("high")
+        current = self.order("high", sla_datetime=OPEN_DATE + sla_delta("high"))
+        version = get_orders_version()
+
+        self.recompute(chunk_size=1)
+
+        self.assertEqual(self.sla_logs(stale), [{
+            "sla_datetime": [
+                STALE_SLA.astimezone(dt_timezone.utc).isoformat(),
+                (OPEN_DATE + sla_delta("high")).astimezone(dt_timezone.utc).isoformat(),
+            ],
+        }])
+        self.assertEqual(self.sla_logs(current), [])
+        self.assertGreater(get_orders_version(), version)
+
+        # de novo: nada a mudar, nenhum log novo
+        summary, updates = self.recompute()
+        self.assertEqual(summary["changed"], 0)
+        self.assertEqual(updates, [])
+        self.assertEqual(len(self.sla_logs(stale)), 1)
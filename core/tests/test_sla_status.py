@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import OrderService
+from core.services.sla_service import (
+    NEARING_DUE_WINDOW,
+    SLA_STATUSES,
+    annotate_sla_status,
+    get_sla_status,
+    sla_status_q,
+)
+from core.tests.helpers import make_order, make_user
+
+# fronteiras de sla_status_at: exatamente now, now + 24h e sem prazo
+OFFSETS = [
+    None,
+    -timedelta(days=3),
+    -timedelta(seconds=1),
+    -timedelta(microseconds=1),
+    timedelta(0),
+    timedelta(microseconds=1),
+    timedelta(hours=1),
+    NEARING_DUE_WINDOW - timedelta(microseconds=1),
+    NEARING_DUE_WINDOW,
+    NEARING_DUE_WINDOW + timedelta(microseconds=1),
+    NEARING_DUE_WINDOW + timedelta(seconds=1),
+    timedelta(days=5),
+]
+
+
+class SlaStatusAnnotationTests(TestCase):
+    """
+    annotate_sla_status (Case/When) e sla_status_q (intervalos) dão o
+    mesmo resultado de get_sla_status, linha a linha.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = make_user()
+        cls.orders = [make_order(user) for _ in OFFSETS]
+
+    def check(self, now):
+        for order, offset in zip(self.orders, OFFSETS):
+            sla_datetime = None if offset is None else now + offset
+            OrderService.objects.filter(pk=order.pk).update(sla_datetime=sla_datetime)
+
+        annotated = dict(annotate_sla_status(OrderService.objects.all(), now).values_list("pk", "sla_status"))
+        filtered = {
+            pk: status
+            for status in SLA_STATUSES
+            for pk in OrderService.objects.filter(sla_status_q(status, now)).values_list("pk", flat=True)
+        }
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            for order, offset in zip(self.orders, OFFSETS):
+                order.refresh_from_db()
+                expected = get_sla_status(order)
+                with self.subTest(now=now, offset=offset):
+                    self.assertEqual(annotated[order.pk], expected)
+                    self.assertEqual(filtered[order.pk], expected)
+
+    def test_matches_get_sla_status(self):
+        self.check(datetime(2026, 3, 4, 14, 0, 0, 500000, tzinfo=dt_timezone.utc))
+
+    def test_matches_get_sla_status_on_whole_seconds(self):
+        self.check(datetime(2026, 3, 4, 14, 0, tzinfo=dt_timezone.utc))
+
+
+class BulkSlaStatusFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        self.overdue = make_order(self.user, status="open")
+        self.on_time = make_order(self.user, status="open")
+        OrderService.objects.filter(pk=self.overdue.pk).update(sla_datetime=self.overdue.open_date - timedelta(days=1))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_sla_status_counts_as_filter(self):
+        response = self.client.post(
+            "/api/v1/ordens-servico/bulk/?sla_status=overdue",
+            {"operation": "priority", "value": "critical"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.overdue.refresh_from_db()
+        self.on_time.refresh_from_db()
+        self.assertEqual(self.overdue.priority, "critical")
+        self.assertNotEqual(self.on_time.priority, "critical")
@@ -0,0 +1,19 @@
+from datetime import date, datetime, time, timedelta
+from typing import Tuple
+
+from django.utils import timezone
+
+
+def local_day_start(day: date) -> datetime:
+    """
+    Meia-noite do dia no fuso atual (settings.TIME_ZONE), como datetime aware.
+    """
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def local_day_range(start_day: date, end_day: date) -> Tuple[datetime, datetime]:
+    """
+    Intervalo semiaberto [início de start_day, início do dia seguinte a end_day).
+    Permite filtrar colunas datetime sem cast para date (usa índice).
+    """
+    return local_day_start(start_day), local_day_start(end_day + timedelta(days=1))
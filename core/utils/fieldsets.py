@@ -0,0 +1,108 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+EXCLUDE_PARAM = "exclude"
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def get_requested_fields(request, available: Sequence[str]) -> Optional[List[str]]:
+    """
+    Campos pedidos via ?fields=a,b ou ?exclude=c (na ordem de `available`),
+    ou None se o cliente não restringiu nada.
+    """
+    fields = _split(request.query_params.get(FIELDS_PARAM))
+    exclude = _split(request.query_params.get(EXCLUDE_PARAM))
+    if not fields and not exclude:
+        return None
+
+    unknown = [name for name in fields + exclude if name not in available]
+    if unknown:
+        raise ValidationError({
+            FIELDS_PARAM: f"Campos inválidos: {', '.join(unknown)}. Disponíveis: {', '.join(available)}."
+        })
+    return [
+        name
+        for name in available
+        if (not fields or name in fields) and name not in exclude
+    ]
+
+
+def required_columns(fieldset: Sequence[str], sources: Dict[str, Tuple[str, ...]]) -> List[str]:
+    """
+    Colunas (caminhos do ORM, ex.: "created_by__username") necessárias
+    para montar os campos de `fieldset`. O id sempre vem junto.
+    """
+    columns = {"id": None}
+    for name in fieldset:
+        columns.update(dict.fromkeys(sources.get(name, (name,))))
+    return list(columns)
+
+
+def only_columns(queryset, columns: Sequence[str]):
+    """
+    .only() nas colunas, com select_related só nas relações usadas
+    (uma relação adiada não pode ser percorrida pelo select_related).
+    """
+    relations = list(dict.fromkeys(column.split("__")[0] for column in columns if "__" in column))
+    queryset = queryset.select_related(None)
+    if relations:
+        # select_related() sem argumentos seguiria todas as FKs
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns)
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer que expõe só os campos de context["fieldset"] (quando
+    houver); os demais são removidos antes de qualquer cálculo.
+
+    `field_sources` mapeia campo de saída -> colunas do model que ele lê
+    (o padrão é a coluna de mesmo nome).
+    """
+
+    field_sources: Dict[str, Tuple[str, ...]] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get("fieldset")
+        if fieldset is not None:
+            for name in set(self.fields) - set(fieldset):
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    ?fields= / ?exclude= em views DRF de leitura: passa o fieldset para
+    o serializer e restringe o queryset (.only()) às colunas usadas.
+    """
+
+    # views que não são GenericAPIView indicam o serializer aqui
+    fieldset_serializer_class = None
+
+    def get_fieldset_serializer_class(self):
+        return self.fieldset_serializer_class or self.get_serializer_class()
+
+    def get_fieldset(self) -> Optional[List[str]]:
+        if self.request.method != "GET":
+            return None
+        if not hasattr(self, "_fieldset"):
+            available = list(self.get_fieldset_serializer_class().Meta.fields)
+            self._fieldset = get_requested_fields(self.request, available)
+        return self._fieldset
+
+    def apply_fieldset(self, queryset, extra_columns: Sequence[str] = ()):
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return queryset
+        sources = self.get_fieldset_serializer_class().field_sources
+        return only_columns(queryset, required_columns(fieldset, sources) + list(extra_columns))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.get_fieldset()
+        return context
@@ -0,0 +1,129 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from core.services.sla_service import SLA_STATUSES, annotate_sla_status, sla_status_q
+from core.utils.search_index import FTS_TABLE, ORDER_TABLE, SEARCH_CONFIG
+
+
+def search_tokens(terms):
+    """
+    Termos do ?search= quebrados em palavras (letras/dígitos), como os
+    tokenizadores dos índices fazem: sem sintaxe de consulta do usuário
+    (aspas, *, &, |, :) chegando ao FTS5 ou ao to_tsquery.
+    """
+    return [token.lower() for term in terms for token in re.findall(r"[^\W_]+", term)]
+
+
+class OrderFullTextSearchFilter(filters.SearchFilter):
+    """
+    ?search= com índice de busca textual (core/utils/search_index.py)
+    em vez de um ILIKE '%termo%' por campo.
+
+    Anota `search_rank` (maior = mais relevante), usado pela view como
+    ordenação padrão quando há busca. Em bancos sem índice, cai no
+    SearchFilter padrão do DRF.
+    """
+
+    rank_field = "search_rank"
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        vendor = connections[queryset.db].vendor
+        if vendor not in ("postgresql", "sqlite"):
+            return super().filter_queryset(request, queryset, view)
+
+        tokens = search_tokens(terms)
+        if not tokens:
+            # só pontuação: nenhum termo pesquisável
+            return queryset.none().annotate(**{self.rank_field: Value(0.0, output_field=FloatField())})
+        if vendor == "postgresql":
+            return self._filter_postgresql(queryset, tokens)
+        return self._filter_sqlite(queryset, tokens)
+
+    def _filter_postgresql(self, queryset, tokens):
+        # mesma regra do SQLite: todos os termos, cada um como prefixo
+        text = " & ".join(f"{token}:*" for token in tokens)
+        query = f"to_tsquery('{SEARCH_CONFIG}', %s)"
+        return queryset.filter(
+            RawSQL(f"{ORDER_TABLE}.search_vector @@ {query}", [text], output_field=BooleanField())
+        ).annotate(**{
+            # float8: o valor precisa voltar exato no cursor da paginação
+            self.rank_field: RawSQL(
+                f"ts_rank({ORDER_TABLE}.search_vector, {query})::float8",
+                [text],
+                output_field=FloatField(),
+            )
+        })
+
+    def _filter_sqlite(self, queryset, tokens):
+        match = " ".join(f'"{token}"*' for token in tokens)
+        return queryset.filter(
+            RawSQL(
+                f"{ORDER_TABLE}.rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",
+                [match],
+                output_field=BooleanField(),
+            )
+        ).annotate(**{
+            # rank do FTS5 é bm25 (menor = melhor); invertido para ficar igual ao PostgreSQL
+            self.rank_field: RawSQL(
+                f"(SELECT -rank FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {ORDER_TABLE}.rowid)",
+                [match],
+                output_field=FloatField(),
+            )
+        })
+
+
+class SlaStatusFilter(filters.BaseFilterBackend):
+    """
+    Anota `sla_status` (mesma regra de get_sla_status, em SQL) e aceita
+    ?sla_status=overdue (ou vários, separados por vírgula).
+
+    O filtro vira intervalos em sla_datetime, não uma comparação com
+    o CASE, para o banco usar o índice. A anotação e o filtro usam o
+    mesmo `now`, então a linha filtrada sai com o status pedido.
+    """
+
+    param = "sla_status"
+
+    def filter_queryset(self, request, queryset, view):
+        now = timezone.now()
+        queryset = annotate_sla_status(queryset, now, name=self.param)
+
+        statuses = [s.strip() for s in request.query_params.get(self.param, "").split(",") if s.strip()]
+        if not statuses:
+            return queryset
+        invalid = [status for status in statuses if status not in SLA_STATUSES]
+        if invalid:
+            raise ValidationError({self.param: f"Use um de: {', '.join(SLA_STATUSES)}."})
+
+        q = sla_status_q(statuses[0], now)
+        for status in statuses[1:]:
+            q |= sla_status_q(status, now)
+        return queryset.filter(q)
+
+
+class AliasOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter que traduz campos de `view.ordering_aliases`
+    (ex.: sla_status -> sla_datetime) antes do ORDER BY.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, "ordering_aliases", {})
+        if not ordering or not aliases:
+            return ordering
+        return [
+            ("-" if term.startswith("-") else "") + aliases.get(term.lstrip("-"), term.lstrip("-"))
+            for term in ordering
+        ]
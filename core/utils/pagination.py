@@ -1,6 +1,180 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from typing import Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) sobre (campo de ordenação, id).
+    O custo de cada página é o mesmo, não importa a profundidade:
+    a query filtra a partir da última linha vista em vez de usar OFFSET.
+
+    O campo vem de ?ordering= (um dos `ordering_fields` da view, com
+    ou sem '-', traduzido por `view.ordering_aliases`); sem ordering,
+    usa `view.get_default_ordering()`, `view.ordering` ou
+    `default_ordering`. Valores NULL ficam no fim da ordem crescente
+    (e no início da decrescente).
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering_param = api_settings.ORDERING_PARAM
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Cursor inválido."
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, request, view) -> Tuple[str, bool]:
+        allowed = set(getattr(view, "ordering_fields", None) or [])
+        requested = request.query_params.get(self.ordering_param, "")
+        ordering = requested.split(",")[0].strip()
+        if ordering.lstrip("-") not in allowed:
+            if hasattr(view, "get_default_ordering"):
+                ordering = view.get_default_ordering()
+            else:
+                ordering = getattr(view, "ordering", None) or self.default_ordering
+            if not isinstance(ordering, str):
+                ordering = ordering[0]
+        field = ordering.lstrip("-")
+        # ex.: sla_status ordena pela coluna sla_datetime (mesma ordem, com índice)
+        field = getattr(view, "ordering_aliases", {}).get(field, field)
+        return field, ordering.startswith("-")
+
+    # ---- cursor ----
+    def encode_cursor(self, position, pk, reverse: bool) -> str:
+        if hasattr(position, "isoformat"):
+            # isoformat completo: o DjangoJSONEncoder corta os microssegundos
+            position = position.isoformat()
+        payload = {"o": self.ordering, "v": position, "k": str(pk), "r": int(reverse)}
+        raw = json.dumps(payload, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request, model) -> Optional[dict]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            if payload["o"] != self.ordering:
+                raise ValueError
+            value = payload["v"]
+            if value is not None:
+                value = self._to_python(model, value)
+            return {
+                "value": value,
+                "pk": model._meta.pk.to_python(payload["k"]),
+                "reverse": bool(payload["r"]),
+            }
+        except (KeyError, TypeError, ValueError, DjangoValidationError):
+            # cursor adulterado ou de outra ordenação: erro do cliente
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+
+    def _to_python(self, model, value):
+        try:
+            field = model._meta.get_field(self.field)
+        except FieldDoesNotExist:
+            # anotação (ex.: search_rank): o valor do JSON já é o tipo certo
+            return value
+        return field.to_python(value)
+
+    # ---- query ----
+    def _order_by(self, descending: bool):
+        if descending:
+            return F(self.field).desc(nulls_first=True), "-pk"
+        return F(self.field).asc(nulls_last=True), "pk"
+
+    def _after(self, value, pk, descending: bool) -> Q:
+        op = "lt" if descending else "gt"
+        field = self.field
+
+        if value is None:
+            q = Q(**{f"{field}__isnull": True, f"pk__{op}": pk})
+            if descending:
+                q |= Q(**{f"{field}__isnull": False})
+            return q
+
+        q = Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{op}": pk})
+        if not descending:
+            q |= Q(**{f"{field}__isnull": True})
+        return q
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.field, self.descending = self.get_ordering(request, view)
+        self.ordering = f"-{self.field}" if self.descending else self.field
+        self.pk_name = queryset.model._meta.pk.attname
+        page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(cursor and cursor["reverse"])
+        query_descending = self.descending != reverse
+
+        queryset = queryset.order_by(*self._order_by(query_descending))
+        if cursor:
+            queryset = queryset.filter(
+                self._after(cursor["value"], cursor["pk"], query_descending)
+            )
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    # ---- resposta ----
+    def _link(self, row, reverse: bool) -> str:
+        url = self.request.build_absolute_uri()
+        if isinstance(row, dict):
+            # queryset.values()
+            position, pk = row[self.field], row[self.pk_name]
+        else:
+            position, pk = getattr(row, self.field), row.pk
+        cursor = self.encode_cursor(position, pk, reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or self.last_row is None:
+            return None
+        return self._link(self.last_row, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if self.first_row is None:
+            # página vazia depois do fim: volta para o início
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._link(self.first_row, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
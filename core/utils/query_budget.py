@@ -0,0 +1,98 @@
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from django.db import connections
+
+# IN (%s, %s, ...) de tamanhos diferentes contam como o mesmo formato
+_IN_LIST_RE = re.compile(r"\bIN \((?:%s, )*%s\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def query_shape(sql: str) -> str:
+    """
+    Normaliza o SQL (sem parâmetros/literais) para agrupar queries
+    iguais que só mudam de valor: o padrão típico de N+1.
+    """
+    shape = _LITERAL_RE.sub("?", sql)
+    shape = _IN_LIST_RE.sub("IN (...)", shape)
+    return _SPACES_RE.sub(" ", shape).strip()
+
+
+class QueryRecorder:
+    """
+    Wrapper de execução (connection.execute_wrapper) que conta as
+    queries, soma o tempo de banco e agrupa por formato.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.shapes[query_shape(sql)] += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Formatos executados mais de `threshold` vezes (mais repetido primeiro).
+        """
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+@contextmanager
+def record_queries(using: Optional[List[str]] = None) -> Iterator[QueryRecorder]:
+    """
+    Registra as queries executadas no bloco (na thread atual), em todas
+    as conexões configuradas ou só nas de `using`.
+    """
+    recorder = QueryRecorder()
+    aliases = using or list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+def _describe(recorder: QueryRecorder, limit: int = 5) -> str:
+    lines = [f"{n}x {shape}" for shape, n in recorder.shapes.most_common(limit)]
+    return "\n".join(lines)
+
+
+@contextmanager
+def assert_max_queries(
+    limit: int,
+    max_repeated: Optional[int] = None,
+    using: Optional[List[str]] = None,
+) -> Iterator[QueryRecorder]:
+    """
+    Para testes: falha se o bloco passar de `limit` queries ou repetir
+    o mesmo formato mais de `max_repeated` vezes.
+
+        with assert_max_queries(4, max_repeated=1):
+            client.get("/api/v1/ordens-servico/")
+    """
+    with record_queries(using) as recorder:
+        yield recorder
+
+    if recorder.count > limit:
+        raise AssertionError(
+            f"{recorder.count} queries executadas (limite {limit}):\n{_describe(recorder)}"
+        )
+    if max_repeated is not None and recorder.repeated(max_repeated):
+        raise AssertionError(
+            f"Query repetida mais de {max_repeated} vezes (N+1?):\n{_describe(recorder)}"
+        )
@@ -0,0 +1,93 @@
+"""
+Índice de busca textual das O.S. (fora do ORM, por banco):
+
+- PostgreSQL: coluna gerada `search_vector` (tsvector, pesos A-D) com
+  índice GIN. Sendo GENERATED ... STORED, acompanha qualquer escrita.
+- SQLite: tabela FTS5 `core_orderservice_fts` (external content, ligada
+  pelo rowid) mantida por triggers de insert/update/delete.
+"""
+
+ORDER_TABLE = "core_orderservice"
+SEARCH_CONFIG = "portuguese"
+
+FTS_TABLE = "core_orderservice_fts"
+FTS_COLUMNS = ("so_number", "recipient_name", "provider", "description")
+
+_PG_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(so_number, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(recipient_name, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(provider, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'D')"
+)
+
+
+def _sqlite_triggers():
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in FTS_COLUMNS)
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.rowid, {old_values});"
+    )
+    return {
+        f"{FTS_TABLE}_ai": f"AFTER INSERT ON {ORDER_TABLE} BEGIN {insert_new} END",
+        f"{FTS_TABLE}_ad": f"AFTER DELETE ON {ORDER_TABLE} BEGIN {delete_old} END",
+        f"{FTS_TABLE}_au": (
+            f"AFTER UPDATE OF {columns} ON {ORDER_TABLE} BEGIN {delete_old} {insert_new} END"
+        ),
+    }
+
+
+def install_search_index(connection, rebuild: bool = False) -> None:
+    """
+    Cria (se faltar) a estrutura de busca. Idempotente.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                f"ALTER TABLE {ORDER_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({_PG_VECTOR}) STORED"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS os_search_vector_gin "
+                f"ON {ORDER_TABLE} USING GIN (search_vector)"
+            )
+            return
+
+        if connection.vendor != "sqlite":
+            return
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{', '.join(FTS_COLUMNS)}, content='{ORDER_TABLE}', content_rowid='rowid', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+            [ORDER_TABLE],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        triggers = _sqlite_triggers()
+        for name, body in triggers.items():
+            if name not in existing:
+                cursor.execute(f"CREATE TRIGGER {name} {body}")
+
+        # triggers somem quando o SQLite recria a tabela numa migration:
+        # nesse caso o índice precisa ser refeito
+        if rebuild or not set(triggers) <= existing:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(connection) -> None:
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("DROP INDEX IF EXISTS os_search_vector_gin")
+            cursor.execute(f"ALTER TABLE {ORDER_TABLE} DROP COLUMN IF EXISTS search_vector")
+        elif connection.vendor == "sqlite":
+            for name in _sqlite_triggers():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")